@@ -50,7 +50,7 @@ class BaseAction(loadable.Loadable):
     @property
     def osc(self):
         if not self._osc:
-            self._osc = clients.OpenStackClients()
+            self._osc = clients.get_shared_clients()
         return self._osc
 
     @property
@@ -78,7 +78,7 @@ class ChangeNovaServiceState(base.BaseAction):
                              element.ServiceState.OFFLINE.value,
                              element.ServiceState.ENABLED.value,
                              element.ServiceState.DISABLED.value,
-                             element.ServiceState.MAINTAINING.value
+                             element.ServiceState.MAINTAINING.value,
                              element.ServiceState.POWERON.value,
                              element.ServiceState.POWEROFF.value]
                 }
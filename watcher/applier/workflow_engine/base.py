@@ -18,9 +18,11 @@
 
 import abc
 import six
+import threading
 import time
 
 import eventlet
+from eventlet import event
 
 from oslo_log import log
 from taskflow import task as flow_task
@@ -40,6 +42,65 @@ CANCEL_STATE = [objects.action_plan.State.CANCELLING,
                 objects.action_plan.State.CANCELLED]
 
 
+class ActionPlanWatcher(object):
+    """Watches the state of an action plan on behalf of its actions
+
+    An action plan can only be cancelled through the API, i.e. in the
+    database, so its state has to be polled. Rather than each running action
+    polling its own state and the one of its action plan every second, the
+    actions share a watcher which loads the action plan at most once per
+    interval, and each of them is woken up as soon as its execution ends.
+    """
+
+    def __init__(self, context, action_plan_id, interval=1):
+        self.context = context
+        self.action_plan_id = action_plan_id
+        self.interval = interval
+        self._action_plan = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def action_plan(self):
+        """The action plan, reloaded when older than the interval"""
+        with self._lock:
+            now = time.time()
+            if self._action_plan is None or (
+                    self._action_plan.state not in CANCEL_STATE and
+                    now - self._loaded_at >= self.interval):
+                self._action_plan = objects.ActionPlan.get_by_id(
+                    self.context, self.action_plan_id)
+                self._loaded_at = now
+            return self._action_plan
+
+    def is_cancelled(self):
+        return self.action_plan.state in CANCEL_STATE
+
+    def wait(self, thread):
+        """Wait for a green thread to end or the action plan to be cancelled
+
+        :param thread: the green thread executing an action
+        :return: True if the green thread ended, False if the action plan
+                 was cancelled first
+        """
+        done = event.Event()
+
+        def _on_exit(gt):
+            if not done.ready():
+                done.send(True)
+
+        thread.link(_on_exit)
+        try:
+            while not self.is_cancelled():
+                with eventlet.Timeout(self.interval, False):
+                    done.wait()
+                if done.ready():
+                    return True
+            return False
+        finally:
+            thread.unlink(_on_exit)
+
+
 @six.add_metaclass(abc.ABCMeta)
 class BaseWorkFlowEngine(loadable.Loadable):
 
@@ -57,6 +118,8 @@ class BaseWorkFlowEngine(loadable.Loadable):
         self._applier_manager = applier_manager
         self._action_factory = factory.ActionFactory()
         self._osc = None
+        self._action_plan_watchers = {}
+        self._action_plan_watchers_lock = threading.Lock()
 
     @classmethod
     def get_config_opts(cls):
@@ -74,7 +137,7 @@ class BaseWorkFlowEngine(loadable.Loadable):
     @property
     def osc(self):
         if not self._osc:
-            self._osc = clients.OpenStackClients()
+            self._osc = clients.get_shared_clients()
         return self._osc
 
     @property
@@ -85,6 +148,19 @@ class BaseWorkFlowEngine(loadable.Loadable):
     def action_factory(self):
         return self._action_factory
 
+    def get_action_plan_watcher(self, action_plan_id):
+        """Get the watcher shared by the actions of an action plan
+
+        :param action_plan_id: the id of the action plan
+        :return: an :py:class:`ActionPlanWatcher` instance
+        """
+        with self._action_plan_watchers_lock:
+            watcher = self._action_plan_watchers.get(action_plan_id)
+            if watcher is None:
+                watcher = ActionPlanWatcher(self.context, action_plan_id)
+                self._action_plan_watchers[action_plan_id] = watcher
+        return watcher
+
     def notify(self, action, state):
         db_action = objects.Action.get_by_uuid(self.context, action.uuid,
                                                eager=True)
@@ -108,6 +184,11 @@ class BaseTaskFlowActionContainer(flow_task.Task):
     def engine(self):
         return self._engine
 
+    @property
+    def action_plan_watcher(self):
+        return self.engine.get_action_plan_watcher(
+            self._db_action.action_plan_id)
+
     @property
     def action(self):
         if self.loaded_action is None:
@@ -145,10 +226,9 @@ class BaseTaskFlowActionContainer(flow_task.Task):
             # NOTE(adisky): check the state of action plan before starting
             # next action, if action plan is cancelled raise the exceptions
             # so that taskflow does not schedule further actions.
-            action_plan = objects.ActionPlan.get_by_id(
-                self.engine.context, self._db_action.action_plan_id)
-            if action_plan.state in CANCEL_STATE:
-                raise exception.ActionPlanCancelled(uuid=action_plan.uuid)
+            if self.action_plan_watcher.is_cancelled():
+                raise exception.ActionPlanCancelled(
+                    uuid=self.action_plan_watcher.action_plan.uuid)
             self.do_pre_execute()
             notifications.action.send_execution_notification(
                 self.engine.context, self._db_action,
@@ -189,18 +269,9 @@ class BaseTaskFlowActionContainer(flow_task.Task):
         # NOTE: spawn a new thread for action execution, so that if action plan
         # is cancelled workflow engine will not wait to finish action execution
         et = eventlet.spawn(_do_execute_action, *args, **kwargs)
-        # NOTE: check for the state of action plan periodically,so that if
-        # action is finished or action plan is cancelled we can exit from here.
-        while True:
-            action_object = objects.Action.get_by_uuid(
-                self.engine.context, self._db_action.uuid, eager=True)
-            action_plan_object = objects.ActionPlan.get_by_id(
-                self.engine.context, action_object.action_plan_id)
-            if (action_object.state in [objects.action.State.SUCCEEDED,
-               objects.action.State.FAILED] or
-               action_plan_object.state in CANCEL_STATE):
-                break
-            time.sleep(1)
+        # NOTE: wait for the end of the action execution thread, or for the
+        # action plan to be cancelled, whichever comes first.
+        finished = self.action_plan_watcher.wait(et)
         try:
             # NOTE: kill the action execution thread, if action plan is
             # cancelled for all other cases wait for the result from action
@@ -208,7 +279,7 @@ class BaseTaskFlowActionContainer(flow_task.Task):
             # Not all actions support abort operations, kill only those action
             # which support abort operations
             abort = self.action.check_abort()
-            if (action_plan_object.state in CANCEL_STATE and abort):
+            if not finished and abort:
                 et.kill()
             et.wait()
 
@@ -216,7 +287,8 @@ class BaseTaskFlowActionContainer(flow_task.Task):
             # taskflow will call revert for the action,
             # we will redirect it to abort.
         except eventlet.greenlet.GreenletExit:
-            raise exception.ActionPlanCancelled(uuid=action_plan_object.uuid)
+            raise exception.ActionPlanCancelled(
+                uuid=self.action_plan_watcher.action_plan.uuid)
 
         except Exception as e:
             LOG.exception(e)
@@ -235,12 +307,10 @@ class BaseTaskFlowActionContainer(flow_task.Task):
                 priority=fields.NotificationPriority.ERROR)
 
     def revert(self, *args, **kwargs):
-        action_plan = objects.ActionPlan.get_by_id(
-            self.engine.context, self._db_action.action_plan_id, eager=True)
         # NOTE: check if revert cause by cancel action plan or
         # some other exception occured during action plan execution
         # if due to some other exception keep the flow intact.
-        if action_plan.state not in CANCEL_STATE:
+        if not self.action_plan_watcher.is_cancelled():
             self.do_revert()
             return
 
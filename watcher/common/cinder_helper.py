@@ -20,60 +20,115 @@ from watcher.common import exception
 
 LOG = log.getLogger(__name__)
 
+# The storage nodes, pools and volume types are listed in bulk and indexed by
+# host, pool name and backend name. The indexes are shared by the helpers of
+# a process, and are rebuilt whenever the resources are listed again.
+_indexes = {}
+
+
+def reset_cache():
+    """Forget the storage nodes, pools and volume types indexed so far"""
+    _indexes.clear()
+
+
+def _lookup(index_name, key, list_resources):
+    index = _indexes.get(index_name)
+    if index is None or key not in index:
+        # The resource may have been created since the last listing
+        list_resources()
+        index = _indexes[index_name]
+    return index.get(key)
+
 
 class CinderHelper(object):
 
     def __init__(self, osc=None):
         """:param osc: an OpenStackClients instance"""
-        self.osc = osc if osc else clients.OpenStackClients()
-        self.cinder = self.osc.cinder()
+        self.osc = osc if osc else clients.get_shared_clients()
+
+    @property
+    def cinder(self):
+        return self.osc.cinder()
 
     def get_storage_node_list(self):
-        return list(self.cinder.services.list(binary='cinder-volume'))
+        storage_nodes = list(self.cinder.services.list(binary='cinder-volume'))
+        _indexes['storage_nodes'] = {
+            storage_node.host: storage_node for storage_node in storage_nodes}
+        return storage_nodes
 
     def get_storage_node_by_name(self, name):
-        """Get storage node by name(host@backendname)"""
+        """Get storage node by name(host@backendname)
+
+        The node is looked up in the nodes listed last, which are listed
+        again if it is missing. Call :py:meth:`get_storage_node_list` first
+        to get its latest state and status.
+        """
         try:
-            storages = list(filter(lambda storage:
-                            storage.host == name,
-                            self.get_storage_node_list()))
-            if len(storages) != 1:
-                raise exception.StorageNodeNotFound(name=name)
-            return storages[0]
+            storage_node = _lookup(
+                'storage_nodes', name, self.get_storage_node_list)
         except Exception as exc:
             LOG.exception(exc)
             raise exception.StorageNodeNotFound(name=name)
+        if storage_node is None:
+            raise exception.StorageNodeNotFound(name=name)
+        return storage_node
 
     def get_storage_pool_list(self):
-        return self.cinder.pools.list(detailed=True)
+        pools = list(self.cinder.pools.list(detailed=True))
+        _indexes['storage_pools'] = {pool.name: pool for pool in pools}
+        return pools
 
     def get_storage_pool_by_name(self, name):
-        """Get pool by name(host@backend#poolname)"""
+        """Get pool by name(host@backend#poolname)
+
+        The pool is looked up in the pools listed last, which are listed
+        again if it is missing. Call :py:meth:`get_storage_pool_list` first
+        to get its latest capacities.
+        """
         try:
-            pools = list(filter(lambda pool:
-                         pool.name == name,
-                         self.get_storage_pool_list()))
-            if len(pools) != 1:
-                raise exception.PoolNotFound(name=name)
-            return pools[0]
+            pool = _lookup('storage_pools', name, self.get_storage_pool_list)
         except Exception as exc:
             LOG.exception(exc)
             raise exception.PoolNotFound(name=name)
+        if pool is None:
+            raise exception.PoolNotFound(name=name)
+        return pool
 
-    def get_volume_list(self):
-        return self.cinder.volumes.list(search_opts={'all_tenants': True})
+    def get_volume_list(self, marker=None, limit=None):
+        """List the volumes of all tenants
+
+        :param marker: ID of the last volume of the previous page, if any
+        :param limit: Maximum number of volumes to return
+        """
+        return self.cinder.volumes.list(
+            search_opts={'all_tenants': True}, marker=marker, limit=limit)
 
     def get_volume_type_list(self):
-        return self.cinder.volume_types.list()
+        volume_types = list(self.cinder.volume_types.list())
+        index = {}
+        for volume_type in volume_types:
+            index.setdefault(
+                volume_type.extra_specs.get('volume_backend_name'),
+                volume_type)
+        _indexes['volume_types'] = index
+        return volume_types
+
+    def get_volume_type_by_backendname(self, backendname, refresh=True):
+        """Get the name of the first volume type of a backend
 
-    def get_volume_type_by_backendname(self, backendname):
-        volume_type_list = self.get_volume_type_list()
+        The volume type is looked up in the volume types listed last.
 
-        volume_type = list(filter(
-            lambda volume_type:
-                volume_type.extra_specs.get(
-                    'volume_backend_name') == backendname, volume_type_list))
+        :param backendname: name of the backend
+        :param refresh: whether to list the volume types again if the backend
+                        has none, as it may have been added since
+        """
+        index = _indexes.get('volume_types')
+        if refresh or index is None:
+            volume_type = _lookup(
+                'volume_types', backendname, self.get_volume_type_list)
+        else:
+            volume_type = index.get(backendname)
         if volume_type:
-            return volume_type[0].name
+            return volume_type.name
         else:
             return ""
@@ -10,6 +10,9 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import functools
+import threading
+
 from ceilometerclient import client as ceclient
 from cinderclient import client as ciclient
 from glanceclient import client as glclient
@@ -29,13 +32,47 @@ CONF = conf.CONF
 
 _CLIENTS_AUTH_GROUP = 'watcher_clients_auth'
 
+_shared_clients = None
+_shared_clients_lock = threading.Lock()
+
+
+def get_shared_clients():
+    """Get the client instances shared by the whole process
+
+    Sharing the clients means sharing their Keystone session, hence its
+    token, which is only renewed when about to expire, and its pool of
+    kept-alive connections to the services.
+    """
+    global _shared_clients
+    with _shared_clients_lock:
+        if _shared_clients is None:
+            _shared_clients = OpenStackClients()
+    return _shared_clients
+
+
+def reset_shared_clients():
+    global _shared_clients
+    with _shared_clients_lock:
+        _shared_clients = None
+
+
+def synchronized(func):
+    """Create the client of a service once when called by several threads"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return func(self, *args, **kwargs)
+    return wrapper
+
 
 class OpenStackClients(object):
     """Convenience class to create and cache client instances."""
 
     def __init__(self):
+        self._lock = threading.RLock()
         self.reset_clients()
 
+    @synchronized
     def reset_clients(self):
         self._session = None
         self._keystone = None
@@ -45,6 +82,7 @@ class OpenStackClients(object):
         self._cinder = None
         self._ceilometer = None
         self._monasca = None
+        self._monasca_token = None
         self._neutron = None
         self._ironic = None
 
@@ -61,6 +99,7 @@ class OpenStackClients(object):
         return self.keystone().auth_url
 
     @property
+    @synchronized
     def session(self):
         if not self._session:
             self._session = self._get_keystone_session()
@@ -70,6 +109,7 @@ class OpenStackClients(object):
         return getattr(getattr(CONF, '%s_client' % client), option)
 
     @exception.wrap_keystone_exception
+    @synchronized
     def keystone(self):
         if not self._keystone:
             self._keystone = keyclient.Client(session=self.session)
@@ -77,6 +117,7 @@ class OpenStackClients(object):
         return self._keystone
 
     @exception.wrap_keystone_exception
+    @synchronized
     def nova(self):
         if self._nova:
             return self._nova
@@ -89,6 +130,7 @@ class OpenStackClients(object):
         return self._nova
 
     @exception.wrap_keystone_exception
+    @synchronized
     def glance(self):
         if self._glance:
             return self._glance
@@ -102,6 +144,7 @@ class OpenStackClients(object):
         return self._glance
 
     @exception.wrap_keystone_exception
+    @synchronized
     def gnocchi(self):
         if self._gnocchi:
             return self._gnocchi
@@ -116,6 +159,7 @@ class OpenStackClients(object):
         return self._gnocchi
 
     @exception.wrap_keystone_exception
+    @synchronized
     def cinder(self):
         if self._cinder:
             return self._cinder
@@ -129,6 +173,7 @@ class OpenStackClients(object):
         return self._cinder
 
     @exception.wrap_keystone_exception
+    @synchronized
     def ceilometer(self):
         if self._ceilometer:
             return self._ceilometer
@@ -144,15 +189,18 @@ class OpenStackClients(object):
         return self._ceilometer
 
     @exception.wrap_keystone_exception
+    @synchronized
     def monasca(self):
-        if self._monasca:
+        # Unlike the other clients, the Monasca client is given a token
+        # rather than the session, so it is replaced once the token is renewed
+        token = self.session.get_token()
+        if self._monasca and token == self._monasca_token:
             return self._monasca
 
         monascaclient_version = self._get_client_option(
             'monasca', 'api_version')
         monascaclient_interface = self._get_client_option(
             'monasca', 'interface')
-        token = self.session.get_token()
         watcher_clients_auth_config = CONF.get(_CLIENTS_AUTH_GROUP)
         service_type = 'monitoring'
         monasca_kwargs = {
@@ -172,10 +220,12 @@ class OpenStackClients(object):
 
         self._monasca = monclient.Client(
             monascaclient_version, endpoint, **monasca_kwargs)
+        self._monasca_token = token
 
         return self._monasca
 
     @exception.wrap_keystone_exception
+    @synchronized
     def neutron(self):
         if self._neutron:
             return self._neutron
@@ -192,6 +242,7 @@ class OpenStackClients(object):
         return self._neutron
 
     @exception.wrap_keystone_exception
+    @synchronized
     def ironic(self):
         if self._ironic:
             return self._ironic
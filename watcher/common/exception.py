@@ -391,6 +391,11 @@ class NoAvailableStrategyForGoal(WatcherException):
     msg_fmt = _("No strategy could be found to achieve the '%(goal)s' goal.")
 
 
+class NoSolutionForGoal(WatcherException):
+    msg_fmt = _("None of the strategies of the '%(goal)s' goal found a "
+                "solution: they either failed or timed out.")
+
+
 class InvalidIndicatorValue(WatcherException):
     msg_fmt = _("The indicator '%(name)s' with value '%(value)s' "
                 "and spec type '%(spec_type)s' is invalid.")
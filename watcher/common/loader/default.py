@@ -16,6 +16,8 @@
 
 from __future__ import unicode_literals
 
+import threading
+
 from oslo_config import cfg
 from oslo_log import log
 from stevedore import driver as drivermanager
@@ -27,6 +29,28 @@ from watcher.common import utils
 
 LOG = log.getLogger(__name__)
 
+# The loaders of the whole process share the plugins they resolved from the
+# entry points, {(namespace, name): plugin class}, and the plugins available
+# in each namespace, {namespace: {name: plugin class}}, as scanning the entry
+# points is costly
+_plugins = {}
+_available_plugins = {}
+# Config groups whose options are registered, {(id(conf), group name)}, so
+# that the config files are only parsed again when a plugin is first loaded
+_registered_groups = set()
+_cache_lock = threading.RLock()
+
+
+def reset_cache():
+    """Forget the plugins resolved and their registered config groups
+
+    To be called when the configuration is reloaded, e.g. on SIGHUP.
+    """
+    with _cache_lock:
+        _plugins.clear()
+        _available_plugins.clear()
+        _registered_groups.clear()
+
 
 class DefaultLoader(base.BaseLoader):
 
@@ -44,13 +68,7 @@ class DefaultLoader(base.BaseLoader):
     def load(self, name, **kwargs):
         try:
             LOG.debug("Loading in namespace %s => %s ", self.namespace, name)
-            driver_manager = drivermanager.DriverManager(
-                namespace=self.namespace,
-                name=name,
-                invoke_on_load=False,
-            )
-
-            driver_cls = driver_manager.driver
+            driver_cls = self._get_plugin(name)
             config = self._load_plugin_config(name, driver_cls)
 
             driver = driver_cls(config, **kwargs)
@@ -60,6 +78,18 @@ class DefaultLoader(base.BaseLoader):
 
         return driver
 
+    def _get_plugin(self, name):
+        with _cache_lock:
+            key = (self.namespace, name)
+            if key not in _plugins:
+                driver_manager = drivermanager.DriverManager(
+                    namespace=self.namespace,
+                    name=name,
+                    invoke_on_load=False,
+                )
+                _plugins[key] = driver_manager.driver
+            return _plugins[key]
+
     def _reload_config(self):
         self.conf(default_config_files=self.conf.default_config_files)
 
@@ -74,11 +104,15 @@ class DefaultLoader(base.BaseLoader):
             return config
 
         group_name = self.get_entry_name(name)
-        self.conf.register_opts(config_opts, group=group_name)
+        with _cache_lock:
+            key = (id(self.conf), group_name)
+            if key not in _registered_groups:
+                self.conf.register_opts(config_opts, group=group_name)
 
-        # Finalise the opt import by re-checking the configuration
-        # against the provided config files
-        self._reload_config()
+                # Finalise the opt import by re-checking the configuration
+                # against the provided config files
+                self._reload_config()
+                _registered_groups.add(key)
 
         config_group = self.conf.get(group_name)
         if not config_group:
@@ -91,6 +125,11 @@ class DefaultLoader(base.BaseLoader):
         return config
 
     def list_available(self):
-        extension_manager = extensionmanager.ExtensionManager(
-            namespace=self.namespace)
-        return {ext.name: ext.plugin for ext in extension_manager.extensions}
+        with _cache_lock:
+            if self.namespace not in _available_plugins:
+                extension_manager = extensionmanager.ExtensionManager(
+                    namespace=self.namespace)
+                _available_plugins[self.namespace] = {
+                    ext.name: ext.plugin
+                    for ext in extension_manager.extensions}
+            return dict(_available_plugins[self.namespace])
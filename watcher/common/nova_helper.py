@@ -28,6 +28,7 @@ import novaclient.exceptions as nvexceptions
 
 from watcher.common import clients
 from watcher.common import exception
+from watcher.common import nova_waiter
 from watcher.common import utils
 
 LOG = log.getLogger(__name__)
@@ -37,11 +38,27 @@ class NovaHelper(object):
 
     def __init__(self, osc=None):
         """:param osc: an OpenStackClients instance"""
-        self.osc = osc if osc else clients.OpenStackClients()
-        self.neutron = self.osc.neutron()
-        self.cinder = self.osc.cinder()
-        self.nova = self.osc.nova()
-        self.glance = self.osc.glance()
+        self.osc = osc if osc else clients.get_shared_clients()
+        self.waiter = nova_waiter.get_server_waiter()
+
+    # The clients are only created when first used, by the shared
+    # OpenStackClients instance unless another one is given
+
+    @property
+    def neutron(self):
+        return self.osc.neutron()
+
+    @property
+    def cinder(self):
+        return self.osc.cinder()
+
+    @property
+    def nova(self):
+        return self.osc.nova()
+
+    @property
+    def glance(self):
+        return self.osc.glance()
 
     def get_compute_node_list(self):
         return self.nova.hypervisors.list()
@@ -64,15 +81,36 @@ class NovaHelper(object):
             LOG.exception(exc)
             raise exception.ComputeNodeNotFound(name=node_hostname)
 
-    def get_instance_list(self):
-        return self.nova.servers.list(search_opts={'all_tenants': True})
+    def get_instance_list(self, marker=None, limit=None, changes_since=None):
+        """List the servers of all tenants
+
+        :param marker: ID of the last server of the previous page, if any
+        :param limit: Maximum number of servers to return, which Nova caps
+                      to its osapi_max_limit. -1 returns all the servers,
+                      fetched page by page.
+        :param changes_since: If set, only the servers that changed since
+                              this UTC datetime are returned, including the
+                              deleted ones
+        """
+        search_opts = {'all_tenants': True}
+        if changes_since is not None:
+            search_opts['changes-since'] = changes_since.isoformat()
+        return self.nova.servers.list(
+            search_opts=search_opts, marker=marker, limit=limit)
 
     def get_service(self, service_id):
         return self.nova.services.find(id=service_id)
 
+    def get_service_list(self, binary='nova-compute'):
+        return self.nova.services.list(binary=binary)
+
     def get_flavor(self, flavor_id):
         return self.nova.flavors.get(flavor_id)
 
+    def get_flavor_list(self):
+        # Both public and private flavors are needed to describe all servers
+        return self.nova.flavors.list(is_public=None)
+
     def get_aggregate_list(self):
         return self.nova.aggregates.list()
 
@@ -357,15 +395,12 @@ class NovaHelper(object):
                                                 instance_status))
 
         instance.resize(flavor=flavor_id)
-        while getattr(instance,
-                      'OS-EXT-STS:vm_state') != 'resized' \
-                and retry:
-            instance = self.nova.servers.get(instance.id)
-            LOG.debug(
-                'Waiting the resize of {0}  to {1}'.format(
-                    instance, flavor_id))
-            time.sleep(1)
-            retry -= 1
+        LOG.debug('Waiting the resize of {0}  to {1}'.format(
+            instance, flavor_id))
+        instance = self.waiter.wait(
+            self.nova, instance,
+            lambda i: getattr(i, 'OS-EXT-STS:vm_state') == 'resized',
+            timeout=retry)
 
         instance_status = getattr(instance, 'status')
         if instance_status != 'VERIFY_RESIZE':
@@ -409,17 +444,12 @@ class NovaHelper(object):
             instance.live_migrate(host=dest_hostname,
                                   block_migration=block_migration,
                                   disk_over_commit=True)
-            while getattr(instance,
-                          'OS-EXT-SRV-ATTR:host') != dest_hostname \
-                    and retry:
-                instance = self.nova.servers.get(instance.id)
-                LOG.debug(
-                    'Waiting the migration of {0}  to {1}'.format(
-                        instance,
-                        getattr(instance,
-                                'OS-EXT-SRV-ATTR:host')))
-                time.sleep(1)
-                retry -= 1
+            LOG.debug('Waiting the migration of {0}  to {1}'.format(
+                instance, dest_hostname))
+            instance = self.waiter.wait(
+                self.nova, instance,
+                lambda i: getattr(i, 'OS-EXT-SRV-ATTR:host') == dest_hostname,
+                timeout=retry)
 
             host_name = getattr(instance, 'OS-EXT-SRV-ATTR:host')
             if host_name != dest_hostname:
@@ -448,13 +478,11 @@ class NovaHelper(object):
             LOG.debug(
                 "No running migrations found for instance %s" % instance_id)
 
-        while retry:
-            instance = self.nova.servers.get(instance_id)
-            if (getattr(instance, 'OS-EXT-STS:task_state') is None and
-               getattr(instance, 'status') in ['ACTIVE', 'ERROR']):
-                break
-            time.sleep(2)
-            retry -= 1
+        instance = self.waiter.wait(
+            self.nova, self.nova.servers.get(instance_id),
+            lambda i: (getattr(i, 'OS-EXT-STS:task_state') is None and
+                       getattr(i, 'status') in ['ACTIVE', 'ERROR']),
+            timeout=retry * 2, interval=2)
         instance_host = getattr(instance, 'OS-EXT-SRV-ATTR:host')
         instance_status = getattr(instance, 'status')
 
@@ -561,17 +589,14 @@ class NovaHelper(object):
 
                 # Waiting for the new image to be officially in ACTIVE state
                 # in order to make sure it can be used
-                status = image.status
-                retry = 10
-                while status != 'active' and status != 'error' and retry:
-                    time.sleep(5)
-                    retry -= 1
-                    # Retrieve the instance again so the status field updates
-                    image = self.glance.images.get(image_uuid)
-                    if not image:
-                        break
-                    status = image.status
-                    LOG.debug("Current image status: %s" % status)
+                def _is_done(image):
+                    if image:
+                        LOG.debug("Current image status: %s" % image.status)
+                    return not image or image.status in ('active', 'error')
+
+                image = nova_waiter.wait_for(
+                    image, lambda: self.glance.images.get(image_uuid),
+                    _is_done, timeout=50, interval=5)
 
                 if not image:
                     LOG.debug("Image not found: %s" % image_uuid)
@@ -632,15 +657,16 @@ class NovaHelper(object):
         :param server: server object.
         :param state: for which state we are waiting for
         :param retry: how many times to retry
-        :param sleep: seconds to sleep between the retries
+        :param sleep: seconds to sleep before the first retry, the waiting
+                      lasting at most retry * sleep seconds
         """
         if not server:
             return False
 
-        while getattr(server, 'OS-EXT-STS:vm_state') != state and retry:
-            time.sleep(sleep)
-            server = self.nova.servers.get(server)
-            retry -= 1
+        server = self.waiter.wait(
+            self.nova, server,
+            lambda s: getattr(s, 'OS-EXT-STS:vm_state') == state,
+            timeout=retry * sleep, interval=sleep)
         return getattr(server, 'OS-EXT-STS:vm_state') == state
 
     def wait_for_instance_status(self, instance, status_list, retry, sleep):
@@ -653,17 +679,19 @@ class NovaHelper(object):
         :param status_list: tuple containing the list of
             status we are waiting for
         :param retry: how many times to retry
-        :param sleep: seconds to sleep between the retries
+        :param sleep: seconds to sleep before the first retry, the waiting
+                      lasting at most retry * sleep seconds
         """
         if not instance:
             return False
 
-        while instance.status not in status_list and retry:
+        def _has_status(instance):
             LOG.debug("Current instance status: %s" % instance.status)
-            time.sleep(sleep)
-            instance = self.nova.servers.get(instance.id)
-            retry -= 1
-        LOG.debug("Current instance status: %s" % instance.status)
+            return instance.status in status_list
+
+        instance = self.waiter.wait(
+            self.nova, instance, _has_status,
+            timeout=retry * sleep, interval=sleep)
         return instance.status in status_list
 
     def create_instance(self, node_id, inst_name="test", image_id=None,
@@ -0,0 +1,189 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Shared waiter of the Nova servers being migrated, resized or stopped
+
+The applier runs many actions at once, each of them waiting for a server to
+reach a given state. Rather than each of them polling its own server at a
+fixed pace, they register to the process-wide :py:class:`ServerWaiter`:
+
+- each wait backs off from its initial interval up to a maximum interval,
+  until its deadline,
+- whenever a wait is due, the servers of all the pending waits are refreshed
+  at once, with a single ``servers.list`` of the servers changed since the
+  oldest of them was last updated.
+
+The Nova API load thus grows with the polling rate rather than with the
+number of concurrent operations.
+"""
+
+import threading
+import time
+
+from oslo_log import log
+import six
+
+LOG = log.getLogger(__name__)
+
+_waiter = None
+_waiter_lock = threading.Lock()
+
+
+def get_server_waiter():
+    """Get the waiter shared by the whole process"""
+    global _waiter
+    with _waiter_lock:
+        if _waiter is None:
+            _waiter = ServerWaiter()
+    return _waiter
+
+
+def wait_for(resource, fetch, predicate, timeout, interval=1,
+             max_interval=None, backoff=1.5):
+    """Poll a resource with an increasing interval until it is ready
+
+    :param resource: the resource, as last retrieved
+    :param fetch: callable returning the current state of the resource
+    :param predicate: callable telling whether the resource is ready
+    :param timeout: seconds to wait for at most
+    :param interval: seconds to wait before the first poll
+    :param max_interval: maximum seconds between two polls, defaults to
+                         ``ServerWaiter.MAX_INTERVAL``
+    :param backoff: factor applied to the interval after each poll
+    :return: the last state of the resource, ready or not
+    """
+    max_interval = max_interval or ServerWaiter.MAX_INTERVAL
+    elapsed = 0
+    while not predicate(resource) and elapsed < timeout:
+        delay = min(interval, timeout - elapsed)
+        time.sleep(delay)
+        elapsed += delay
+        interval = min(interval * backoff, max(max_interval, interval))
+        resource = fetch()
+    return resource
+
+
+class _Wait(object):
+
+    def __init__(self, server, predicate):
+        self.server = server
+        self.predicate = predicate
+        # Whether the server was refreshed by a poll since last checked
+        self.fresh = False
+
+
+class ServerWaiter(object):
+    """Waits for Nova servers to reach a given state"""
+
+    # Maximum number of seconds between two polls of a server
+    MAX_INTERVAL = 10
+    # Factor applied to the interval between two polls after each of them
+    BACKOFF = 1.5
+    # Maximum number of changed servers listed at once, which should not
+    # exceed the osapi_max_limit of Nova. When as many servers are listed,
+    # the others may have changed as well.
+    LIST_LIMIT = 1000
+
+    def __init__(self):
+        self._waits = set()
+        self._lock = threading.Lock()
+
+    def wait(self, nova, server, predicate, timeout, interval=1):
+        """Wait for a server to fulfill a predicate
+
+        :param nova: the Nova client to use
+        :param server: the server, as last retrieved from Nova
+        :param predicate: callable telling whether the server is ready
+        :param timeout: seconds to wait for at most
+        :param interval: seconds to wait before the first poll
+        :return: the server as last retrieved, ready or not
+        """
+        wait = _Wait(server, predicate)
+        with self._lock:
+            self._waits.add(wait)
+        try:
+            elapsed = 0
+            while not predicate(wait.server) and elapsed < timeout:
+                delay = min(interval, timeout - elapsed)
+                time.sleep(delay)
+                elapsed += delay
+                interval = min(interval * self.BACKOFF,
+                               max(self.MAX_INTERVAL, interval))
+                self._refresh(nova, wait)
+            return wait.server
+        finally:
+            with self._lock:
+                self._waits.discard(wait)
+
+    def _refresh(self, nova, wait):
+        with self._lock:
+            if not wait.fresh:
+                # Also refresh the servers of the other waits, sparing them
+                # their own poll
+                stale = [w for w in self._waits if not w.fresh]
+                if wait not in stale:
+                    stale.append(wait)
+                self._poll(nova, stale, wait)
+            wait.fresh = False
+
+    def _poll(self, nova, waits, own_wait):
+        changes_since = self._get_changes_since(waits)
+        if changes_since is not None:
+            try:
+                servers = nova.servers.list(
+                    search_opts={'all_tenants': True,
+                                 'changes-since': changes_since},
+                    limit=self.LIST_LIMIT)
+            except Exception as exc:
+                LOG.exception(exc)
+            else:
+                complete = len(servers) < self.LIST_LIMIT
+                servers = {server.id: server for server in servers}
+                unlisted = []
+                for wait in waits:
+                    if wait.server.id in servers:
+                        wait.server = servers[wait.server.id]
+                        wait.fresh = True
+                    elif complete:
+                        # The servers which are not listed did not change
+                        wait.fresh = True
+                    else:
+                        unlisted.append(wait)
+                waits = unlisted
+
+        for wait in waits:
+            try:
+                wait.server = nova.servers.get(wait.server.id)
+            except Exception as exc:
+                if wait is own_wait:
+                    raise
+                LOG.exception(exc)
+            else:
+                wait.fresh = True
+
+    @staticmethod
+    def _get_changes_since(waits):
+        """Oldest time the servers were updated at, according to Nova
+
+        Nova lists the servers updated since a given time, which allows to
+        refresh several servers with a single request. The time is taken
+        from the servers themselves so that the clocks do not need to be in
+        sync.
+        """
+        if len(waits) < 2:
+            return None
+        updated = [getattr(wait.server, 'updated', None) for wait in waits]
+        if not all(isinstance(u, six.string_types) for u in updated):
+            return None
+        return min(updated)
@@ -34,6 +34,7 @@ from watcher._i18n import _
 from watcher.api import app
 from watcher.common import config
 from watcher.common import context
+from watcher.common.loader import default as loader_default
 from watcher.common import rpc
 from watcher.common import scheduling
 from watcher.conf import plugins as plugins_conf
@@ -278,6 +279,8 @@ class Service(service.ServiceBase):
 
     def reset(self):
         """Reset a service in case it received a SIGHUP."""
+        # The config files were reloaded, so should be the plugin options
+        loader_default.reset_cache()
 
     def wait(self):
         """Wait for service to complete."""
@@ -0,0 +1,46 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from oslo_config import cfg
+
+watcher_datasources = cfg.OptGroup(name='watcher_datasources',
+                                   title='Configuration Options for the '
+                                         'datasources used by strategies')
+
+DATASOURCES_OPTS = [
+    cfg.IntOpt('metric_cache_size',
+               default=10000,
+               min=0,
+               help='Maximum number of metric aggregates kept in memory '
+                    'and shared by all the strategies and audits. The least '
+                    'recently used aggregates are evicted first. '
+                    '0 disables the cache.'),
+    cfg.IntOpt('metric_cache_ttl',
+               default=300,
+               min=1,
+               help='Time (in seconds) an aggregate is cached when the '
+                    'query does not specify any granularity. Aggregates '
+                    'expire at the end of the granularity interval they '
+                    'were retrieved in, so that a new measure can be taken '
+                    'into account as soon as it is available.'),
+]
+
+
+def register_opts(conf):
+    conf.register_group(watcher_datasources)
+    conf.register_opts(DATASOURCES_OPTS, group=watcher_datasources)
+
+
+def list_opts():
+    return [('watcher_datasources', DATASOURCES_OPTS)]
@@ -42,6 +42,20 @@ WATCHER_DECISION_ENGINE_OPTS = [
                required=True,
                help='The maximum number of threads that can be used to '
                     'execute strategies'),
+    cfg.BoolOpt('evaluate_all_strategies',
+                default=False,
+                help='If enabled, the audits which do not specify a '
+                     'strategy run all the strategies of their goal '
+                     'concurrently, and the solution with the best global '
+                     'efficacy is scheduled. Otherwise, the first strategy '
+                     'found for the goal is used.'),
+    cfg.IntOpt('strategy_timeout',
+               default=600,
+               min=1,
+               help='The time (in seconds) each strategy has, from its '
+                    'start, to find a solution when all the strategies of a '
+                    'goal are evaluated. The strategies still running after '
+                    'that are left out of the comparison.'),
     cfg.IntOpt('action_plan_expiry',
                default=24,
                help='An expiry timespan(hours). Watcher invalidates any '
@@ -0,0 +1,82 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent import futures
+
+from oslo_log import log
+
+from watcher.datasource import cache
+
+LOG = log.getLogger(__name__)
+
+# Default number of concurrent queries sent to a datasource when it cannot
+# aggregate several resources in a single request
+DEFAULT_MAX_WORKERS = 8
+
+
+def fan_out_aggregations(fetch, resource_ids, metrics,
+                         max_workers=DEFAULT_MAX_WORKERS):
+    """Concurrently query the aggregate of each resource and metric
+
+    :param fetch: callable taking a resource id and a metric name and
+                  returning the aggregated value of this metric
+    :param resource_ids: ids of the resources to get the aggregates of
+    :param metrics: names of the metrics to get the aggregates of
+    :param max_workers: maximum number of queries sent at once
+    :return: a dict of dicts holding the aggregated value of each metric
+             of each resource, i.e. ``{resource_id: {metric: value}}``.
+             A value is None if its query failed.
+    """
+    aggregations = {resource_id: {} for resource_id in resource_ids}
+    keys = [(resource_id, metric)
+            for resource_id in aggregations for metric in metrics]
+    if not keys:
+        return aggregations
+
+    with futures.ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(keys)))) as executor:
+        pending = {executor.submit(fetch, resource_id, metric):
+                   (resource_id, metric)
+                   for resource_id, metric in keys}
+        for future in futures.as_completed(pending):
+            resource_id, metric = pending[future]
+            try:
+                value = future.result()
+            except Exception as exc:
+                LOG.exception(exc)
+                value = None
+            aggregations[resource_id][metric] = value
+
+    return aggregations
+
+
+def get_cached_aggregations(metric_cache, aggregations, metric, make_key):
+    """Fill the aggregations of a metric with the cached aggregates
+
+    :param metric_cache: the :py:class:`~.MetricCache` to look up
+    :param aggregations: dict of dicts to fill with the cached aggregates,
+                         i.e. ``{resource_id: {metric: value}}``
+    :param metric: name of the metric
+    :param make_key: callable returning the cache key of the aggregate of
+                     this metric for a given resource id
+    :return: the ids of the resources whose aggregate is not cached
+    """
+    missing = []
+    for resource_id in aggregations:
+        value = metric_cache.get(make_key(resource_id))
+        if value is cache.NO_VALUE:
+            missing.append(resource_id)
+        else:
+            aggregations[resource_id][metric] = value
+    return missing
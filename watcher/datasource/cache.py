@@ -0,0 +1,158 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cache of the metric aggregates retrieved from the datasources
+
+The strategies of the continuous audits query the same aggregates every time
+they are executed, while these aggregates only change when a new measure is
+stored, i.e. once per granularity interval. The datasource helpers therefore
+keep the aggregates they retrieve in a :py:class:`MetricCache` shared by the
+whole decision engine.
+
+The entries are keyed by ``(datasource, resource, metric, period,
+granularity, aggregation)`` where the period is the length of the time
+window the measures are aggregated over, so the window is assumed to end at
+the time of the query. An entry expires at the end of the granularity
+interval it was stored in.
+"""
+
+import collections
+import datetime
+import threading
+import time
+
+from oslo_utils import timeutils
+import six
+
+from watcher.common import service
+from watcher import conf
+
+CONF = conf.CONF
+
+# Marker returned when an aggregate is not cached, as None is a valid value
+NO_VALUE = object()
+
+
+def cache_key(datasource, resource, metric, period=None, granularity=None,
+              aggregation=None):
+    return (datasource, resource, metric, period, granularity, aggregation)
+
+
+def window_length(start_time, end_time=None):
+    """Length in seconds of a time window
+
+    :param start_time: Start datetime of the window, or None
+    :param end_time: End datetime of the window, None meaning now
+    :return: the length of the window, or None if there is no start datetime
+    """
+    if start_time is None:
+        return None
+    end_time = end_time or datetime.datetime.utcnow()
+    return int((timeutils.normalize_time(end_time) -
+                timeutils.normalize_time(start_time)).total_seconds())
+
+
+@six.add_metaclass(service.Singleton)
+class MetricCache(object):
+    """Size-bounded LRU cache of aggregates with a time-to-live"""
+
+    def __init__(self, max_size=None, default_ttl=None):
+        self.max_size = (CONF.watcher_datasources.metric_cache_size
+                         if max_size is None else max_size)
+        self.default_ttl = (CONF.watcher_datasources.metric_cache_ttl
+                            if default_ttl is None else default_ttl)
+        # {key: (expiry timestamp, value)}, least recently used first
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.max_size > 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expiry(self, granularity, now):
+        # Align the expiry on the granularity so the entry expires when the
+        # next measure is aggregated
+        ttl = int(granularity or self.default_ttl) or self.default_ttl
+        return (now // ttl + 1) * ttl
+
+    def get(self, key):
+        """Get a cached aggregate
+
+        :param key: key of the aggregate, see :py:func:`cache_key`
+        :return: the aggregate, or :py:data:`NO_VALUE` if not cached
+        """
+        if not self.enabled:
+            return NO_VALUE
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return NO_VALUE
+            self.hits += 1
+            self._move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, granularity=None):
+        """Cache an aggregate until the end of its granularity interval
+
+        :param key: key of the aggregate, see :py:func:`cache_key`
+        :param value: the aggregate
+        :param granularity: granularity of the aggregate in seconds,
+                            defaults to the ``metric_cache_ttl`` option
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (
+                self._expiry(granularity, time.time()), value)
+            self._move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_fetch(self, key, fetch, granularity=None):
+        """Get a cached aggregate or fetch and cache it
+
+        :param key: key of the aggregate, see :py:func:`cache_key`
+        :param fetch: callable retrieving the aggregate from the datasource
+        :param granularity: granularity of the aggregate in seconds
+        :return: the aggregate
+        """
+        value = self.get(key)
+        if value is NO_VALUE:
+            value = fetch()
+            self.set(key, value, granularity)
+        return value
+
+    def _move_to_end(self, key):
+        # OrderedDict.move_to_end() is not available on Python 2.7
+        self._entries[key] = self._entries.pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {'size': len(self._entries), 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
@@ -19,18 +19,32 @@
 import datetime
 
 from ceilometerclient import exc
+from oslo_log import log
 from oslo_utils import timeutils
 
 from watcher._i18n import _
 from watcher.common import clients
 from watcher.common import exception
+from watcher.datasource import base
+from watcher.datasource import cache
+
+LOG = log.getLogger(__name__)
 
 
 class CeilometerHelper(object):
+
+    # Minimum number of resources whose statistics are queried at once,
+    # grouped by resource. Ceilometer cannot filter the statistics on a list
+    # of resources, so such a query covers all the resources of the cloud,
+    # and is only worth it instead of a query per resource if many of them
+    # are needed.
+    GROUPBY_MIN_RESOURCES = 20
+
     def __init__(self, osc=None):
         """:param osc: an OpenStackClients instance"""
-        self.osc = osc if osc else clients.OpenStackClients()
+        self.osc = osc if osc else clients.get_shared_clients()
         self.ceilometer = self.osc.ceilometer()
+        self.metric_cache = cache.MetricCache()
 
     @staticmethod
     def format_query(user_id, tenant_id, resource_id,
@@ -144,7 +158,18 @@ class CeilometerHelper(object):
                            min, max, sum, stddev, avg. Defaults to avg.
         :return: Return the latest statistical data, None if no data.
         """
+        return self.metric_cache.get_or_fetch(
+            self._cache_key(resource_id, meter_name, period, aggregate),
+            lambda: self._statistic_aggregation(
+                resource_id, meter_name, period, aggregate))
+
+    @staticmethod
+    def _cache_key(resource_id, meter_name, period, aggregate):
+        return cache.cache_key('ceilometer', resource_id, meter_name,
+                               period=int(period), aggregation=aggregate)
 
+    def _statistic_aggregation(self, resource_id, meter_name, period,
+                               aggregate):
         end_time = datetime.datetime.utcnow()
         start_time = end_time - datetime.timedelta(seconds=int(period))
         query = self.build_query(
@@ -161,6 +186,88 @@ class CeilometerHelper(object):
             item_value = statistic[-1]._info.get('aggregate').get(aggregate)
         return item_value
 
+    def statistic_aggregations(self,
+                               resource_ids,
+                               meter_names,
+                               period,
+                               aggregate='avg',
+                               max_workers=base.DEFAULT_MAX_WORKERS):
+        """Representing the statistic aggregates of many resources
+
+        The statistics of each meter are grouped by resource so that a single
+        query is needed per meter, provided that at least
+        ``GROUPBY_MIN_RESOURCES`` resources are needed. Otherwise, or if a
+        grouped query fails, the statistics of this meter are queried
+        concurrently, one resource at a time. Only the aggregates which are
+        not cached are queried.
+
+        :param resource_ids: ids of the resources to list statistics for.
+        :param meter_names: Names of the meters to list statistics for.
+        :param period: Period in seconds over which to group samples.
+        :param aggregate: Available aggregates are: count, cardinality,
+                           min, max, sum, stddev, avg. Defaults to avg.
+        :param max_workers: Maximum number of concurrent queries sent when
+                            falling back to one query per resource.
+        :return: Return the latest statistical data of each meter of each
+                 resource as ``{resource_id: {meter_name: value}}``, a value
+                 being None if there is no data.
+        """
+        aggregations = {resource_id: {} for resource_id in resource_ids}
+        end_time = datetime.datetime.utcnow()
+        start_time = end_time - datetime.timedelta(seconds=int(period))
+        query = self.build_query(start_time=start_time, end_time=end_time)
+
+        def fetch(resource_id, meter_name):
+            value = self._statistic_aggregation(
+                resource_id, meter_name, period, aggregate)
+            self.metric_cache.set(
+                self._cache_key(resource_id, meter_name, period, aggregate),
+                value)
+            return value
+
+        for meter_name in meter_names:
+            missing = base.get_cached_aggregations(
+                self.metric_cache, aggregations, meter_name,
+                lambda rid: self._cache_key(rid, meter_name, period,
+                                            aggregate))
+            if not missing:
+                continue
+            statistics = None
+            if len(missing) >= self.GROUPBY_MIN_RESOURCES:
+                try:
+                    statistics = self.query_retry(
+                        f=self.ceilometer.statistics.list,
+                        meter_name=meter_name,
+                        q=query,
+                        period=period,
+                        groupby=['resource_id'],
+                        aggregates=[{'func': aggregate}])
+                except Exception as e:
+                    LOG.exception(e)
+            if statistics is None:
+                fallback = base.fan_out_aggregations(
+                    fetch, missing, [meter_name], max_workers=max_workers)
+                for resource_id, values in fallback.items():
+                    aggregations[resource_id].update(values)
+                continue
+
+            values = dict.fromkeys(missing)
+            # The statistics are sorted by period so the latest statistic of
+            # a resource is the last one of its group
+            for statistic in statistics:
+                info = statistic._info
+                resource_id = info.get('groupby', {}).get('resource_id')
+                if resource_id in values:
+                    values[resource_id] = info.get('aggregate').get(aggregate)
+            for resource_id, value in values.items():
+                aggregations[resource_id][meter_name] = value
+                self.metric_cache.set(
+                    self._cache_key(resource_id, meter_name, period,
+                                    aggregate),
+                    value)
+
+        return aggregations
+
     def get_last_sample_values(self, resource_id, meter_name, limit=1):
         samples = self.query_sample(
             meter_name=meter_name,
@@ -16,6 +16,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 from datetime import datetime
 import time
 
@@ -24,6 +25,8 @@ from oslo_log import log
 
 from watcher.common import clients
 from watcher.common import exception
+from watcher.datasource import base
+from watcher.datasource import cache
 
 CONF = cfg.CONF
 LOG = log.getLogger(__name__)
@@ -33,8 +36,9 @@ class GnocchiHelper(object):
 
     def __init__(self, osc=None):
         """:param osc: an OpenStackClients instance"""
-        self.osc = osc if osc else clients.OpenStackClients()
+        self.osc = osc if osc else clients.get_shared_clients()
         self.gnocchi = self.osc.gnocchi()
+        self.metric_cache = cache.MetricCache()
 
     def query_retry(self, f, *args, **kwargs):
         for i in range(CONF.gnocchi_client.query_max_retries):
@@ -45,6 +49,16 @@ class GnocchiHelper(object):
                 time.sleep(CONF.gnocchi_client.query_timeout)
         raise
 
+    @staticmethod
+    def _check_time_params(start_time, stop_time):
+        if start_time is not None and not isinstance(start_time, datetime):
+            raise exception.InvalidParameter(parameter='start_time',
+                                             parameter_type=datetime)
+
+        if stop_time is not None and not isinstance(stop_time, datetime):
+            raise exception.InvalidParameter(parameter='stop_time',
+                                             parameter_type=datetime)
+
     def statistic_aggregation(self,
                               resource_id,
                               metric,
@@ -63,15 +77,26 @@ class GnocchiHelper(object):
                             aggregations
         :return: value of aggregated metric
         """
-
-        if start_time is not None and not isinstance(start_time, datetime):
-            raise exception.InvalidParameter(parameter='start_time',
-                                             parameter_type=datetime)
-
-        if stop_time is not None and not isinstance(stop_time, datetime):
-            raise exception.InvalidParameter(parameter='stop_time',
-                                             parameter_type=datetime)
-
+        self._check_time_params(start_time, stop_time)
+
+        return self.metric_cache.get_or_fetch(
+            self._cache_key(resource_id, metric, granularity, start_time,
+                            stop_time, aggregation),
+            lambda: self._statistic_aggregation(
+                resource_id, metric, granularity, start_time, stop_time,
+                aggregation),
+            granularity=granularity)
+
+    @staticmethod
+    def _cache_key(resource_id, metric, granularity, start_time, stop_time,
+                   aggregation):
+        return cache.cache_key(
+            'gnocchi', resource_id, metric,
+            period=cache.window_length(start_time, stop_time),
+            granularity=granularity, aggregation=aggregation)
+
+    def _statistic_aggregation(self, resource_id, metric, granularity,
+                               start_time, stop_time, aggregation):
         raw_kwargs = dict(
             metric=metric,
             start=start_time,
@@ -90,3 +115,91 @@ class GnocchiHelper(object):
             # return value of latest measure
             # measure has structure [time, granularity, value]
             return statistics[-1][2]
+
+    def statistic_aggregations(self,
+                               resource_ids,
+                               metrics,
+                               granularity,
+                               start_time=None,
+                               stop_time=None,
+                               aggregation='mean',
+                               max_workers=base.DEFAULT_MAX_WORKERS):
+        """Representing the statistic aggregates of many resources
+
+        The measures of each metric are retrieved for all the resources at
+        once through the aggregation API, grouped by resource. If this query
+        fails, the measures of this metric are queried concurrently, one
+        resource at a time. Only the aggregates which are not cached are
+        queried.
+
+        :param resource_ids: ids of the resources to list statistics for
+        :param metrics: metric names of which we want the statistics
+        :param start_time: Start datetime from which metrics will be used
+        :param stop_time: End datetime from which metrics will be used
+        :param granularity: frequency of marking metric point, in seconds
+        :param aggregation: Should be chosen in accordance with policy
+                            aggregations
+        :param max_workers: Maximum number of concurrent queries sent when
+                            falling back to one query per resource
+        :return: value of each aggregated metric of each resource as
+                 ``{resource_id: {metric: value}}``, a value being None if
+                 there is no measure
+        """
+        self._check_time_params(start_time, stop_time)
+
+        # Ordered so that the resources are queried in a consistent order
+        aggregations = collections.OrderedDict(
+            (resource_id, {}) for resource_id in resource_ids)
+
+        def make_key(resource_id, metric):
+            return self._cache_key(resource_id, metric, granularity,
+                                   start_time, stop_time, aggregation)
+
+        def fetch(resource_id, metric):
+            value = self._statistic_aggregation(
+                resource_id, metric, granularity, start_time, stop_time,
+                aggregation)
+            self.metric_cache.set(make_key(resource_id, metric), value,
+                                  granularity=granularity)
+            return value
+
+        for metric in metrics:
+            missing = base.get_cached_aggregations(
+                self.metric_cache, aggregations, metric,
+                lambda rid: make_key(rid, metric))
+            if not missing:
+                continue
+            # Not retried as the per-resource fallback already retries
+            try:
+                groups = self.gnocchi.metric.aggregation(
+                    metrics=metric,
+                    query={"in": {"id": missing}},
+                    start=start_time,
+                    stop=stop_time,
+                    aggregation=aggregation,
+                    granularity=granularity,
+                    groupby=['id', 'original_resource_id'])
+            except Exception as e:
+                LOG.exception(e)
+                fallback = base.fan_out_aggregations(
+                    fetch, missing, [metric], max_workers=max_workers)
+                for resource_id, values in fallback.items():
+                    aggregations[resource_id].update(values)
+                continue
+
+            values = dict.fromkeys(missing)
+            for group in groups:
+                # Resources named after something else than a UUID are
+                # identified by their original id
+                resource_id = group['group'].get('original_resource_id')
+                if resource_id not in values:
+                    resource_id = group['group'].get('id')
+                if resource_id in values and group['measures']:
+                    # measure has structure [time, granularity, value]
+                    values[resource_id] = group['measures'][-1][2]
+            for resource_id, value in values.items():
+                aggregations[resource_id][metric] = value
+                self.metric_cache.set(make_key(resource_id, metric), value,
+                                      granularity=granularity)
+
+        return aggregations
@@ -19,16 +19,26 @@
 import datetime
 
 from monascaclient import exc
+from oslo_log import log
 
 from watcher.common import clients
+from watcher.datasource import base
+from watcher.datasource import cache
+
+LOG = log.getLogger(__name__)
+
+# Maximum number of dimension values filtered on by a single query, in order
+# to bound the length of its URL
+MAX_DIMENSION_VALUES = 100
 
 
 class MonascaHelper(object):
 
     def __init__(self, osc=None):
         """:param osc: an OpenStackClients instance"""
-        self.osc = osc if osc else clients.OpenStackClients()
+        self.osc = osc if osc else clients.get_shared_clients()
         self.monasca = self.osc.monasca()
+        self.metric_cache = cache.MetricCache()
 
     def query_retry(self, f, *args, **kwargs):
         try:
@@ -102,6 +112,25 @@ class MonascaHelper(object):
         :param aggregate: Should be either 'avg', 'count', 'min' or 'max'
         :return: A list of dict with each dict being a distinct result row
         """
+        return self.metric_cache.get_or_fetch(
+            self._cache_key(meter_name, dimensions, start_time, end_time,
+                            period, aggregate, group_by),
+            lambda: self._statistic_aggregation(
+                meter_name, dimensions, start_time, end_time, period,
+                aggregate, group_by),
+            granularity=period)
+
+    @staticmethod
+    def _cache_key(meter_name, dimensions, start_time, end_time, period,
+                   aggregate, group_by):
+        resource = (tuple(sorted((dimensions or {}).items())), group_by)
+        return cache.cache_key(
+            'monasca', resource, meter_name,
+            period=cache.window_length(start_time, end_time),
+            granularity=period, aggregation=aggregate)
+
+    def _statistic_aggregation(self, meter_name, dimensions, start_time,
+                               end_time, period, aggregate, group_by):
         start_timestamp, end_timestamp, period = self._format_time_params(
             start_time, end_time, period
         )
@@ -122,3 +151,81 @@ class MonascaHelper(object):
             f=self.monasca.metrics.list_statistics, **kwargs)
 
         return statistics
+
+    def statistic_aggregations(self,
+                               meter_names,
+                               dimension,
+                               values,
+                               start_time=None,
+                               end_time=None,
+                               period=None,
+                               aggregate='avg',
+                               max_workers=base.DEFAULT_MAX_WORKERS):
+        """Representing the statistic aggregates of many resources
+
+        The resources are identified by the value of one of their dimensions,
+        e.g. their ``hostname`` or ``resource_id``. The statistics of each
+        meter are filtered on many of these values at once and grouped by
+        this dimension. If such a query fails, the statistics of this meter
+        are queried concurrently, one value at a time. Only the statistics
+        which are not cached are queried.
+
+        :param meter_names: meter names of which we want the statistics
+        :param dimension: name of the dimension identifying the resources
+        :param values: values of this dimension to list statistics for
+        :param start_time: Start datetime from which metrics will be used
+        :param end_time: End datetime from which metrics will be used
+        :param period: Sampling `period`: In seconds.
+        :param aggregate: Should be either 'avg', 'count', 'min' or 'max'
+        :param max_workers: Maximum number of concurrent queries sent when
+                            falling back to one query per value
+        :return: the result rows of each meter of each value as
+                 ``{value: {meter_name: [row, ...]}}``
+        """
+        values = list(values)
+        aggregations = {value: {} for value in values}
+
+        def make_key(value, meter_name):
+            return self._cache_key(meter_name, {dimension: value},
+                                   start_time, end_time, period, aggregate,
+                                   dimension)
+
+        def fetch(value, meter_name):
+            rows = self._statistic_aggregation(
+                meter_name, {dimension: value}, start_time, end_time,
+                period, aggregate, dimension)
+            self.metric_cache.set(make_key(value, meter_name), rows,
+                                  granularity=period)
+            return rows
+
+        for meter_name in meter_names:
+            missing = base.get_cached_aggregations(
+                self.metric_cache, aggregations, meter_name,
+                lambda value: make_key(value, meter_name))
+            chunks = [missing[i:i + MAX_DIMENSION_VALUES]
+                      for i in range(0, len(missing), MAX_DIMENSION_VALUES)]
+            for chunk in chunks:
+                try:
+                    statistics = self._statistic_aggregation(
+                        meter_name, {dimension: '|'.join(chunk)},
+                        start_time, end_time, period, aggregate, dimension)
+                except Exception as e:
+                    LOG.exception(e)
+                    fallback = base.fan_out_aggregations(
+                        fetch, chunk, [meter_name], max_workers=max_workers)
+                    for value, rows in fallback.items():
+                        aggregations[value][meter_name] = (
+                            rows[meter_name] or [])
+                    continue
+
+                rows = {value: [] for value in chunk}
+                for row in statistics:
+                    value = row.get('dimensions', {}).get(dimension)
+                    if value in rows:
+                        rows[value].append(row)
+                for value, value_rows in rows.items():
+                    aggregations[value][meter_name] = value_rows
+                    self.metric_cache.set(make_key(value, meter_name),
+                                          value_rows, granularity=period)
+
+        return aggregations
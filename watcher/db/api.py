@@ -467,6 +467,17 @@ class BaseConnection(object):
         :raises: :py:class:`~.ActionAlreadyExists`
         """
 
+    @abc.abstractmethod
+    def create_actions(self, values_list):
+        """Create several new actions in a single transaction.
+
+        :param values_list: A list of dicts, each of them containing the
+                            items of an action as given to
+                            :py:meth:`create_action`.
+        :returns: The list of the created actions, in the same order.
+        :raises: :py:class:`~.ActionAlreadyExists`
+        """
+
     @abc.abstractmethod
     def get_action_by_id(self, context, action_id, eager=False):
         """Return a action.
@@ -640,6 +651,18 @@ class BaseConnection(object):
         :raises: :py:class:`~.EfficacyIndicatorAlreadyExists`
         """
 
+    @abc.abstractmethod
+    def create_efficacy_indicators(self, values_list):
+        """Create several new efficacy indicators in a single transaction.
+
+        :param values_list: A list of dicts, each of them containing the
+                            items of an efficacy indicator as given to
+                            :py:meth:`create_efficacy_indicator`.
+        :returns: The list of the created efficacy indicators, in the same
+                  order.
+        :raises: :py:class:`~.EfficacyIndicatorAlreadyExists`
+        """
+
     @abc.abstractmethod
     def get_efficacy_indicator_by_id(self, context, efficacy_indicator_id,
                                      eager=False):
@@ -869,3 +892,52 @@ class BaseConnection(object):
         :returns: A service.
         :raises: :py:class:`~.ServiceNotFound`
         """
+
+    @abc.abstractmethod
+    def get_purgeable_ids(self, table, expiry_date=None, uuid=None,
+                          exclude_orphans=False, goal_id=None, limit=None):
+        """Return the IDs of the entries of a table that can be purged.
+
+        The entries that can be purged are the soft deleted ones which
+        expired, the soft deleted children of these and, unless excluded,
+        the orphans, i.e. the entries which are not deleted but one of
+        whose parents is. When the orphans are left out, the action plans
+        still referenced by actions which are not deleted are left out too.
+
+        :param table: The name of the table, i.e. 'goals', 'strategies',
+                      'audit_templates', 'audits', 'action_plans' or
+                      'actions'
+        :param expiry_date: The date before which the soft deleted entries
+                            expired. If None, all of them expired.
+        :param uuid: If set, only the entry with this UUID expired.
+        :param exclude_orphans: Whether to leave the orphans out.
+        :param goal_id: If set, only the entries related to this goal are
+                        returned.
+        :param limit: Maximum number of IDs to return.
+        :returns: A list of IDs, in ascending order.
+        """
+
+    @abc.abstractmethod
+    def count_purgeable(self, table, expiry_date=None, uuid=None,
+                        exclude_orphans=False):
+        """Count the entries of a table that can be purged.
+
+        :param table: The name of the table, see :py:meth:`get_purgeable_ids`
+        :param expiry_date: The date before which the soft deleted entries
+                            expired. If None, all of them expired.
+        :param uuid: If set, only the entry with this UUID expired.
+        :param exclude_orphans: Whether to leave the orphans out.
+        :returns: The number of entries.
+        """
+
+    @abc.abstractmethod
+    def destroy_entries(self, table, ids):
+        """Destroy entries of a table in a single transaction.
+
+        The efficacy indicators of the destroyed action plans are destroyed
+        along.
+
+        :param table: The name of the table, see :py:meth:`get_purgeable_ids`
+        :param ids: The IDs of the entries to destroy.
+        :returns: The number of entries destroyed.
+        """
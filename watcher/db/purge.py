@@ -19,7 +19,6 @@ from __future__ import print_function
 
 import collections
 import datetime
-import itertools
 import sys
 
 from oslo_log import log
@@ -32,18 +31,43 @@ from watcher._i18n import lazy_translation_enabled
 from watcher.common import context
 from watcher.common import exception
 from watcher.common import utils
+from watcher.db import api as db_api
 from watcher import objects
 
 LOG = log.getLogger(__name__)
 
 
+# Default maximum number of entries deleted per transaction
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _translate(text):
+    return text.translate() if lazy_translation_enabled() else text
+
+
+def get_count_table(counts):
+    """Table of the number of objects per type
+
+    :param counts: mapping of the number of objects per type, keyed by the
+                   keys of :py:attr:`WatcherObjectsMap.keymap`
+    """
+    headers = list(WatcherObjectsMap.keymap.values())
+    headers.append(_("Total"))  # We also add a total count
+
+    counters = [counts.get(key, 0) for key in WatcherObjectsMap.keys()]
+    counters.append(sum(counters))
+    table = ptable.PrettyTable(
+        field_names=[_translate(header) for header in headers])
+    table.add_row(counters)
+    return table.get_string()
+
+
 class WatcherObjectsMap(object):
-    """Wrapper to deal with watcher objects per type
+    """Wrapper to deal with the IDs of watcher objects per type
 
-    This wrapper object contains a list of watcher objects per type.
+    This wrapper object contains a list of watcher object IDs per type.
     Its main use is to simplify the merge of watcher objects by avoiding
-    duplicates, but also for representing the relationships between these
-    objects.
+    duplicates.
     """
 
     # This is for generating the .pot translations
@@ -67,30 +91,22 @@ class WatcherObjectsMap(object):
     def keys(cls):
         return cls.keymap.keys()
 
-    def __iter__(self):
-        return itertools.chain(*self.values())
-
     def __add__(self, other):
         new_map = self.__class__()
 
         # Merge the 2 items dicts into a new object (and avoid dupes)
         for attr_name, initials, others in zip(self.keys(), self.values(),
                                                other.values()):
-            # Creates a copy
-            merged = initials[:]
-            initials_ids = [item.id for item in initials]
-            non_dupes = [item for item in others
-                         if item.id not in initials_ids]
-            merged += non_dupes
-
+            initial_ids = set(initials)
+            merged = initials + [item_id for item_id in others
+                                 if item_id not in initial_ids]
             setattr(new_map, attr_name, merged)
 
         return new_map
 
     def __str__(self):
         out = ""
-        for key, vals in zip(self.keys(), self.values()):
-            ids = [val.id for val in vals]
+        for key, ids in zip(self.keys(), self.values()):
             out += "%(key)s: %(val)s" % (dict(key=key, val=ids))
             out += "\n"
         return out
@@ -98,18 +114,12 @@ class WatcherObjectsMap(object):
     def __len__(self):
         return sum(len(getattr(self, key)) for key in self.keys())
 
-    def get_count_table(self):
-        headers = list(self.keymap.values())
-        headers.append(_("Total"))  # We also add a total count
-        translated_headers = [
-            h.translate() if lazy_translation_enabled() else h
-            for h in headers
-        ]
+    def get_counts(self):
+        return collections.OrderedDict(
+            (key, len(ids)) for key, ids in zip(self.keys(), self.values()))
 
-        counters = [len(cat_vals) for cat_vals in self.values()] + [len(self)]
-        table = ptable.PrettyTable(field_names=translated_headers)
-        table.add_row(counters)
-        return table.get_string()
+    def get_count_table(self):
+        return get_count_table(self.get_counts())
 
 
 class PurgeCommand(object):
@@ -117,25 +127,36 @@ class PurgeCommand(object):
 
     The workflow for this purge is the following:
 
-    # Find soft deleted objects which are expired
-    # Find orphan objects
-    # Find their related objects whether they are expired or not
-    # Merge them together
-    # If it does not exceed the limit, destroy them all
+    # Count the soft deleted objects which are expired, their related
+      objects whether they are expired or not, and the orphan objects, all
+      of them being selected by the database
+    # If it does not exceed the limit, destroy them all, by batches
+    # Otherwise, find the objects of as many goals as the limit allows and
+      destroy them
+
+    The objects are destroyed by batches of at most ``batch_size`` entries
+    per transaction, the children first, and the progress is reported
+    after each batch.
     """
 
     ctx = context.make_context(show_deleted=True)
+    dbapi = db_api.get_instance()
 
     def __init__(self, age_in_days=None, max_number=None,
-                 uuid=None, exclude_orphans=False, dry_run=None):
+                 uuid=None, exclude_orphans=False, dry_run=None,
+                 batch_size=DEFAULT_BATCH_SIZE):
         self.age_in_days = age_in_days
         self.max_number = max_number
         self.uuid = uuid
         self.exclude_orphans = exclude_orphans
         self.dry_run = dry_run
+        self.batch_size = batch_size
 
         self._delete_up_to_max = None
-        self._objects_map = WatcherObjectsMap()
+        # Number of objects to delete per type
+        self._counts = WatcherObjectsMap().get_counts()
+        # IDs of the objects to delete if limited, None meaning all of them
+        self._objects_map = None
 
     def get_expiry_date(self):
         if not self.age_in_days:
@@ -167,154 +188,56 @@ class PurgeCommand(object):
 
         return goal.uuid
 
-    def _find_goals(self, filters=None):
-        return objects.Goal.list(self.ctx, filters=filters)
-
-    def _find_strategies(self, filters=None):
-        return objects.Strategy.list(self.ctx, filters=filters)
-
-    def _find_audit_templates(self, filters=None):
-        return objects.AuditTemplate.list(self.ctx, filters=filters)
-
-    def _find_audits(self, filters=None):
-        return objects.Audit.list(self.ctx, filters=filters)
-
-    def _find_action_plans(self, filters=None):
-        return objects.ActionPlan.list(self.ctx, filters=filters)
-
-    def _find_actions(self, filters=None):
-        return objects.Action.list(self.ctx, filters=filters)
-
-    def _find_orphans(self):
-        orphans = WatcherObjectsMap()
-
-        filters = dict(deleted=False)
-        goals = objects.Goal.list(self.ctx, filters=filters)
-        strategies = objects.Strategy.list(self.ctx, filters=filters)
-        audit_templates = objects.AuditTemplate.list(self.ctx, filters=filters)
-        audits = objects.Audit.list(self.ctx, filters=filters)
-        action_plans = objects.ActionPlan.list(self.ctx, filters=filters)
-        actions = objects.Action.list(self.ctx, filters=filters)
-
-        goal_ids = set(g.id for g in goals)
-        orphans.strategies = [
-            strategy for strategy in strategies
-            if strategy.goal_id not in goal_ids]
-
-        strategy_ids = [s.id for s in (s for s in strategies
-                                       if s not in orphans.strategies)]
-        orphans.audit_templates = [
-            audit_template for audit_template in audit_templates
-            if audit_template.goal_id not in goal_ids or
-            (audit_template.strategy_id and
-             audit_template.strategy_id not in strategy_ids)]
-
-        orphans.audits = [
-            audit for audit in audits
-            if audit.goal_id not in goal_ids or
-            (audit.strategy_id and
-             audit.strategy_id not in strategy_ids)]
-
-        # Objects with orphan parents are themselves orphans
-        audit_ids = [audit.id for audit in audits
-                     if audit not in orphans.audits]
-        orphans.action_plans = [
-            ap for ap in action_plans
-            if ap.audit_id not in audit_ids or
-            ap.strategy_id not in strategy_ids]
-
-        # Objects with orphan parents are themselves orphans
-        action_plan_ids = [ap.id for ap in action_plans
-                           if ap not in orphans.action_plans]
-        orphans.actions = [
-            action for action in actions
-            if action.action_plan_id not in action_plan_ids]
-
-        LOG.debug("Orphans found:\n%s", orphans)
-        LOG.info("Orphans found:\n%s", orphans.get_count_table())
-
-        return orphans
-
-    def _find_soft_deleted_objects(self):
+    def _get_selection(self):
+        return dict(expiry_date=self.get_expiry_date(), uuid=self.uuid,
+                    exclude_orphans=self.exclude_orphans)
+
+    def count_objects_to_delete(self):
+        """Counts the objects to be purged
+
+        :returns: The number of objects to purge per type
+        :rtype: :py:class:`collections.OrderedDict` instance
+        """
+        selection = self._get_selection()
+        counts = collections.OrderedDict(
+            (key, self.dbapi.count_purgeable(key, **selection))
+            for key in WatcherObjectsMap.keys())
+
+        LOG.info("Objects to be deleted:\n%s", get_count_table(counts))
+
+        return counts
+
+    def find_objects_to_delete(self, goal_id=None):
+        """Finds all the objects to be purged
+
+        :param goal_id: If set, only the objects related to this goal
+        :returns: A mapping with the IDs of the Watcher objects to purge
+        :rtype: :py:class:`~.WatcherObjectsMap` instance
+        """
+        selection = self._get_selection()
         to_be_deleted = WatcherObjectsMap()
-        expiry_date = self.get_expiry_date()
-        filters = dict(deleted=True)
-
-        if self.uuid:
-            filters["uuid"] = self.uuid
-        if expiry_date:
-            filters.update(dict(deleted_at__lt=expiry_date))
-
-        to_be_deleted.goals.extend(self._find_goals(filters))
-        to_be_deleted.strategies.extend(self._find_strategies(filters))
-        to_be_deleted.audit_templates.extend(
-            self._find_audit_templates(filters))
-        to_be_deleted.audits.extend(self._find_audits(filters))
-        to_be_deleted.action_plans.extend(
-            self._find_action_plans(filters))
-        to_be_deleted.actions.extend(self._find_actions(filters))
-
-        soft_deleted_objs = self._find_related_objects(
-            to_be_deleted, base_filters=dict(deleted=True))
-
-        LOG.debug("Soft deleted objects:\n%s", soft_deleted_objs)
-
-        return soft_deleted_objs
-
-    def _find_related_objects(self, objects_map, base_filters=None):
-        base_filters = base_filters or {}
-
-        for goal in objects_map.goals:
-            filters = {}
-            filters.update(base_filters)
-            filters.update(dict(goal_id=goal.id))
-            related_objs = WatcherObjectsMap()
-            related_objs.strategies = self._find_strategies(filters)
-            related_objs.audit_templates = self._find_audit_templates(filters)
-            related_objs.audits = self._find_audits(filters)
-            objects_map += related_objs
-
-        for strategy in objects_map.strategies:
-            filters = {}
-            filters.update(base_filters)
-            filters.update(dict(strategy_id=strategy.id))
-            related_objs = WatcherObjectsMap()
-            related_objs.audit_templates = self._find_audit_templates(filters)
-            related_objs.audits = self._find_audits(filters)
-            objects_map += related_objs
-
-        for audit in objects_map.audits:
-            filters = {}
-            filters.update(base_filters)
-            filters.update(dict(audit_id=audit.id))
-            related_objs = WatcherObjectsMap()
-            related_objs.action_plans = self._find_action_plans(filters)
-            objects_map += related_objs
-
-        for action_plan in objects_map.action_plans:
-            filters = {}
-            filters.update(base_filters)
-            filters.update(dict(action_plan_id=action_plan.id))
-            related_objs = WatcherObjectsMap()
-            related_objs.actions = self._find_actions(filters)
-            objects_map += related_objs
-
-        return objects_map
+        for key in to_be_deleted.keys():
+            setattr(to_be_deleted, key, self.dbapi.get_purgeable_ids(
+                key, goal_id=goal_id, **selection))
+
+        LOG.debug("Objects to be deleted:\n%s", to_be_deleted)
+
+        return to_be_deleted
 
     def confirmation_prompt(self):
-        print(self._objects_map.get_count_table())
+        print(get_count_table(self._counts))
         raw_val = input(
             _("There are %(count)d objects set for deletion. "
-              "Continue? [y/N]") % dict(count=len(self._objects_map)))
+              "Continue? [y/N]") % dict(count=sum(self._counts.values())))
 
         return strutils.bool_from_string(raw_val)
 
-    def delete_up_to_max_prompt(self, objects_map):
-        print(objects_map.get_count_table())
+    def delete_up_to_max_prompt(self, counts):
+        print(get_count_table(counts))
         print(_("The number of objects (%(num)s) to delete from the database "
                 "exceeds the maximum number of objects (%(max_number)s) "
                 "specified.") % dict(max_number=self.max_number,
-                                     num=len(objects_map)))
+                                     num=sum(counts.values())))
         raw_val = input(
             _("Do you want to delete objects up to the specified maximum "
               "number? [y/N]"))
@@ -323,62 +246,15 @@ class PurgeCommand(object):
 
         return self._delete_up_to_max
 
-    def _aggregate_objects(self):
-        """Objects aggregated on a 'per goal' basis"""
-        # todo: aggregate orphans as well
-        aggregate = []
-        for goal in self._objects_map.goals:
-            related_objs = WatcherObjectsMap()
-
-            # goals
-            related_objs.goals = [goal]
-
-            # strategies
-            goal_ids = [goal.id]
-            related_objs.strategies = [
-                strategy for strategy in self._objects_map.strategies
-                if strategy.goal_id in goal_ids
-            ]
-
-            # audit templates
-            strategy_ids = [
-                strategy.id for strategy in related_objs.strategies]
-            related_objs.audit_templates = [
-                at for at in self._objects_map.audit_templates
-                if at.goal_id in goal_ids or
-                (at.strategy_id and at.strategy_id in strategy_ids)
-            ]
-
-            # audits
-            related_objs.audits = [
-                audit for audit in self._objects_map.audits
-                if audit.goal_id in goal_ids
-            ]
-
-            # action plans
-            audit_ids = [audit.id for audit in related_objs.audits]
-            related_objs.action_plans = [
-                action_plan for action_plan in self._objects_map.action_plans
-                if action_plan.audit_id in audit_ids
-            ]
-
-            # actions
-            action_plan_ids = [
-                action_plan.id for action_plan in related_objs.action_plans
-            ]
-            related_objs.actions = [
-                action for action in self._objects_map.actions
-                if action.action_plan_id in action_plan_ids
-            ]
-            aggregate.append(related_objs)
-
-        return aggregate
-
     def _get_objects_up_to_limit(self):
-        aggregated_objects = self._aggregate_objects()
+        """Objects of as many goals as the limit allows"""
+        # todo: aggregate orphans as well
         to_be_deleted_subset = WatcherObjectsMap()
 
-        for aggregate in aggregated_objects:
+        goal_ids = self.dbapi.get_purgeable_ids(
+            'goals', **self._get_selection())
+        for goal_id in goal_ids:
+            aggregate = self.find_objects_to_delete(goal_id=goal_id)
             if len(aggregate) + len(to_be_deleted_subset) <= self.max_number:
                 to_be_deleted_subset += aggregate
             else:
@@ -387,51 +263,70 @@ class PurgeCommand(object):
         LOG.debug(to_be_deleted_subset)
         return to_be_deleted_subset
 
-    def find_objects_to_delete(self):
-        """Finds all the objects to be purged
-
-        :returns: A mapping with all the Watcher objects to purged
-        :rtype: :py:class:`~.WatcherObjectsMap` instance
-        """
-        to_be_deleted = self._find_soft_deleted_objects()
-
-        if not self.exclude_orphans:
-            to_be_deleted += self._find_orphans()
-
-        LOG.debug("Objects to be deleted:\n%s", to_be_deleted)
+    def _find_batches(self, key):
+        """Batches of the IDs of the objects of a type to delete"""
+        total = self._counts[key]
+        if self._objects_map is not None:
+            ids = getattr(self._objects_map, key)
+            for index in range(0, len(ids), self.batch_size):
+                yield ids[index:index + self.batch_size]
+            return
 
-        return to_be_deleted
+        # The objects are selected anew for each batch, those of the
+        # previous batch being gone, up to the number which was confirmed
+        found = 0
+        while found < total:
+            ids = self.dbapi.get_purgeable_ids(
+                key, limit=min(self.batch_size, total - found),
+                **self._get_selection())
+            if not ids:
+                return
+            found += len(ids)
+            yield ids
 
     def do_delete(self):
+        """Destroys the objects to be purged by batches
+
+        :returns: The number of objects destroyed per type
+        :rtype: :py:class:`collections.OrderedDict` instance
+        """
         LOG.info("Deleting...")
+        deleted = WatcherObjectsMap().get_counts()
         # Reversed to avoid errors with foreign keys
-        for entry in reversed(list(self._objects_map)):
-            entry.destroy()
+        for key in reversed(list(deleted)):
+            for ids in self._find_batches(key):
+                deleted[key] += self.dbapi.destroy_entries(key, ids)
+                progress = _("%(name)s: %(deleted)d/%(total)d purged") % dict(
+                    name=_translate(WatcherObjectsMap.keymap[key]),
+                    deleted=deleted[key], total=self._counts[key])
+                LOG.debug(progress)
+                print(progress)
+        return deleted
 
     def execute(self):
         LOG.info("Starting purge command")
-        self._objects_map = self.find_objects_to_delete()
+        self._counts = self.count_objects_to_delete()
 
         if (self.max_number is not None and
-                len(self._objects_map) > self.max_number):
-            if self.delete_up_to_max_prompt(self._objects_map):
+                sum(self._counts.values()) > self.max_number):
+            if self.delete_up_to_max_prompt(self._counts):
                 self._objects_map = self._get_objects_up_to_limit()
+                self._counts = self._objects_map.get_counts()
             else:
                 return
 
         _orphans_note = (_(" (orphans excluded)") if self.exclude_orphans
                          else _(" (may include orphans)"))
         if not self.dry_run and self.confirmation_prompt():
-            self.do_delete()
+            self._counts = self.do_delete()
             print(_("Purge results summary%s:") % _orphans_note)
             LOG.info("Purge results summary%s:", _orphans_note)
         else:
-            LOG.debug(self._objects_map)
             print(_("Here below is a table containing the objects "
                     "that can be purged%s:") % _orphans_note)
 
-        LOG.info("\n%s", self._objects_map.get_count_table())
-        print(self._objects_map.get_count_table())
+        LOG.info("\n%s", get_count_table(self._counts))
+        print(get_count_table(self._counts))
         LOG.info("Purge process completed")
 
 
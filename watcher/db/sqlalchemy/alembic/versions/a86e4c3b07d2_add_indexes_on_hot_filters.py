@@ -0,0 +1,40 @@
+"""Add indexes on the columns the audits and actions are filtered on
+
+Revision ID: a86e4c3b07d2
+Revises: d098df6021e2
+Create Date: 2017-07-12 10:42:17.318905
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a86e4c3b07d2'
+down_revision = 'd098df6021e2'
+
+# (index name, table name, column names)
+INDEXES = [
+    ('audits_state_deleted_at_idx', 'audits', ['state', 'deleted_at']),
+    ('audits_audit_type_state_idx', 'audits', ['audit_type', 'state']),
+    ('audits_deleted_at_idx', 'audits', ['deleted_at']),
+    ('action_plans_audit_id_deleted_at_idx', 'action_plans',
+     ['audit_id', 'deleted_at']),
+    ('action_plans_state_deleted_at_idx', 'action_plans',
+     ['state', 'deleted_at']),
+    ('action_plans_deleted_at_idx', 'action_plans', ['deleted_at']),
+    ('actions_action_plan_id_deleted_at_idx', 'actions',
+     ['action_plan_id', 'deleted_at']),
+    ('actions_state_deleted_at_idx', 'actions', ['state', 'deleted_at']),
+    ('actions_deleted_at_idx', 'actions', ['deleted_at']),
+    ('efficacy_indicators_action_plan_id_deleted_at_idx',
+     'efficacy_indicators', ['action_plan_id', 'deleted_at']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -25,6 +25,7 @@ from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import session as db_session
 from oslo_db.sqlalchemy import utils as db_utils
 from oslo_utils import timeutils
+import sqlalchemy as sa
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import exc
 from sqlalchemy.orm import joinedload
@@ -111,6 +112,128 @@ NaturalJoinFilter = collections.namedtuple(
     'NaturalJoinFilter', ['join_fieldname', 'join_model'])
 
 
+class PurgeSelection(object):
+    """SQL conditions selecting the entries to purge, per table
+
+    The entries to purge are:
+
+    - the soft deleted entries which expired,
+    - the soft deleted children of the entries to purge, expired or not,
+    - unless excluded, the orphans, i.e. the entries which are not deleted
+      but one of whose parents is, directly or not.
+
+    Each of these sets is expressed with subqueries so that the database
+    computes it, instead of Watcher loading every entry.
+    """
+
+    MODELS = collections.OrderedDict([
+        ('goals', models.Goal),
+        ('strategies', models.Strategy),
+        ('audit_templates', models.AuditTemplate),
+        ('audits', models.Audit),
+        ('action_plans', models.ActionPlan),
+        ('actions', models.Action),
+    ])
+
+    # {table: [(foreign key, parent table, whether the key is optional)]}
+    PARENTS = {
+        'goals': [],
+        'strategies': [('goal_id', 'goals', False)],
+        'audit_templates': [('goal_id', 'goals', False),
+                            ('strategy_id', 'strategies', True)],
+        'audits': [('goal_id', 'goals', False),
+                   ('strategy_id', 'strategies', True)],
+        'action_plans': [('audit_id', 'audits', False),
+                         ('strategy_id', 'strategies', False)],
+        'actions': [('action_plan_id', 'action_plans', False)],
+    }
+
+    # The soft deleted children of the entries to purge are purged along,
+    # whereas the action plans of a purged strategy are not
+    CASCADES = {
+        'goals': [],
+        'strategies': [('goal_id', 'goals')],
+        'audit_templates': [('goal_id', 'goals'),
+                            ('strategy_id', 'strategies')],
+        'audits': [('goal_id', 'goals'), ('strategy_id', 'strategies')],
+        'action_plans': [('audit_id', 'audits')],
+        'actions': [('action_plan_id', 'action_plans')],
+    }
+
+    def __init__(self, expiry_date=None, uuid=None, exclude_orphans=False):
+        self.expiry_date = expiry_date
+        self.uuid = uuid
+        self.exclude_orphans = exclude_orphans
+
+    @classmethod
+    def _ids(cls, table, condition):
+        model = cls.MODELS[table]
+        return sa.select([model.id]).where(condition).correlate(None)
+
+    def _is_expired(self, model):
+        condition = model.deleted != 0
+        if self.expiry_date:
+            condition = sa.and_(condition,
+                                model.deleted_at < self.expiry_date)
+        if self.uuid:
+            condition = sa.and_(condition, model.uuid == self.uuid)
+        return condition
+
+    def _is_valid(self, table):
+        """Whether the entries are not deleted and none of their parents"""
+        model = self.MODELS[table]
+        conditions = [model.deleted == 0]
+        for column, parent, optional in self.PARENTS[table]:
+            column = getattr(model, column)
+            is_valid = column.in_(self._ids(parent, self._is_valid(parent)))
+            if optional:
+                is_valid = sa.or_(column.is_(None), is_valid)
+            conditions.append(is_valid)
+        return sa.and_(*conditions)
+
+    def is_purged(self, table):
+        """Condition selecting the entries of a table to purge"""
+        model = self.MODELS[table]
+        conditions = [self._is_expired(model)]
+        for column, parent in self.CASCADES[table]:
+            conditions.append(sa.and_(
+                model.deleted != 0,
+                getattr(model, column).in_(
+                    self._ids(parent, self.is_purged(parent)))))
+        if not self.exclude_orphans and self.PARENTS[table]:
+            conditions.append(sa.and_(
+                model.deleted == 0, sa.not_(self._is_valid(table))))
+        condition = sa.or_(*conditions)
+        if self.exclude_orphans and table == 'action_plans':
+            # As with destroy_action_plan(), the action plans which are
+            # still referenced by actions, left out as orphans, are kept
+            condition = sa.and_(condition, sa.not_(model.id.in_(
+                sa.select([models.Action.action_plan_id]).where(sa.and_(
+                    models.Action.deleted == 0,
+                    models.Action.action_plan_id.isnot(None),
+                )).correlate(None))))
+        return condition
+
+    def is_purged_with_goal(self, table, goal_id):
+        """Condition selecting the entries to purge related to a goal"""
+        model = self.MODELS[table]
+        if table == 'goals':
+            related = model.id == goal_id
+        elif table in ('strategies', 'audits'):
+            related = model.goal_id == goal_id
+        elif table == 'audit_templates':
+            related = sa.or_(
+                model.goal_id == goal_id,
+                model.strategy_id.in_(self._ids(
+                    'strategies',
+                    self.is_purged_with_goal('strategies', goal_id))))
+        else:
+            column, parent, _ = self.PARENTS[table][0]
+            related = getattr(model, column).in_(self._ids(
+                parent, self.is_purged_with_goal(parent, goal_id)))
+        return sa.and_(related, self.is_purged(table))
+
+
 class Connection(api.BaseConnection):
     """SqlAlchemy connection."""
 
@@ -255,6 +378,19 @@ class Connection(api.BaseConnection):
         obj.save()
         return obj
 
+    def _create_many(self, model, values_list):
+        relationships = self._get_relationships(model)
+        objs = []
+        for values in values_list:
+            obj = model()
+            obj.update({k: v for k, v in values.items()
+                        if k not in relationships})
+            objs.append(obj)
+        session = get_session()
+        with session.begin():
+            session.add_all(objs)
+        return objs
+
     def _get(self, context, model, fieldname, value, eager):
         query = model_query(model)
         if eager:
@@ -753,6 +889,21 @@ class Connection(api.BaseConnection):
             raise exception.ActionAlreadyExists(uuid=values['uuid'])
         return action
 
+    def create_actions(self, values_list):
+        for values in values_list:
+            # ensure defaults are present for new actions
+            if not values.get('uuid'):
+                values['uuid'] = utils.generate_uuid()
+
+            if values.get('state') is None:
+                values['state'] = objects.action.State.PENDING
+
+        try:
+            actions = self._create_many(models.Action, values_list)
+        except db_exc.DBDuplicateEntry as exc:
+            raise exception.ActionAlreadyExists(uuid=exc.value)
+        return actions
+
     def _get_action(self, context, fieldname, value, eager):
         try:
             return self._get(context, model=models.Action,
@@ -924,6 +1075,19 @@ class Connection(api.BaseConnection):
             raise exception.EfficacyIndicatorAlreadyExists(uuid=values['uuid'])
         return efficacy_indicator
 
+    def create_efficacy_indicators(self, values_list):
+        # ensure defaults are present for new efficacy indicators
+        for values in values_list:
+            if not values.get('uuid'):
+                values['uuid'] = utils.generate_uuid()
+
+        try:
+            efficacy_indicators = self._create_many(
+                models.EfficacyIndicator, values_list)
+        except db_exc.DBDuplicateEntry as exc:
+            raise exception.EfficacyIndicatorAlreadyExists(uuid=exc.value)
+        return efficacy_indicators
+
     def _get_efficacy_indicator(self, context, fieldname, value, eager):
         try:
             return self._get(context, model=models.EfficacyIndicator,
@@ -1127,3 +1291,35 @@ class Connection(api.BaseConnection):
             return self._soft_delete(models.Service, service_id)
         except exception.ResourceNotFound:
             raise exception.ServiceNotFound(service=service_id)
+
+    def get_purgeable_ids(self, table, expiry_date=None, uuid=None,
+                          exclude_orphans=False, goal_id=None, limit=None):
+        selection = PurgeSelection(expiry_date, uuid, exclude_orphans)
+        model = PurgeSelection.MODELS[table]
+        if goal_id is None:
+            condition = selection.is_purged(table)
+        else:
+            condition = selection.is_purged_with_goal(table, goal_id)
+        query = model_query(model.id).filter(condition).order_by(model.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return [row.id for row in query]
+
+    def count_purgeable(self, table, expiry_date=None, uuid=None,
+                        exclude_orphans=False):
+        selection = PurgeSelection(expiry_date, uuid, exclude_orphans)
+        model = PurgeSelection.MODELS[table]
+        return model_query(model.id).filter(
+            selection.is_purged(table)).count()
+
+    def destroy_entries(self, table, ids):
+        model = PurgeSelection.MODELS[table]
+        session = get_session()
+        with session.begin():
+            if table == 'action_plans':
+                # The efficacy indicators have no existence of their own
+                model_query(models.EfficacyIndicator, session=session).filter(
+                    models.EfficacyIndicator.action_plan_id.in_(ids)
+                ).delete(synchronize_session=False)
+            return model_query(model, session=session).filter(
+                model.id.in_(ids)).delete(synchronize_session=False)
@@ -24,6 +24,7 @@ from sqlalchemy import Column
 from sqlalchemy import DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import Numeric
 from sqlalchemy import orm
@@ -166,6 +167,9 @@ class Audit(Base):
     __tablename__ = 'audits'
     __table_args__ = (
         UniqueConstraint('uuid', name='uniq_audits0uuid'),
+        Index('audits_state_deleted_at_idx', 'state', 'deleted_at'),
+        Index('audits_audit_type_state_idx', 'audit_type', 'state'),
+        Index('audits_deleted_at_idx', 'deleted_at'),
         table_args()
     )
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -190,6 +194,10 @@ class ActionPlan(Base):
     __tablename__ = 'action_plans'
     __table_args__ = (
         UniqueConstraint('uuid', name='uniq_action_plans0uuid'),
+        Index('action_plans_audit_id_deleted_at_idx',
+              'audit_id', 'deleted_at'),
+        Index('action_plans_state_deleted_at_idx', 'state', 'deleted_at'),
+        Index('action_plans_deleted_at_idx', 'deleted_at'),
         table_args()
     )
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -209,6 +217,10 @@ class Action(Base):
     __tablename__ = 'actions'
     __table_args__ = (
         UniqueConstraint('uuid', name='uniq_actions0uuid'),
+        Index('actions_action_plan_id_deleted_at_idx',
+              'action_plan_id', 'deleted_at'),
+        Index('actions_state_deleted_at_idx', 'state', 'deleted_at'),
+        Index('actions_deleted_at_idx', 'deleted_at'),
         table_args()
     )
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -231,6 +243,8 @@ class EfficacyIndicator(Base):
     __tablename__ = 'efficacy_indicators'
     __table_args__ = (
         UniqueConstraint('uuid', name='uniq_efficacy_indicators0uuid'),
+        Index('efficacy_indicators_action_plan_id_deleted_at_idx',
+              'action_plan_id', 'deleted_at'),
         table_args()
     )
     id = Column(Integer, primary_key=True, autoincrement=True)
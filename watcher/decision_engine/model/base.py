@@ -25,12 +25,30 @@ See: :doc:`../architecture` for more details on this component.
 """
 
 import abc
+import copy
+
 import six
 
 
 @six.add_metaclass(abc.ABCMeta)
 class Model(object):
 
+    def snapshot(self):
+        """Return an isolated copy of this model
+
+        Models that are able to share their content with their snapshots
+        should override this method to avoid copying it all.
+        """
+        return copy.deepcopy(self)
+
+    def to_summary(self):
+        """Return a short description of this model
+
+        Unlike :py:meth:`to_string`, this should not serialize the content of
+        the model so that it stays cheap to compute whatever its size.
+        """
+        return self.__class__.__name__
+
     @abc.abstractmethod
     def to_string(self):
         raise NotImplementedError()
@@ -38,3 +56,24 @@ class Model(object):
     @abc.abstractmethod
     def to_xml(self):
         raise NotImplementedError()
+
+
+class ModelDump(object):
+    """Lazy representation of a model meant to be logged
+
+    The model is only serialized once the log record is actually emitted
+    (e.g. ``LOG.debug(ModelDump(model))`` does not serialize anything if the
+    DEBUG level is disabled).
+
+    :param model: The model to dump
+    :param summary: If True, only the summary of the model gets dumped
+    """
+
+    def __init__(self, model, summary=False):
+        self.model = model
+        self.summary = summary
+
+    def __str__(self):
+        if self.summary:
+            return self.model.to_summary()
+        return self.model.to_string()
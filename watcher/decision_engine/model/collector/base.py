@@ -104,7 +104,6 @@ strategies.
 """
 
 import abc
-import copy
 import threading
 
 from oslo_config import cfg
@@ -113,6 +112,7 @@ import six
 
 from watcher.common import clients
 from watcher.common.loader import loadable
+from watcher.decision_engine.model import base
 from watcher.decision_engine.model import model_root
 
 LOG = log.getLogger(__name__)
@@ -125,7 +125,7 @@ class BaseClusterDataModelCollector(loadable.LoadableSingleton):
 
     def __init__(self, config, osc=None):
         super(BaseClusterDataModelCollector, self).__init__(config)
-        self.osc = osc if osc else clients.OpenStackClients()
+        self.osc = osc if osc else clients.get_shared_clients()
         self._cluster_data_model = None
         self.lock = threading.RLock()
 
@@ -173,8 +173,8 @@ class BaseClusterDataModelCollector(loadable.LoadableSingleton):
 
     def get_latest_cluster_data_model(self):
         LOG.debug("Creating copy")
-        LOG.debug(self.cluster_data_model.to_xml())
-        return copy.deepcopy(self.cluster_data_model)
+        LOG.debug(base.ModelDump(self.cluster_data_model, summary=True))
+        return self.cluster_data_model.snapshot()
 
     def synchronize(self):
         """Synchronize the cluster data model
@@ -13,9 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import six
+from concurrent import futures
 
+from oslo_config import cfg
 from oslo_log import log
+import six
 
 from watcher.common import cinder_helper
 from watcher.common import exception
@@ -54,11 +56,35 @@ class CinderClusterDataModelCollector(base.BaseClusterDataModelCollector):
             cinder.VolumeResizeEnd(self)
         ]
 
+    @classmethod
+    def get_config_opts(cls):
+        return super(
+            CinderClusterDataModelCollector, cls).get_config_opts() + [
+            cfg.IntOpt(
+                'max_workers',
+                default=4,
+                min=1,
+                help='The maximum number of threads used to concurrently '
+                     'fetch the storage nodes, pools, volume types and '
+                     'volumes from Cinder when building the model'),
+            cfg.IntOpt(
+                'volumes_page_size',
+                default=0,
+                min=0,
+                help='The number of volumes to fetch per request when '
+                     'building the model. The volumes of a page are added '
+                     'to the model while the next page is being fetched. '
+                     '0 means that all the volumes are fetched with a '
+                     'single request'),
+        ]
+
     def execute(self):
         """Build the storage cluster data model"""
         LOG.debug("Building latest Cinder cluster data model")
 
-        builder = ModelBuilder(self.osc)
+        builder = ModelBuilder(
+            self.osc, max_workers=self.config.max_workers,
+            volumes_page_size=self.config.volumes_page_size)
         return builder.execute()
 
 
@@ -69,21 +95,24 @@ class ModelBuilder(object):
     - Storage-related knowledge (Cinder)
 
     """
-    def __init__(self, osc):
+    def __init__(self, osc, max_workers=1, volumes_page_size=0):
         self.osc = osc
+        self.max_workers = max_workers
+        self.volumes_page_size = volumes_page_size
+        self.executor = None
         self.model = model_root.StorageModelRoot()
         self.cinder = osc.cinder()
         self.cinder_helper = cinder_helper.CinderHelper(osc=self.osc)
 
-    def _add_physical_layer(self):
+    def _add_physical_layer(self, storage_nodes, pools):
         """Add the physical layer of the graph.
 
         This includes components which represent actual infrastructure
         hardware.
         """
-        for snode in self.cinder_helper.get_storage_node_list():
+        for snode in storage_nodes:
             self.add_storage_node(snode)
-        for pool in self.cinder_helper.get_storage_pool_list():
+        for pool in pools:
             pool = self._build_storage_pool(pool)
             self.model.add_pool(pool)
             storage_name = getattr(pool, 'name')
@@ -118,8 +147,9 @@ class ModelBuilder(object):
         except IndexError:
             pass
 
+        # The volume types were just listed along with the storage nodes
         volume_type = self.cinder_helper.get_volume_type_by_backendname(
-            backend)
+            backend, refresh=False)
 
         # build up the storage node.
         node_attributes = {
@@ -150,15 +180,37 @@ class ModelBuilder(object):
         storage_pool = element.Pool(**node_attributes)
         return storage_pool
 
-    def _add_virtual_layer(self):
+    def _add_virtual_layer(self, first_volumes_page):
         """Add the virtual layer to the graph.
 
         This layer is the virtual components of the infrastructure.
         """
-        self._add_virtual_storage()
+        for volumes in self._get_volumes_pages(first_volumes_page):
+            self._add_virtual_storage(volumes)
+
+    def _fetch_volumes_page(self, marker=None):
+        return self.cinder_helper.get_volume_list(
+            marker=marker, limit=self.volumes_page_size or None)
 
-    def _add_virtual_storage(self):
-        volumes = self.cinder_helper.get_volume_list()
+    def _get_volumes_pages(self, first_volumes_page):
+        """Yield the volumes page by page
+
+        Each page is yielded once the request for the next one is submitted
+        so that Cinder gets queried while the model is being built.
+
+        :param first_volumes_page: Future of the first page of volumes
+        """
+        volumes_page = first_volumes_page
+        while volumes_page is not None:
+            volumes = volumes_page.result()
+            volumes_page = None
+            if self.volumes_page_size and (
+                    len(volumes) >= self.volumes_page_size):
+                volumes_page = self.executor.submit(
+                    self._fetch_volumes_page, marker=volumes[-1].id)
+            yield volumes
+
+    def _add_virtual_storage(self, volumes):
         for vol in volumes:
             volume = self._build_volume_node(vol)
             self.model.add_volume(volume)
@@ -203,7 +255,26 @@ class ModelBuilder(object):
 
         The graph is populated along 2 layers: virtual and physical. As each
         new layer is built connections are made back to previous layers.
+
+        The storage nodes, pools, volume types and the first page of volumes
+        are all fetched concurrently.
         """
-        self._add_physical_layer()
-        self._add_virtual_layer()
+        # The storage nodes, pools and volume types are indexed as they are
+        # listed
+        cinder_helper.reset_cache()
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=self.max_workers)
+        with self.executor:
+            storage_nodes = self.executor.submit(
+                self.cinder_helper.get_storage_node_list)
+            pools = self.executor.submit(
+                self.cinder_helper.get_storage_pool_list)
+            volume_types = self.executor.submit(
+                self.cinder_helper.get_volume_type_list)
+            first_volumes_page = self.executor.submit(
+                self._fetch_volumes_page)
+
+            volume_types.result()
+            self._add_physical_layer(storage_nodes.result(), pools.result())
+            self._add_virtual_layer(first_volumes_page)
         return self.model
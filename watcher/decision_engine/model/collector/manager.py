@@ -17,6 +17,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
+
 from watcher.common import utils
 from watcher.decision_engine.loading import default
 
@@ -59,3 +61,38 @@ class CollectorManager(object):
         :rtype: :py:class:`~.BaseClusterDataModelCollector`
         """
         return self.collector_loader.load(name, osc=osc)
+
+    def get_latest_cluster_data_model(self, name, osc=None):
+        """Retrieve a snapshot of the latest cluster data model
+
+        :param name: name of the cluster data model collector plugin
+        :type name: str
+        :param osc: an OpenStackClients instance
+        :type osc: :py:class:`~.OpenStackClients` instance
+        :returns: a snapshot of the cluster data model of the collector
+        """
+        collector = self.get_cluster_model_collector(name, osc=osc)
+        return collector.get_latest_cluster_data_model()
+
+
+class SharedSnapshotCollectorManager(CollectorManager):
+    """Collector manager handing out snapshots of a single cluster state
+
+    The latest cluster data model of a collector is taken the first time it
+    is needed, then each caller gets its own copy-on-write snapshot of it.
+    Strategies evaluated side by side thus work on the same state of the
+    cluster, without seeing the changes simulated by the others.
+    """
+
+    def __init__(self):
+        super(SharedSnapshotCollectorManager, self).__init__()
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def get_latest_cluster_data_model(self, name, osc=None):
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = super(
+                    SharedSnapshotCollectorManager,
+                    self).get_latest_cluster_data_model(name, osc=osc)
+            return self._models[name].snapshot()
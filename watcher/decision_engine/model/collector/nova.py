@@ -13,12 +13,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent import futures
+import datetime
+
+import novaclient.exceptions as nvexceptions
+from oslo_config import cfg
 from oslo_log import log
+from oslo_utils import timeutils
 
 from watcher.common import exception
 from watcher.common import nova_helper
 from watcher.decision_engine.model.collector import base
 from watcher.decision_engine.model import element
+from watcher.decision_engine.model.element import compact
 from watcher.decision_engine.model import model_root
 from watcher.decision_engine.model.notification import nova
 
@@ -34,6 +41,8 @@ class NovaClusterDataModelCollector(base.BaseClusterDataModelCollector):
 
     def __init__(self, config, osc=None):
         super(NovaClusterDataModelCollector, self).__init__(config, osc)
+        self.last_sync_time = None
+        self.last_full_sync_time = None
 
     @property
     def notification_endpoints(self):
@@ -55,13 +64,90 @@ class NovaClusterDataModelCollector(base.BaseClusterDataModelCollector):
             nova.LegacyLiveMigratedEnd(self),
         ]
 
+    @classmethod
+    def get_config_opts(cls):
+        return super(NovaClusterDataModelCollector, cls).get_config_opts() + [
+            cfg.IntOpt(
+                'max_workers',
+                default=4,
+                min=1,
+                help='The maximum number of threads used to concurrently '
+                     'fetch the hypervisors, services, flavors and servers '
+                     'from Nova when building the model'),
+            cfg.IntOpt(
+                'servers_page_size',
+                default=0,
+                min=0,
+                help='The number of servers to fetch per request when '
+                     'building the model. The servers of a page are added '
+                     'to the model while the next page is being fetched. '
+                     'Nova returns at most osapi_max_limit servers per '
+                     'request whatever this value, and the pages are '
+                     'fetched until an empty one is returned. 0 means that '
+                     'all the servers are fetched before being added to the '
+                     'model'),
+            cfg.BoolOpt(
+                'incremental_sync',
+                default=False,
+                help='If enabled, each synchronization only applies the '
+                     'servers that changed since the previous one to the '
+                     'existing model instead of rebuilding it'),
+            cfg.IntOpt(
+                'full_sync_period',
+                default=86400,
+                min=0,
+                help='When the incremental synchronization is enabled, the '
+                     'time interval (in seconds) after which the model is '
+                     'nonetheless fully rebuilt, e.g. to take removed '
+                     'compute nodes into account. 0 means never'),
+            cfg.BoolOpt(
+                'compact_model',
+                default=False,
+                help='If enabled, the compute nodes and instances of the '
+                     'model are stored as compact slotted records instead '
+                     'of versioned objects, which reduces the memory '
+                     'footprint of large models and speeds up their copy'),
+        ]
+
     def execute(self):
         """Build the compute cluster data model"""
         LOG.debug("Building latest Nova cluster data model")
 
-        builder = ModelBuilder(self.osc)
+        builder = ModelBuilder(
+            self.osc, max_workers=self.config.max_workers,
+            servers_page_size=self.config.servers_page_size,
+            compact_model=self.config.compact_model)
         return builder.execute()
 
+    def _is_incremental_sync_possible(self, sync_time):
+        if not (self.config.incremental_sync and self.last_sync_time and
+                self._cluster_data_model):
+            return False
+        if not self.config.full_sync_period:
+            return True
+        return sync_time - self.last_full_sync_time < datetime.timedelta(
+            seconds=self.config.full_sync_period)
+
+    def synchronize(self):
+        """Synchronize the cluster data model
+
+        If the incremental synchronization is enabled, only the servers that
+        changed since the previous synchronization are applied to the
+        existing model. Otherwise, or if the model is stale, the model gets
+        fully rebuilt.
+        """
+        # The changes that happen while we are querying Nova will be caught
+        # up during the next synchronization
+        sync_time = timeutils.utcnow()
+        if self._is_incremental_sync_possible(sync_time):
+            LOG.debug("Updating Nova cluster data model with the changes "
+                      "since %s", self.last_sync_time)
+            ModelUpdater(self).execute(self.last_sync_time)
+        else:
+            super(NovaClusterDataModelCollector, self).synchronize()
+            self.last_full_sync_time = sync_time
+        self.last_sync_time = sync_time
+
 
 class ModelBuilder(object):
     """Build the graph-based model
@@ -81,21 +167,65 @@ class ModelBuilder(object):
     re-scheduled for Pike. In the meantime, all the associated code has been
     commented out.
     """
-    def __init__(self, osc):
+    def __init__(self, osc, max_workers=1, servers_page_size=0,
+                 compact_model=False):
         self.osc = osc
-        self.model = model_root.ModelRoot()
+        self.max_workers = max_workers
+        self.servers_page_size = servers_page_size
+        # Classes of the compute nodes and instances added to the model
+        if compact_model:
+            self.node_cls = compact.ComputeNode
+            self.instance_cls = compact.Instance
+        else:
+            self.node_cls = element.ComputeNode
+            self.instance_cls = element.Instance
+        self.executor = None
+        self.model = model_root.ModelRoot(
+            node_cls=self.node_cls, instance_cls=self.instance_cls)
         self.nova = osc.nova()
         self.nova_helper = nova_helper.NovaHelper(osc=self.osc)
+        # Services and flavors are fetched in bulk once per build, and are
+        # then looked up by ID
+        self.services = {}
+        self.flavors = {}
         # self.neutron = osc.neutron()
         # self.cinder = osc.cinder()
 
-    def _add_physical_layer(self):
+    def get_service(self, service_id):
+        """Get a compute service from the ones fetched in bulk
+
+        Services that were registered after the bulk fetch are retrieved
+        individually and then kept for the rest of the build.
+        """
+        if service_id not in self.services:
+            self.services[service_id] = self.nova_helper.get_service(
+                service_id)
+        return self.services[service_id]
+
+    def get_flavor(self, flavor_id):
+        """Get a flavor from the ones fetched in bulk
+
+        Flavors that were created after the bulk fetch are retrieved
+        individually and then kept for the rest of the build. Flavors which
+        no longer exist are cached as ``None``.
+        """
+        if flavor_id not in self.flavors:
+            try:
+                self.flavors[flavor_id] = self.nova_helper.get_flavor(
+                    flavor_id)
+            except nvexceptions.NotFound:
+                LOG.warning("Flavor %s could not be found", flavor_id)
+                self.flavors[flavor_id] = None
+        return self.flavors[flavor_id]
+
+    def _add_physical_layer(self, compute_nodes, services):
         """Add the physical layer of the graph.
 
         This includes components which represent actual infrastructure
         hardware.
         """
-        for cnode in self.nova_helper.get_compute_node_list():
+        self.services = {service.id: service for service in services}
+        for cnode in compute_nodes:
             self.add_compute_node(cnode)
 
     def add_compute_node(self, node):
@@ -129,7 +259,7 @@ class ModelBuilder(object):
         :type node: :py:class:`~novaclient.v2.hypervisors.Hypervisor`
         """
         # build up the compute node.
-        compute_service = self.nova_helper.get_service(node.service["id"])
+        compute_service = self.get_service(node.service["id"])
         node_attributes = {
             "id": node.id,
             "uuid": compute_service.host,
@@ -153,17 +283,17 @@ class ModelBuilder(object):
         # for further optimize.
         elif compute_service.disabled_reason == 'watcher_poweroff':
             service_status = element.ServiceState.POWEROFF.value
-        elif compute_service.disabled_reason == 'watcher_poweron' and
-            node.state == 'down':
+        elif (compute_service.disabled_reason == 'watcher_poweron' and
+              node.state == 'down'):
             service_status = element.ServiceState.POWERON.value
-        elif compute_service.disabled_reason == 'watcher_poweron' and
-            node.state == 'up':
+        elif (compute_service.disabled_reason == 'watcher_poweron' and
+              node.state == 'up'):
             service_status = element.ServiceState.DISABLED.value
         else:
             service_status = element.ServiceState.UNKNOWN.value
 
         node_attributes["status"] = service_status
-        compute_node = element.ComputeNode(**node_attributes)
+        compute_node = self.node_cls(**node_attributes)
         # compute_node = self._build_node("physical", "compute", "hypervisor",
         #                                 node_attributes)
         return compute_node
@@ -209,18 +339,43 @@ class ModelBuilder(object):
     #     return {"layer": layer, "category": category, "type": node_type,
     #             "attributes": attributes}
 
-    def _add_virtual_layer(self):
+    def _add_virtual_layer(self, flavors, first_servers_page):
         """Add the virtual layer to the graph.
 
         This layer is the virtual components of the infrastructure,
         such as vms.
         """
-        self._add_virtual_servers()
+        self.flavors = {flavor.id: flavor for flavor in flavors}
+        for servers in self._get_servers_pages(first_servers_page):
+            self._add_virtual_servers(servers)
         # self._add_virtual_network()
         # self._add_virtual_storage()
 
-    def _add_virtual_servers(self):
-        all_instances = self.nova_helper.get_instance_list()
+    def _fetch_servers_page(self, marker=None):
+        # Without a page size, novaclient follows the pages by itself
+        return self.nova_helper.get_instance_list(
+            marker=marker, limit=self.servers_page_size or -1)
+
+    def _get_servers_pages(self, first_servers_page):
+        """Yield the servers page by page
+
+        Each page is yielded once the request for the next one is submitted
+        so that Nova gets queried while the model is being built. Nova may
+        return fewer servers than requested, e.g. when the page size exceeds
+        its osapi_max_limit, so only an empty page ends the listing.
+
+        :param first_servers_page: Future of the first page of servers
+        """
+        servers_page = first_servers_page
+        while servers_page is not None:
+            servers = servers_page.result()
+            servers_page = None
+            if self.servers_page_size and servers:
+                servers_page = self.executor.submit(
+                    self._fetch_servers_page, marker=servers[-1].id)
+            yield servers
+
+    def _add_virtual_servers(self, all_instances):
         for inst in all_instances:
             # Add Node
             instance = self._build_instance_node(inst)
@@ -249,14 +404,14 @@ class ModelBuilder(object):
         :param instance: Nova VM object.
         :return: A instance node for the graph.
         """
-        flavor = self.nova_helper.get_flavor(instance.flavor["id"])
+        flavor = self.get_flavor(instance.flavor["id"])
         instance_attributes = {
             "uuid": instance.id,
             "human_id": instance.human_id,
-            "memory": flavor.ram,
-            "disk": flavor.disk,
-            "disk_capacity": flavor.disk,
-            "vcpus": flavor.vcpus,
+            "memory": getattr(flavor, "ram", 0),
+            "disk": getattr(flavor, "disk", 0),
+            "disk_capacity": getattr(flavor, "disk", 0),
+            "vcpus": getattr(flavor, "vcpus", 0),
             "state": getattr(instance, "OS-EXT-STS:vm_state"),
             "metadata": instance.metadata}
 
@@ -265,7 +420,7 @@ class ModelBuilder(object):
         # node_attributes["category"] = "compute"
         # node_attributes["type"] = "compute"
         # node_attributes["attributes"] = instance_attributes
-        return element.Instance(**instance_attributes)
+        return self.instance_cls(**instance_attributes)
 
     # def _add_virtual_storage(self):
     #     try:
@@ -386,7 +541,89 @@ class ModelBuilder(object):
 
         The graph is populated along 2 layers: virtual and physical. As each
         new layer is built connections are made back to previous layers.
+
+        The hypervisors, services, flavors and the first page of servers
+        are all fetched concurrently.
         """
-        self._add_physical_layer()
-        self._add_virtual_layer()
+        self.executor = futures.ThreadPoolExecutor(
+            max_workers=self.max_workers)
+        with self.executor:
+            compute_nodes = self.executor.submit(
+                self.nova_helper.get_compute_node_list)
+            services = self.executor.submit(
+                self.nova_helper.get_service_list)
+            flavors = self.executor.submit(self.nova_helper.get_flavor_list)
+            first_servers_page = self.executor.submit(
+                self._fetch_servers_page)
+
+            self._add_physical_layer(
+                compute_nodes.result(), services.result())
+            self._add_virtual_layer(flavors.result(), first_servers_page)
         return self.model
+
+
+class ModelUpdater(nova.NovaNotification):
+    """Apply the servers that changed in Nova to an existing model
+
+    The changes go through the same code paths as the ones coming from the
+    Nova notifications.
+    """
+
+    # This is not an actual notification endpoint
+    filter_rule = None
+
+    def __init__(self, collector):
+        super(ModelUpdater, self).__init__(collector)
+        self._nova = nova_helper.NovaHelper(osc=collector.osc)
+        self.builder = ModelBuilder(
+            collector.osc, compact_model=collector.config.compact_model)
+
+    def update_server(self, server):
+        node_uuid = getattr(server, "OS-EXT-SRV-ATTR:host")
+        if (getattr(server, "OS-EXT-STS:vm_state") ==
+                element.InstanceState.DELETED.value):
+            try:
+                instance = self.cluster_data_model.get_instance_by_uuid(
+                    server.id)
+            except exception.InstanceNotFound:
+                return
+            self.delete_instance(instance, None)
+            return
+
+        instance = self.get_or_create_instance(server.id, node_uuid)
+        instance.update(self.builder._build_instance_node(server).as_dict())
+
+        try:
+            node = self.get_or_create_node(node_uuid)
+        except exception.ComputeNodeNotFound as exc:
+            LOG.exception(exc)
+            # If we can't create the node, we consider the instance as unmapped
+            node = None
+
+        self.update_instance_mapping(instance, node)
+
+    def _get_changed_servers_pages(self, changes_since):
+        """Yield the servers that changed since the given UTC datetime
+
+        They are paged as when the model is built, see
+        :py:meth:`ModelBuilder._get_servers_pages`.
+        """
+        page_size = self.collector.config.servers_page_size
+        marker = None
+        while True:
+            servers = self.nova.get_instance_list(
+                marker=marker, limit=page_size or -1,
+                changes_since=changes_since)
+            yield servers
+            if not (page_size and servers):
+                return
+            marker = servers[-1].id
+
+    def execute(self, changes_since):
+        """Apply the servers that changed since the given UTC datetime"""
+        count = 0
+        for servers in self._get_changed_servers_pages(changes_since):
+            for server in servers:
+                self.update_server(server)
+            count += len(servers)
+        LOG.debug("%d servers updated in the Nova cluster data model", count)
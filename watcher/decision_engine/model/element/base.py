@@ -21,6 +21,7 @@ import collections
 
 from lxml import etree
 from oslo_log import log
+from oslo_serialization import jsonutils
 import six
 
 from watcher.objects import base
@@ -29,6 +30,13 @@ from watcher.objects import fields as wfields
 LOG = log.getLogger(__name__)
 
 
+def as_xml_attribute(field, value):
+    """Serialize the value of a field so that it can be read back"""
+    if isinstance(field, wfields.JsonField):
+        return jsonutils.dumps(value)
+    return str(value)
+
+
 @six.add_metaclass(abc.ABCMeta)
 class Element(base.WatcherObject, base.WatcherObjectDictCompat,
               base.WatcherComparableObject):
@@ -47,6 +55,15 @@ class Element(base.WatcherObject, base.WatcherObjectDictCompat,
                 kwargs[name] = field.default
         super(Element, self).__init__(context, **kwargs)
 
+    def __copy__(self):
+        # Only the field values are duplicated, which is enough for two
+        # cluster data models to diverge on this element without paying the
+        # cost of a deepcopy (see ``ModelRoot.snapshot()``)
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone._changed_fields = set(self._changed_fields)
+        return clone
+
     @abc.abstractmethod
     def accept(self, visitor):
         raise NotImplementedError()
@@ -55,7 +72,7 @@ class Element(base.WatcherObject, base.WatcherObjectDictCompat,
         sorted_fieldmap = []
         for field in self.fields:
             try:
-                value = str(self[field])
+                value = as_xml_attribute(self.fields[field], self[field])
                 sorted_fieldmap.append((field, value))
             except Exception as exc:
                 LOG.exception(exc)
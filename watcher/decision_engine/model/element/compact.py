@@ -0,0 +1,178 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compact representation of the compute elements
+
+The compute nodes and instances of a cluster data model are versioned objects
+which, between their change tracking and their per-object ``__dict__``, weigh
+a lot in memory and are slow to copy once the model holds tens of thousands
+of instances. The classes below are slotted records with the same fields and
+the same element interface. They are registered as virtual subclasses of their
+versioned counterparts so they can be used as such by the
+:py:class:`~.ModelRoot` and the strategies.
+"""
+
+import collections
+
+from lxml import etree
+import six
+
+from watcher.decision_engine.model.element import base
+from watcher.decision_engine.model.element import instance
+from watcher.decision_engine.model.element import node
+from watcher.objects import fields as wfields
+
+# String fields whose values are shared by many elements
+INTERNED_FIELDS = frozenset(['uuid', 'hostname', 'state', 'status'])
+
+_NotSpecified = object()
+
+
+class CompactElement(object):
+
+    __slots__ = ()
+
+    # Versioned element class this class is the compact counterpart of
+    element_cls = None
+    fields = {}
+
+    def __init__(self, context=None, **kwargs):
+        for name, field in self.fields.items():
+            if name in kwargs:
+                setattr(self, name, kwargs.pop(name))
+            elif (not field.nullable and
+                    field.default != wfields.UnspecifiedDefault):
+                setattr(self, name, field.default)
+        for name, value in kwargs.items():
+            setattr(self, name, value)
+
+    def __setattr__(self, name, value):
+        field = self.fields.get(name)
+        if field is not None:
+            value = field.coerce(self, name, value)
+            if name in INTERNED_FIELDS and isinstance(value, str):
+                value = six.moves.intern(value)
+        super(CompactElement, self).__setattr__(name, value)
+
+    def __copy__(self):
+        # The values were already coerced so they are copied as they are
+        clone = self.__class__.__new__(self.__class__)
+        for name in self.__slots__:
+            value = getattr(self, name, _NotSpecified)
+            if value is not _NotSpecified:
+                object.__setattr__(clone, name, value)
+        return clone
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__
+                if hasattr(self, name)}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactElement):
+            return NotImplemented
+        return (self.element_cls is other.element_cls and
+                self.as_dict() == other.as_dict())
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    __hash__ = object.__hash__
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, ", ".join(
+            "%s=%r" % item for item in sorted(self.as_dict().items())))
+
+    def obj_attr_is_set(self, name):
+        return hasattr(self, name)
+
+    def obj_name(self):
+        return self.element_cls.obj_name()
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.fields
+                if hasattr(self, name)}
+
+    # Dictionary compatibility, as provided by the versioned objects
+
+    def __iter__(self):
+        for name in self.fields:
+            if hasattr(self, name):
+                yield name
+
+    def __contains__(self, name):
+        return name in self.fields and hasattr(self, name)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def __setitem__(self, name, value):
+        setattr(self, name, value)
+
+    def get(self, key, value=_NotSpecified):
+        if key not in self.fields:
+            raise AttributeError("'%s' object has no attribute '%s'" % (
+                self.__class__.__name__, key))
+        if value is not _NotSpecified and not hasattr(self, key):
+            return value
+        return getattr(self, key)
+
+    def keys(self):
+        return list(self)
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self]
+
+    def update(self, updates):
+        for name, value in dict(updates).items():
+            setattr(self, name, value)
+
+    def accept(self, visitor):
+        raise NotImplementedError()
+
+    def as_xml_element(self):
+        attrib = collections.OrderedDict(
+            (name, base.as_xml_attribute(field, getattr(self, name)))
+            for name, field in self.fields.items() if hasattr(self, name))
+        return etree.Element(self.element_cls.__name__, attrib=attrib)
+
+
+def _compact(element_cls):
+    """Declare a compact counterpart of the given versioned element class"""
+    def decorator(cls):
+        cls.element_cls = element_cls
+        cls.fields = element_cls.fields
+        element_cls.register(cls)
+        return cls
+    return decorator
+
+
+@_compact(node.ComputeNode)
+class ComputeNode(CompactElement):
+
+    __slots__ = tuple(sorted(node.ComputeNode.fields))
+
+
+@_compact(instance.Instance)
+class Instance(CompactElement):
+
+    # The notification handlers also set the hostname of the instances, which
+    # is not a field of the versioned instances
+    __slots__ = tuple(sorted(instance.Instance.fields)) + ('hostname',)
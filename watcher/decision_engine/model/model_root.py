@@ -16,9 +16,13 @@
 Openstack implementation of the cluster graph.
 """
 
+import copy
+import io
+import threading
+
+import fasteners
 from lxml import etree
 import networkx as nx
-from oslo_concurrency import lockutils
 from oslo_log import log
 import six
 
@@ -30,12 +34,111 @@ from watcher.decision_engine.model import element
 LOG = log.getLogger(__name__)
 
 
-class ModelRoot(nx.DiGraph, base.Model):
-    """Cluster graph for an Openstack cluster."""
-
-    def __init__(self, stale=False):
+def _write_xml(stream, xml_elements):
+    """Write the given top-level XML elements one by one into the stream"""
+    stream.write(b"<ModelRoot>\n")
+    for xml_element in xml_elements:
+        for line in etree.tostring(
+                xml_element, pretty_print=True).splitlines(True):
+            stream.write(b"  " + line)
+    stream.write(b"</ModelRoot>\n")
+
+
+class CopyOnWriteDiGraph(nx.DiGraph):
+    """Directed graph whose snapshots share their content until modified
+
+    Taking a snapshot only copies the top-level node and adjacency mappings.
+    The elements and their adjacency mappings remain shared between the
+    original graph and its snapshots until one of them either modifies them
+    or retrieves them individually (e.g. via ``get_instance_by_uuid()``), in
+    which case they are copied beforehand. This way, the cost of working on a
+    snapshot scales with what is actually modified rather than with the size
+    of the graph.
+
+    Note that the elements returned by the bulk accessors (e.g.
+    ``get_all_instances()``) may still be shared with other snapshots so they
+    must be considered as read-only.
+
+    Each graph is protected by its own reader/writer lock (``_lock``) so that
+    concurrent readers of a graph, or of different graphs, do not block each
+    other.
+    """
+
+    def __init__(self):
+        super(CopyOnWriteDiGraph, self).__init__()
+        self._lock = fasteners.ReaderWriterLock()
+        # Guards the copies made by the readers of this graph
+        self._own_lock = threading.Lock()
+        # Keys of the nodes this graph has its own copy of
+        self._owned = set()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        del state['_own_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = fasteners.ReaderWriterLock()
+        self._own_lock = threading.Lock()
+
+    def _own(self, *keys):
+        """Make sure this graph has its own copy of the given nodes"""
+        for key in keys:
+            if key in self._owned or key not in self.node:
+                continue
+            with self._own_lock:
+                if key in self._owned:
+                    continue
+                self.node[key] = copy.copy(self.node[key])
+                self.succ[key] = dict(self.succ[key])
+                self.pred[key] = dict(self.pred[key])
+                self._owned.add(key)
+
+    def _own_neighborhood(self, key):
+        if key in self.node:
+            self._own(key, *(list(self.succ[key]) + list(self.pred[key])))
+
+    def _snapshot(self):
+        snapshot = self.__class__(stale=self.stale)
+        snapshot.graph = dict(self.graph)
+        snapshot.node = dict(self.node)
+        snapshot.succ = snapshot.adj = snapshot.edge = dict(self.succ)
+        snapshot.pred = dict(self.pred)
+
+        # From now on, everything is shared with the snapshot
+        self._owned = set()
+        return snapshot
+
+
+class ModelRoot(CopyOnWriteDiGraph, base.Model):
+    """Cluster graph for an Openstack cluster.
+
+    The resources (vcpus, memory and disk) consumed by the instances mapped
+    to each compute node are aggregated into a usage index which is kept up
+    to date by the methods altering the mapping. This way, the used and free
+    capacities of a node can be queried in constant time via
+    ``get_node_used_resources()`` and ``get_node_free_resources()``. Note
+    that an instance updated in place has to be mapped again (or re-added)
+    for its new size to be accounted for.
+    """
+
+    # Instance fields accounted for in the resource usage index
+    USAGE_FIELDS = ('vcpus', 'memory', 'disk')
+
+    def __init__(self, stale=False, node_cls=None, instance_cls=None):
         super(ModelRoot, self).__init__()
         self.stale = stale
+        # Classes of the compute nodes and instances added to the model, so
+        # that the elements created after the build are of the same kind
+        self.node_cls = node_cls or element.ComputeNode
+        self.instance_cls = instance_cls or element.Instance
+        # {node_uuid: (vcpus, memory, disk)} used on each compute node
+        self._node_usages = {}
+        # {instance_uuid: (node_uuid, (vcpus, memory, disk))} charged for
+        # each mapped instance
+        self._instance_usages = {}
 
     def __nonzero__(self):
         return not self.stale
@@ -54,35 +157,89 @@ class ModelRoot(nx.DiGraph, base.Model):
             raise exception.IllegalArgumentException(
                 message=_("'obj' argument type is not valid"))
 
-    @lockutils.synchronized("model_root")
+    @fasteners.write_locked
+    def snapshot(self):
+        return self._snapshot()
+
+    def _snapshot(self):
+        snapshot = super(ModelRoot, self)._snapshot()
+        snapshot.node_cls = self.node_cls
+        snapshot.instance_cls = self.instance_cls
+        # The usages are immutable tuples so the index can be shallow copied
+        snapshot._node_usages = dict(self._node_usages)
+        snapshot._instance_usages = dict(self._instance_usages)
+        return snapshot
+
+    @classmethod
+    def _get_instance_usage(cls, instance):
+        return tuple(getattr(instance, field)
+                     if instance.obj_attr_is_set(field) else 0
+                     for field in cls.USAGE_FIELDS)
+
+    def _charge_instance(self, instance, node_uuid):
+        """Charge the resources of the instance to the given node"""
+        self._discharge_instance(instance.uuid)
+        usage = self._get_instance_usage(instance)
+        node_usage = self._node_usages.get(node_uuid, (0,) * len(usage))
+        self._node_usages[node_uuid] = tuple(
+            used + value for used, value in zip(node_usage, usage))
+        self._instance_usages[instance.uuid] = (node_uuid, usage)
+
+    def _discharge_instance(self, instance_uuid):
+        """Release the resources charged for the instance, if any"""
+        node_uuid, usage = self._instance_usages.pop(
+            instance_uuid, (None, None))
+        if node_uuid is None:
+            return
+        self._node_usages[node_uuid] = tuple(
+            used - value
+            for used, value in zip(self._node_usages[node_uuid], usage))
+
+    @fasteners.write_locked
     def add_node(self, node):
         self.assert_node(node)
+        self._own(node.uuid)
         super(ModelRoot, self).add_node(node.uuid, node)
+        self._owned.add(node.uuid)
 
-    @lockutils.synchronized("model_root")
+    @fasteners.write_locked
     def remove_node(self, node):
         self.assert_node(node)
+        self._own_neighborhood(node.uuid)
         try:
+            instance_uuids = list(self.predecessors(node.uuid))
             super(ModelRoot, self).remove_node(node.uuid)
         except nx.NetworkXError as exc:
             LOG.exception(exc)
             raise exception.ComputeNodeNotFound(name=node.uuid)
+        for instance_uuid in instance_uuids:
+            self._discharge_instance(instance_uuid)
+        self._node_usages.pop(node.uuid, None)
 
-    @lockutils.synchronized("model_root")
+    @fasteners.write_locked
     def add_instance(self, instance):
         self.assert_instance(instance)
+        self._own(instance.uuid)
         try:
             super(ModelRoot, self).add_node(instance.uuid, instance)
         except nx.NetworkXError as exc:
             LOG.exception(exc)
             raise exception.InstanceNotFound(name=instance.uuid)
+        self._owned.add(instance.uuid)
+
+        # Re-adding a mapped instance may have changed its size
+        if instance.uuid in self._instance_usages:
+            node_uuid, _usage = self._instance_usages[instance.uuid]
+            self._charge_instance(self.node[instance.uuid], node_uuid)
 
-    @lockutils.synchronized("model_root")
+    @fasteners.write_locked
     def remove_instance(self, instance):
         self.assert_instance(instance)
+        self._own_neighborhood(instance.uuid)
         super(ModelRoot, self).remove_node(instance.uuid)
+        self._discharge_instance(instance.uuid)
 
-    @lockutils.synchronized("model_root")
+    @fasteners.write_locked
     def map_instance(self, instance, node):
         """Map a newly created instance to a node
 
@@ -98,22 +255,26 @@ class ModelRoot(nx.DiGraph, base.Model):
         self.assert_node(node)
         self.assert_instance(instance)
 
+        self._own(instance.uuid, node.uuid)
         self.add_edge(instance.uuid, node.uuid)
+        self._charge_instance(instance, node.uuid)
 
-    @lockutils.synchronized("model_root")
+    @fasteners.write_locked
     def unmap_instance(self, instance, node):
         if isinstance(instance, six.string_types):
             instance = self.get_instance_by_uuid(instance)
         if isinstance(node, six.string_types):
             node = self.get_node_by_uuid(node)
 
+        self._own(instance.uuid, node.uuid)
         self.remove_edge(instance.uuid, node.uuid)
+        self._discharge_instance(instance.uuid)
 
     def delete_instance(self, instance, node=None):
         self.assert_instance(instance)
         self.remove_instance(instance)
 
-    @lockutils.synchronized("model_root")
+    @fasteners.write_locked
     def migrate_instance(self, instance, source_node, destination_node):
         """Migrate single instance from source_node to destination_node
 
@@ -129,25 +290,27 @@ class ModelRoot(nx.DiGraph, base.Model):
         if source_node == destination_node:
             return False
 
+        self._own(instance.uuid, source_node.uuid, destination_node.uuid)
         # unmap
         self.remove_edge(instance.uuid, source_node.uuid)
         # map
         self.add_edge(instance.uuid, destination_node.uuid)
+        self._charge_instance(instance, destination_node.uuid)
         return True
 
-    @lockutils.synchronized("model_root")
+    @fasteners.read_locked
     def get_all_compute_nodes(self):
         return {uuid: cn for uuid, cn in self.nodes(data=True)
                 if isinstance(cn, element.ComputeNode)}
 
-    @lockutils.synchronized("model_root")
+    @fasteners.read_locked
     def get_node_by_uuid(self, uuid):
         try:
             return self._get_by_uuid(uuid)
         except exception.ComputeResourceNotFound:
             raise exception.ComputeNodeNotFound(name=uuid)
 
-    @lockutils.synchronized("model_root")
+    @fasteners.read_locked
     def get_instance_by_uuid(self, uuid):
         try:
             return self._get_by_uuid(uuid)
@@ -156,12 +319,13 @@ class ModelRoot(nx.DiGraph, base.Model):
 
     def _get_by_uuid(self, uuid):
         try:
+            self._own(uuid)
             return self.node[uuid]
         except Exception as exc:
             LOG.exception(exc)
             raise exception.ComputeResourceNotFound(name=uuid)
 
-    @lockutils.synchronized("model_root")
+    @fasteners.read_locked
     def get_node_by_instance_uuid(self, instance_uuid):
         instance = self._get_by_uuid(instance_uuid)
         for node_uuid in self.neighbors(instance.uuid):
@@ -170,27 +334,73 @@ class ModelRoot(nx.DiGraph, base.Model):
                 return node
         raise exception.ComputeNodeNotFound(name=instance_uuid)
 
-    @lockutils.synchronized("model_root")
+    @fasteners.read_locked
     def get_all_instances(self):
         return {uuid: inst for uuid, inst in self.nodes(data=True)
                 if isinstance(inst, element.Instance)}
 
-    @lockutils.synchronized("model_root")
+    @fasteners.read_locked
     def get_node_instances(self, node):
         self.assert_node(node)
         node_instances = []
         for instance_uuid in self.predecessors(node.uuid):
-            instance = self._get_by_uuid(instance_uuid)
+            instance = self.node[instance_uuid]
             if isinstance(instance, element.Instance):
                 node_instances.append(instance)
 
         return node_instances
 
+    @fasteners.read_locked
+    def get_node_used_resources(self, node):
+        """Get the resources used by the instances mapped to a node
+
+        :param node: :py:class:`~.ComputeNode` object
+        :return: dict(vcpus, memory(MB), disk(GB))
+        """
+        self.assert_node(node)
+        return dict(zip(self.USAGE_FIELDS, self._node_usages.get(
+            node.uuid, (0,) * len(self.USAGE_FIELDS))))
+
+    @fasteners.read_locked
+    def get_node_free_resources(self, node):
+        """Get the resources of a node not used by its mapped instances
+
+        :param node: :py:class:`~.ComputeNode` object
+        :return: dict(vcpus, memory(MB), disk(GB))
+        """
+        used = self.get_node_used_resources(node)
+        return dict(vcpus=node.vcpus - used['vcpus'],
+                    memory=node.memory - used['memory'],
+                    disk=node.disk_capacity - used['disk'])
+
     def to_string(self):
         return self.to_xml()
 
+    @fasteners.read_locked
+    def to_summary(self):
+        instances = self.get_all_instances()
+        unmapped_instances = [
+            uuid for uuid in instances if not self.succ.get(uuid)]
+        return ("ModelRoot: %d compute nodes, %d instances "
+                "(%d unmapped)" % (len(self.get_all_compute_nodes()),
+                                   len(instances), len(unmapped_instances)))
+
     def to_xml(self):
-        root = etree.Element("ModelRoot")
+        stream = io.BytesIO()
+        self.write_xml(stream)
+        return stream.getvalue().decode('utf-8')
+
+    def write_xml(self, stream):
+        """Incrementally write the XML representation of this model
+
+        The XML tree of each compute node is built and written on its own so
+        the XML tree of the whole model never has to be held in memory.
+
+        :param stream: Writable binary file-like object
+        """
+        _write_xml(stream, self.snapshot()._xml_elements())
+
+    def _xml_elements(self):
         # Build compute node tree
         for cn in sorted(self.get_all_compute_nodes().values(),
                          key=lambda cn: cn.uuid):
@@ -202,17 +412,13 @@ class ModelRoot(nx.DiGraph, base.Model):
                 instance_el = instance.as_xml_element()
                 compute_node_el.append(instance_el)
 
-            root.append(compute_node_el)
+            yield compute_node_el
 
         # Build unmapped instance tree (i.e. not assigned to any compute node)
         for instance in sorted(self.get_all_instances().values(),
                                key=lambda inst: inst.uuid):
-            try:
-                self.get_node_by_instance_uuid(instance.uuid)
-            except (exception.InstanceNotFound, exception.ComputeNodeNotFound):
-                root.append(instance.as_xml_element())
-
-        return etree.tostring(root, pretty_print=True).decode('utf-8')
+            if not self.succ[instance.uuid]:
+                yield instance.as_xml_element()
 
     @classmethod
     def from_xml(cls, data):
@@ -244,7 +450,7 @@ class ModelRoot(nx.DiGraph, base.Model):
             G1, G2, node_match=node_match)
 
 
-class StorageModelRoot(nx.DiGraph, base.Model):
+class StorageModelRoot(CopyOnWriteDiGraph, base.Model):
     """Cluster graph for an Openstack cluster."""
 
     def __init__(self, stale=False):
@@ -274,35 +480,45 @@ class StorageModelRoot(nx.DiGraph, base.Model):
             raise exception.IllegalArgumentException(
                 message=_("'obj' argument type is not valid: %s") % type(obj))
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.write_locked
+    def snapshot(self):
+        return self._snapshot()
+
+    @fasteners.write_locked
     def add_node(self, node):
         self.assert_node(node)
+        self._own(node.host)
         super(StorageModelRoot, self).add_node(node.host, node)
+        self._owned.add(node.host)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.write_locked
     def add_pool(self, pool):
         self.assert_pool(pool)
+        self._own(pool.name)
         super(StorageModelRoot, self).add_node(pool.name, pool)
+        self._owned.add(pool.name)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.write_locked
     def remove_node(self, node):
         self.assert_node(node)
+        self._own_neighborhood(node.host)
         try:
             super(StorageModelRoot, self).remove_node(node.host)
         except nx.NetworkXError as exc:
             LOG.exception(exc)
             raise exception.StorageNodeNotFound(name=node.host)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.write_locked
     def remove_pool(self, pool):
         self.assert_pool(pool)
+        self._own_neighborhood(pool.name)
         try:
             super(StorageModelRoot, self).remove_node(pool.name)
         except nx.NetworkXError as exc:
             LOG.exception(exc)
             raise exception.PoolNotFound(name=pool.name)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.write_locked
     def map_pool(self, pool, node):
         """Map a newly created pool to a node
 
@@ -316,9 +532,10 @@ class StorageModelRoot(nx.DiGraph, base.Model):
         self.assert_node(node)
         self.assert_pool(pool)
 
+        self._own(pool.name, node.host)
         self.add_edge(pool.name, node.host)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.write_locked
     def unmap_pool(self, pool, node):
         """Unmap a pool from a node
 
@@ -330,23 +547,27 @@ class StorageModelRoot(nx.DiGraph, base.Model):
         if isinstance(node, six.string_types):
             node = self.get_node_by_name(node)
 
+        self._own(pool.name, node.host)
         self.remove_edge(pool.name, node.host)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.write_locked
     def add_volume(self, volume):
         self.assert_volume(volume)
+        self._own(volume.uuid)
         super(StorageModelRoot, self).add_node(volume.uuid, volume)
+        self._owned.add(volume.uuid)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.write_locked
     def remove_volume(self, volume):
         self.assert_volume(volume)
+        self._own_neighborhood(volume.uuid)
         try:
             super(StorageModelRoot, self).remove_node(volume.uuid)
         except nx.NetworkXError as exc:
             LOG.exception(exc)
             raise exception.VolumeNotFound(name=volume.uuid)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.write_locked
     def map_volume(self, volume, pool):
         """Map a newly created volume to a pool
 
@@ -360,9 +581,10 @@ class StorageModelRoot(nx.DiGraph, base.Model):
         self.assert_pool(pool)
         self.assert_volume(volume)
 
+        self._own(volume.uuid, pool.name)
         self.add_edge(volume.uuid, pool.name)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.write_locked
     def unmap_volume(self, volume, pool):
         """Unmap a volume from a pool
 
@@ -374,18 +596,19 @@ class StorageModelRoot(nx.DiGraph, base.Model):
         if isinstance(pool, six.string_types):
             pool = self.get_pool_by_pool_name(pool)
 
+        self._own(volume.uuid, pool.name)
         self.remove_edge(volume.uuid, pool.name)
 
     def delete_volume(self, volume):
         self.assert_volume(volume)
         self.remove_volume(volume)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.read_locked
     def get_all_storage_nodes(self):
         return {host: cn for host, cn in self.nodes(data=True)
                 if isinstance(cn, element.StorageNode)}
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.read_locked
     def get_node_by_name(self, name):
         """Get a node by node name
 
@@ -396,14 +619,14 @@ class StorageModelRoot(nx.DiGraph, base.Model):
         except exception.StorageResourceNotFound:
             raise exception.StorageNodeNotFound(name=name)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.read_locked
     def get_pool_by_pool_name(self, name):
         try:
             return self._get_by_name(name)
         except exception.StorageResourceNotFound:
             raise exception.PoolNotFound(name=name)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.read_locked
     def get_volume_by_uuid(self, uuid):
         try:
             return self._get_by_uuid(uuid)
@@ -412,6 +635,7 @@ class StorageModelRoot(nx.DiGraph, base.Model):
 
     def _get_by_uuid(self, uuid):
         try:
+            self._own(uuid)
             return self.node[uuid]
         except Exception as exc:
             LOG.exception(exc)
@@ -419,12 +643,13 @@ class StorageModelRoot(nx.DiGraph, base.Model):
 
     def _get_by_name(self, name):
         try:
+            self._own(name)
             return self.node[name]
         except Exception as exc:
             LOG.exception(exc)
             raise exception.StorageResourceNotFound(name=name)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.read_locked
     def get_node_by_pool_name(self, pool_name):
         pool = self._get_by_name(pool_name)
         for node_name in self.neighbors(pool.name):
@@ -433,18 +658,18 @@ class StorageModelRoot(nx.DiGraph, base.Model):
                 return node
         raise exception.StorageNodeNotFound(name=pool_name)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.read_locked
     def get_node_pools(self, node):
         self.assert_node(node)
         node_pools = []
         for pool_name in self.predecessors(node.host):
-            pool = self._get_by_name(pool_name)
+            pool = self.node[pool_name]
             if isinstance(pool, element.Pool):
                 node_pools.append(pool)
 
         return node_pools
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.read_locked
     def get_pool_by_volume(self, volume):
         self.assert_volume(volume)
         volume = self._get_by_uuid(volume.uuid)
@@ -454,17 +679,17 @@ class StorageModelRoot(nx.DiGraph, base.Model):
                 return pool
         raise exception.PoolNotFound(name=volume.uuid)
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.read_locked
     def get_all_volumes(self):
         return {name: vol for name, vol in self.nodes(data=True)
                 if isinstance(vol, element.Volume)}
 
-    @lockutils.synchronized("storage_model")
+    @fasteners.read_locked
     def get_pool_volumes(self, pool):
         self.assert_pool(pool)
         volumes = []
         for vol in self.predecessors(pool.name):
-            volume = self._get_by_uuid(vol)
+            volume = self.node[vol]
             if isinstance(volume, element.Volume):
                 volumes.append(volume)
 
@@ -473,8 +698,30 @@ class StorageModelRoot(nx.DiGraph, base.Model):
     def to_string(self):
         return self.to_xml()
 
+    @fasteners.read_locked
+    def to_summary(self):
+        pools = [pool for _, pool in self.nodes(data=True)
+                 if isinstance(pool, element.Pool)]
+        return ("StorageModelRoot: %d storage nodes, %d pools, "
+                "%d volumes" % (len(self.get_all_storage_nodes()),
+                                len(pools), len(self.get_all_volumes())))
+
     def to_xml(self):
-        root = etree.Element("ModelRoot")
+        stream = io.BytesIO()
+        self.write_xml(stream)
+        return stream.getvalue().decode('utf-8')
+
+    def write_xml(self, stream):
+        """Incrementally write the XML representation of this model
+
+        The XML tree of each storage node is built and written on its own so
+        the XML tree of the whole model never has to be held in memory.
+
+        :param stream: Writable binary file-like object
+        """
+        _write_xml(stream, self.snapshot()._xml_elements())
+
+    def _xml_elements(self):
         # Build storage node tree
         for cn in sorted(self.get_all_storage_nodes().values(),
                          key=lambda cn: cn.host):
@@ -490,17 +737,13 @@ class StorageModelRoot(nx.DiGraph, base.Model):
                     volume_el = volume.as_xml_element()
                     pool_el.append(volume_el)
 
-            root.append(storage_node_el)
+            yield storage_node_el
 
         # Build unmapped volume tree (i.e. not assigned to any pool)
         for volume in sorted(self.get_all_volumes().values(),
                              key=lambda vol: vol.uuid):
-            try:
-                self.get_pool_by_volume(volume)
-            except (exception.VolumeNotFound, exception.PoolNotFound):
-                root.append(volume.as_xml_element())
-
-        return etree.tostring(root, pretty_print=True).decode('utf-8')
+            if not self.succ[volume.uuid]:
+                yield volume.as_xml_element()
 
     @classmethod
     def from_xml(cls, data):
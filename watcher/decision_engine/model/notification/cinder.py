@@ -57,6 +57,8 @@ class CinderNotification(base.NotificationEndpoint):
         """Update the storage pool using the API data."""
         if not pool:
             return
+        # List the pools again to get their latest capacities
+        self.cinder.get_storage_pool_list()
         _pool = self.cinder.get_storage_pool_by_name(pool.name)
         pool.update({
             "total_volumes": _pool.total_volumes,
@@ -73,6 +75,8 @@ class CinderNotification(base.NotificationEndpoint):
     def create_storage_node(self, name):
         """Create the storage node by querying the Cinder API."""
         try:
+            # List the nodes again to get their latest state and status
+            self.cinder.get_storage_node_list()
             _node = self.cinder.get_storage_node_by_name(name)
             _volume_type = self.cinder.get_volume_type_by_backendname(
                 # name is formatted as host@backendname
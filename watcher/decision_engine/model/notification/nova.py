@@ -52,7 +52,8 @@ class NovaNotification(base.NotificationEndpoint):
         except exception.InstanceNotFound:
             # The instance didn't exist yet so we create a new instance object
             LOG.debug("New instance created: %s", instance_uuid)
-            instance = element.Instance(uuid=instance_uuid)
+            instance = self.cluster_data_model.instance_cls(
+                uuid=instance_uuid)
 
             self.cluster_data_model.add_instance(instance)
 
@@ -145,7 +146,7 @@ class NovaNotification(base.NotificationEndpoint):
         """Update the compute node by querying the Nova API."""
         try:
             _node = self.nova.get_compute_node_by_hostname(node_hostname)
-            node = element.ComputeNode(
+            node = self.cluster_data_model.node_cls(
                 id=_node.id,
                 uuid=node_hostname,
                 hostname=_node.hypervisor_hostname,
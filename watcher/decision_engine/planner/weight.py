@@ -157,7 +157,7 @@ class WeightPlanner(base.BasePlanner):
             action_plan.state = objects.action_plan.State.SUCCEEDED
             action_plan.save()
 
-        self.create_scheduled_actions(action_graph)
+        self.create_scheduled_actions(action_graph, action_plan)
         return action_plan
 
     def get_sorted_actions_by_weight(self, context, action_plan, solution):
@@ -176,15 +176,18 @@ class WeightPlanner(base.BasePlanner):
 
         return reversed(sorted(weighted_actions.items(), key=lambda x: x[0]))
 
-    def create_scheduled_actions(self, graph):
-        for action in graph.nodes():
-            LOG.debug("Creating the %s in the Watcher database",
-                      action.action_type)
-            try:
-                action.create()
-            except Exception as exc:
-                LOG.exception(exc)
-                raise
+    def create_scheduled_actions(self, graph, action_plan=None):
+        actions = list(graph.nodes())
+        if not actions:
+            return
+        LOG.debug("Creating %d actions in the Watcher database", len(actions))
+        try:
+            objects.Action.bulk_create(
+                actions[0].obj_context, actions,
+                action_plans=[action_plan] if action_plan else None)
+        except Exception as exc:
+            LOG.exception(exc)
+            raise
 
     def create_action_plan(self, context, audit_id, solution):
         strategy = objects.Strategy.get_by_name(
@@ -214,9 +217,7 @@ class WeightPlanner(base.BasePlanner):
                 'value': indicator.value,
                 'action_plan_id': action_plan_id,
             }
-            new_efficacy_indicator = objects.EfficacyIndicator(
-                context, **efficacy_indicator_dict)
-            new_efficacy_indicator.create()
-
-            efficacy_indicators.append(new_efficacy_indicator)
-        return efficacy_indicators
+            efficacy_indicators.append(objects.EfficacyIndicator(
+                context, **efficacy_indicator_dict))
+        return objects.EfficacyIndicator.bulk_create(
+            context, efficacy_indicators)
@@ -47,7 +47,7 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
 
     def __init__(self, config):
         super(WorkloadStabilizationPlanner, self).__init__(config)
-        self._osc = clients.OpenStackClients()
+        self._osc = clients.get_shared_clients()
 
     @property
     def osc(self):
@@ -88,12 +88,46 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
 
         return action
 
-    def load_child_class(self, child_name):
+    def load_child_class(self, child_name, instance_nodes=None):
         for c in BaseActionValidator.__subclasses__():
             if child_name == c.action_name:
-                return c()
+                return c(instance_nodes)
         return None
 
+    def get_instance_nodes(self, solution):
+        """Find the nodes the resized instances are on
+
+        An instance is on the source node of its first migration if the
+        strategy moved it, else on its node in the model of the solution.
+
+        :param solution: the solution to schedule
+        :returns: a mapping from the instance UUIDs to the node UUIDs
+        """
+        instance_nodes = {}
+        resized_instances = []
+        for action in solution.actions:
+            parameters = action.get('input_parameters') or {}
+            resource_id = parameters.get('resource_id')
+            if action.get('action_type') == 'migrate':
+                source_node = parameters.get('source_node')
+                if source_node is not None:
+                    instance_nodes.setdefault(resource_id, source_node)
+            elif action.get('action_type') == 'resize':
+                resized_instances.append(resource_id)
+
+        if solution.model is None:
+            return instance_nodes
+        for instance_uuid in resized_instances:
+            if instance_uuid in instance_nodes:
+                continue
+            try:
+                node = solution.model.get_node_by_instance_uuid(instance_uuid)
+                instance_nodes[instance_uuid] = node.uuid
+            except exception.ComputeResourceNotFound:
+                LOG.debug("Instance %s not found in the model",
+                          instance_uuid)
+        return instance_nodes
+
     def schedule(self, context, audit_id, solution):
         LOG.debug('Creating an action plan for the audit uuid: %s', audit_id)
         weights = self.config.weights
@@ -120,22 +154,27 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
             action_plan.state = objects.action_plan.State.SUCCEEDED
             action_plan.save()
         else:
+            instance_nodes = self.get_instance_nodes(solution)
+            validators = {}
             resource_action_map = {}
             scheduled_actions = [x[1] for x in scheduled]
+            actions_by_uuid = {action['uuid']: action
+                               for action in scheduled_actions}
             for action in scheduled_actions:
                 a_type = action['action_type']
                 if a_type != 'turn_host_to_acpi_s3_state':
-                    plugin_action = self.load_child_class(
-                        action.get("action_type"))
+                    plugin_action = validators.get(a_type)
+                    if plugin_action is None:
+                        plugin_action = self.load_child_class(
+                            a_type, instance_nodes)
+                        validators[a_type] = plugin_action
                     if not plugin_action:
                         raise exception.UnsupportedActionType(
                             action_type=action.get("action_type"))
-                    db_action = self._create_action(context, action)
                     parents = plugin_action.validate_parents(
                         resource_action_map, action)
                     if parents:
-                        db_action.parents = parents
-                        db_action.save()
+                        action['parents'] = parents
                 # if we have an action that will make host unreachable, we need
                 # to complete all actions (resize and migration type)
                 # related to the host.
@@ -152,22 +191,20 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
                                           if x[1] == 'resize']
                         migrate_actions = [x[0] for x in host_actions
                                            if x[1] == 'migrate']
-                        resize_migration_parents = [
-                            x.parents for x in
-                            [objects.Action.get_by_uuid(context, resize_action)
-                             for resize_action in resize_actions]]
                         # resize_migration_parents should be one level list
                         resize_migration_parents = [
-                            parent for sublist in resize_migration_parents
-                            for parent in sublist]
+                            parent for resize_action in resize_actions
+                            for parent in (
+                                actions_by_uuid[resize_action]['parents'] or
+                                [])]
                         action_parents.extend([uuid for uuid in
                                                resize_actions])
                         action_parents.extend([uuid for uuid in
                                               migrate_actions if uuid not in
                                               resize_migration_parents])
-                    db_action = self._create_action(context, action)
-                    db_action.parents = action_parents
-                    db_action.save()
+                    action['parents'] = action_parents
+
+            self._create_actions(context, scheduled_actions, action_plan)
 
         return action_plan
 
@@ -199,22 +236,20 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
                 'value': indicator.value,
                 'action_plan_id': action_plan_id,
             }
-            new_efficacy_indicator = objects.EfficacyIndicator(
-                context, **efficacy_indicator_dict)
-            new_efficacy_indicator.create()
-
-            efficacy_indicators.append(new_efficacy_indicator)
-        return efficacy_indicators
+            efficacy_indicators.append(objects.EfficacyIndicator(
+                context, **efficacy_indicator_dict))
+        return objects.EfficacyIndicator.bulk_create(
+            context, efficacy_indicators)
 
-    def _create_action(self, context, _action):
+    def _create_actions(self, context, _actions, action_plan):
         try:
-            LOG.debug("Creating the %s in the Watcher database",
-                      _action.get("action_type"))
+            LOG.debug("Creating %d actions in the Watcher database",
+                      len(_actions))
 
-            new_action = objects.Action(context, **_action)
-            new_action.create()
-
-            return new_action
+            return objects.Action.bulk_create(
+                context, [objects.Action(context, **_action)
+                          for _action in _actions],
+                action_plans=[action_plan])
         except Exception as exc:
             LOG.exception(exc)
             raise
@@ -223,14 +258,15 @@ class WorkloadStabilizationPlanner(base.BasePlanner):
 class BaseActionValidator(object):
     action_name = None
 
-    def __init__(self):
+    def __init__(self, instance_nodes=None):
         super(BaseActionValidator, self).__init__()
         self._osc = None
+        self.instance_nodes = instance_nodes or {}
 
     @property
     def osc(self):
         if not self._osc:
-            self._osc = clients.OpenStackClients()
+            self._osc = clients.get_shared_clients()
         return self._osc
 
     @abc.abstractmethod
@@ -262,12 +298,18 @@ class MigrationActionValidator(BaseActionValidator):
 class ResizeActionValidator(BaseActionValidator):
     action_name = "resize"
 
+    def get_host_of_instance(self, instance_uuid):
+        host_of_instance = self.instance_nodes.get(instance_uuid)
+        if host_of_instance is None:
+            nova = nova_helper.NovaHelper(osc=self.osc)
+            host_of_instance = nova.get_hostname(
+                nova.get_instance_by_uuid(instance_uuid)[0])
+        return host_of_instance
+
     def validate_parents(self, resource_action_map, action):
-        nova = nova_helper.NovaHelper(osc=self.osc)
         instance_uuid = action['input_parameters']['resource_id']
         parent_actions = resource_action_map.get(instance_uuid)
-        host_of_instance = nova.get_hostname(
-            nova.get_instance_by_uuid(instance_uuid)[0])
+        host_of_instance = self.get_host_of_instance(instance_uuid)
         self._mapping(resource_action_map, host_of_instance, action['uuid'],
                       'resize')
         if parent_actions:
@@ -281,7 +323,7 @@ class ChangeNovaServiceStateActionValidator(BaseActionValidator):
 
     def validate_parents(self, resource_action_map, action):
         host_name = action['input_parameters']['resource_id']
-        self._mapping(resource_action_map, host_name, action.uuid,
+        self._mapping(resource_action_map, host_name, action['uuid'],
                       'change_nova_service_state')
         return []
 
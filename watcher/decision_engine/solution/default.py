@@ -16,7 +16,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import collections
+
 from oslo_log import log
+import six
 
 from watcher.applier.actions import base as baction
 from watcher.common import exception
@@ -25,6 +28,26 @@ from watcher.decision_engine.solution import base
 LOG = log.getLogger(__name__)
 
 
+def _freeze(value):
+    """Hashable counterpart of a JSON-like value"""
+    if isinstance(value, dict):
+        return frozenset((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def action_key(action):
+    """Key identifying an action of a solution
+
+    Two actions have the same key if they are equal, so the key is used to
+    detect the duplicate actions without comparing them one by one.
+    """
+    return action['action_type'], _freeze(action['input_parameters'])
+
+
 class DefaultSolution(base.BaseSolution):
     def __init__(self, goal, strategy):
         """Stores a set of actions generated by a strategy
@@ -32,13 +55,23 @@ class DefaultSolution(base.BaseSolution):
         The DefaultSolution class store a set of actions generated by a
         strategy in order to achieve the goal.
 
+        The actions are kept in the order they were added and indexed by
+        resource and action type, so that strategies can look up, remove or
+        rewrite the actions of a resource without scanning the whole solution.
+
         :param goal: Goal associated to this solution
         :type goal: :py:class:`~.base.Goal` instance
         :param strategy: Strategy associated to this solution
         :type strategy: :py:class:`~.BaseStrategy` instance
         """
         super(DefaultSolution, self).__init__(goal, strategy)
-        self._actions = []
+        # {action key: action}
+        self._actions = collections.OrderedDict()
+        # {resource id: {action key: action}}
+        self._resource_index = collections.defaultdict(
+            collections.OrderedDict)
+        # {action type: {action key: action}}
+        self._type_index = collections.defaultdict(collections.OrderedDict)
 
     def add_action(self, action_type, input_parameters=None, resource_id=None):
         if input_parameters is not None:
@@ -54,16 +87,132 @@ class DefaultSolution(base.BaseSolution):
             'action_type': action_type,
             'input_parameters': input_parameters
         }
-        if action not in self._actions:
-            self._actions.append(action)
+        key = action_key(action)
+        if key not in self._actions:
+            self._actions[key] = action
+            self._resource_index[resource_id][key] = action
+            self._type_index[action_type][key] = action
         else:
             LOG.warning('Action %s has been added into the solution, '
                         'duplicate action will be dropped.', str(action))
 
+    def remove_action(self, action):
+        """Remove an action from the solution
+
+        :param action: the action to remove, as found in :py:attr:`actions`
+        :return: True if the action was removed, False if it was not part of
+                 the solution
+        """
+        key = action_key(action)
+        action = self._actions.pop(key, None)
+        if action is None:
+            return False
+        resource_id = action['input_parameters'].get(
+            baction.BaseAction.RESOURCE_ID)
+        self._remove_from_index(self._resource_index, resource_id, key)
+        self._remove_from_index(
+            self._type_index, action['action_type'], key)
+        return True
+
+    @staticmethod
+    def _remove_from_index(index, name, key):
+        entries = index[name]
+        del entries[key]
+        if not entries:
+            del index[name]
+
+    def get_actions(self, resource_id=None, action_type=None):
+        """Get the actions of a resource and/or of an action type
+
+        :param resource_id: the id of the resource the actions apply to,
+                            None for the actions of any resource
+        :param action_type: the action type of the actions, None for the
+                            actions of any type
+        :return: the matching actions, in the order they were added
+        """
+        if resource_id is not None:
+            if resource_id not in self._resource_index:
+                return []
+            actions = self._resource_index[resource_id].values()
+            if action_type is not None:
+                actions = (action for action in actions
+                           if action['action_type'] == action_type)
+        elif action_type is not None:
+            if action_type not in self._type_index:
+                return []
+            actions = self._type_index[action_type].values()
+        else:
+            actions = self._actions.values()
+        return list(actions)
+
+    def get_resource_ids(self, action_type=None):
+        """Get the ids of the resources which have actions
+
+        :param action_type: only consider the actions of this type
+        :return: the resource ids, in the order of their first action
+        """
+        if action_type is None:
+            return [resource_id for resource_id in self._resource_index
+                    if resource_id is not None]
+        resource_ids = collections.OrderedDict()
+        for action in self.get_actions(action_type=action_type):
+            resource_id = action['input_parameters'].get(
+                baction.BaseAction.RESOURCE_ID)
+            if resource_id is not None:
+                resource_ids[resource_id] = None
+        return list(resource_ids)
+
+    def collapse_chain(self, resource_id, action_type,
+                       source_parameter='source_node',
+                       destination_parameter='destination_node'):
+        """Collapse the chain of moves of a resource into a single move
+
+        The moves of a resource (e.g. its migrations) are replaced by a
+        single move from the source of the first one to the destination of
+        the last one, i.e. A->B, B->C becomes A->C. If the last destination
+        is the first source, i.e. A->B, B->A, the moves cancel each other
+        out and are all removed.
+
+        :param resource_id: the id of the moved resource
+        :param action_type: the action type of the moves
+        :param source_parameter: the input parameter holding the source
+        :param destination_parameter: the input parameter holding the
+                                      destination
+        :return: the number of actions removed from the solution
+        """
+        moves = self.get_actions(resource_id, action_type)
+        if len(moves) < 2:
+            return 0
+        for move in moves:
+            self.remove_action(move)
+        parameters = dict(moves[-1]['input_parameters'])
+        del parameters[baction.BaseAction.RESOURCE_ID]
+        parameters[source_parameter] = (
+            moves[0]['input_parameters'][source_parameter])
+        if parameters[source_parameter] == parameters[destination_parameter]:
+            return len(moves)
+        self.add_action(action_type, input_parameters=parameters,
+                        resource_id=resource_id)
+        return len(moves) - 1
+
+    def collapse_chains(self, action_type,
+                        source_parameter='source_node',
+                        destination_parameter='destination_node'):
+        """Collapse the chains of moves of every resource
+
+        See :py:meth:`collapse_chain`.
+
+        :return: the number of actions removed from the solution
+        """
+        return sum(
+            self.collapse_chain(resource_id, action_type,
+                                source_parameter, destination_parameter)
+            for resource_id in self.get_resource_ids(action_type))
+
     def __str__(self):
-        return "\n".join(self._actions)
+        return "\n".join(six.text_type(action) for action in self.actions)
 
     @property
     def actions(self):
         """Get the current actions of the solution"""
-        return self._actions
+        return list(self._actions.values())
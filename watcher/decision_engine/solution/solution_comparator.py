@@ -20,8 +20,37 @@ import abc
 import six
 
 
+from watcher.decision_engine.solution import solution_evaluator
+
+
 @six.add_metaclass(abc.ABCMeta)
 class BaseSolutionComparator(object):
     @abc.abstractmethod
     def compare(self, sol1, sol2):
         raise NotImplementedError()
+
+
+class GlobalEfficacyComparator(BaseSolutionComparator):
+    """Compare the solutions on their global efficacy
+
+    A solution without any global efficacy is worse than any solution having
+    one.
+    """
+
+    def __init__(self):
+        super(GlobalEfficacyComparator, self).__init__()
+        self.evaluator = solution_evaluator.GlobalEfficacyEvaluator()
+
+    def compare(self, sol1, sol2):
+        """Compare two solutions
+
+        :returns: a positive number if sol1 is better than sol2, a negative
+                  number if sol2 is better than sol1, else 0
+        """
+        score1 = self.evaluator.evaluate(sol1)
+        score2 = self.evaluator.evaluate(sol2)
+        if score1 == score2:
+            return 0
+        elif score2 is None or (score1 is not None and score1 > score2):
+            return 1
+        return -1
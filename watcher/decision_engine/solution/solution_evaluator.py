@@ -25,3 +25,18 @@ class BaseSolutionEvaluator(object):
     @abc.abstractmethod
     def evaluate(self, solution):
         raise NotImplementedError()
+
+
+class GlobalEfficacyEvaluator(BaseSolutionEvaluator):
+    """Score a solution with the value of its global efficacy"""
+
+    def evaluate(self, solution):
+        """Score a solution
+
+        :returns: the value of the global efficacy of the solution, or None
+                  if its goal does not define any
+        """
+        global_efficacy = solution.global_efficacy
+        if global_efficacy is None:
+            return None
+        return global_efficacy.value
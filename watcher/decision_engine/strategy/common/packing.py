@@ -0,0 +1,108 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+class FirstFitIndex(object):
+    """Index of the free resources of an ordered list of bins
+
+    The index is a segment tree whose nodes hold, for each resource, the
+    largest amount free in any of the bins they span. A first-fit search
+    therefore skips every group of bins in which at least one resource is
+    too scarce, instead of checking the bins one by one.
+
+    The free resources are only used to skip the bins which cannot fit, the
+    bins which may fit being checked by the given predicate. This way the
+    search gives exactly the result of a linear first-fit search using this
+    predicate, whatever the rounding of the free resources.
+    """
+
+    # Margin added to the free resources before skipping a group of bins, so
+    # that rounding errors never skip a bin which fits
+    TOLERANCE = 1e-6
+
+    def __init__(self, bins, resources, get_free):
+        """Index of the free resources of an ordered list of bins
+
+        :param bins: the bins, in the order they are searched in
+        :param resources: names of the resources
+        :param get_free: callable returning the dict of the free resources
+                         of a bin
+        """
+        self.bins = list(bins)
+        self.resources = list(resources)
+        self.get_free = get_free
+        self._size = 1
+        while self._size < len(self.bins):
+            self._size *= 2
+        empty = tuple(float('-inf') for _ in self.resources)
+        self._tree = [empty] * (2 * self._size)
+        for index, bin_ in enumerate(self.bins):
+            self._tree[self._size + index] = self._get_free(bin_)
+        for position in range(self._size - 1, 0, -1):
+            self._tree[position] = self._merge(position)
+
+    def __len__(self):
+        return len(self.bins)
+
+    def _get_free(self, bin_):
+        free = self.get_free(bin_)
+        return tuple(free[resource] for resource in self.resources)
+
+    def _merge(self, position):
+        return tuple(max(left, right) for left, right in zip(
+            self._tree[2 * position], self._tree[2 * position + 1]))
+
+    def update(self, index):
+        """Refresh the free resources of a bin
+
+        :param index: index of the bin whose free resources changed
+        """
+        position = self._size + index
+        self._tree[position] = self._get_free(self.bins[index])
+        position //= 2
+        while position:
+            self._tree[position] = self._merge(position)
+            position //= 2
+
+    def _may_fit(self, position, demand):
+        return all(needed <= free + self.TOLERANCE
+                   for needed, free in zip(demand, self._tree[position]))
+
+    def find_last(self, demand, fits, first=0):
+        """Find the last bin able to fit a demand
+
+        :param demand: dict of the resources needed
+        :param fits: predicate telling whether a bin fits the demand
+        :param first: index of the first bin which can be returned
+        :return: the index of the last bin from ``first`` which fits the
+                 demand, or None
+        """
+        demand = tuple(demand[resource] for resource in self.resources)
+        return self._find_last(1, 0, self._size - 1, demand, fits, first)
+
+    def _find_last(self, position, low, high, demand, fits, first):
+        if high < first or low >= len(self.bins):
+            return None
+        if not self._may_fit(position, demand):
+            return None
+        if low == high:
+            return low if fits(self.bins[low]) else None
+        middle = (low + high) // 2
+        index = self._find_last(
+            2 * position + 1, middle + 1, high, demand, fits, first)
+        if index is None:
+            index = self._find_last(
+                2 * position, low, middle, demand, fits, first)
+        return index
@@ -13,15 +13,25 @@
 # implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import copy
+import sys
+
+import eventlet
+from oslo_config import cfg
 from oslo_log import log
+import six
 
 from watcher.common import clients
+from watcher.common import exception
 from watcher.common import utils
+from watcher.decision_engine.model.collector import manager
+from watcher.decision_engine.solution import solution_comparator
 from watcher.decision_engine.strategy.context import base
 from watcher.decision_engine.strategy.selection import default
 
 from watcher import objects
 
+CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
 
@@ -29,9 +39,10 @@ class DefaultStrategyContext(base.StrategyContext):
     def __init__(self):
         super(DefaultStrategyContext, self).__init__()
         LOG.debug("Initializing Strategy Context")
+        self.comparator = solution_comparator.GlobalEfficacyComparator()
 
     def do_execute_strategy(self, audit, request_context):
-        osc = clients.OpenStackClients()
+        osc = clients.get_shared_clients()
         # todo(jed) retrieve in audit parameters (threshold,...)
         # todo(jed) create ActionPlan
 
@@ -51,18 +62,114 @@ class DefaultStrategyContext(base.StrategyContext):
             strategy_name=strategy_name,
             osc=osc)
 
+        if (strategy_name is None and
+                CONF.watcher_decision_engine.evaluate_all_strategies):
+            return self.evaluate_strategies(
+                audit, goal, strategy_selector.select_all())
+
         selected_strategy = strategy_selector.select()
+        self._set_up_strategy(selected_strategy, audit, audit.parameters)
+
+        return selected_strategy.execute()
 
-        selected_strategy.audit_scope = audit.scope
+    def _set_up_strategy(self, strategy, audit, parameters):
+        strategy.audit_scope = audit.scope
 
-        schema = selected_strategy.get_schema()
-        if not audit.parameters and schema:
+        schema = strategy.get_schema()
+        if not parameters and schema:
             # Default value feedback if no predefined strategy
             utils.StrictDefaultValidatingDraft4Validator(schema).validate(
-                audit.parameters)
+                parameters)
 
-        selected_strategy.input_parameters.update({
-            name: value for name, value in audit.parameters.items()
+        strategy.input_parameters.update({
+            name: value for name, value in parameters.items()
         })
 
-        return selected_strategy.execute()
+    def evaluate_strategies(self, audit, goal, strategies):
+        """Execute the strategies concurrently and keep the best solution
+
+        The strategies all work on the same snapshot of the cluster data
+        models. Up to ``max_workers`` of them run at a time, each in its own
+        green thread. Those which fail, or which do not find a solution
+        within ``strategy_timeout`` seconds of their start, are left out of
+        the comparison.
+
+        :param audit: Audit object
+        :type audit: :py:class:`~.objects.audit.Audit` instance
+        :param goal: Goal object of the audit
+        :type goal: :py:class:`~.objects.goal.Goal` instance
+        :param strategies: the strategies to evaluate
+        :type strategies: list of :py:class:`~.BaseStrategy` instances
+        :raises: the error of the strategies if they all failed, otherwise
+                 :py:class:`~.NoSolutionForGoal` if no strategy found a
+                 solution
+        :returns: The solution with the best global efficacy
+        :rtype: :py:class:`~.BaseSolution` instance
+        """
+        collector_manager = manager.SharedSnapshotCollectorManager()
+        for strategy in strategies:
+            strategy.collector_manager = collector_manager
+            # The default values of a strategy must not leak into the others
+            self._set_up_strategy(
+                strategy, audit, copy.deepcopy(audit.parameters))
+
+        timeout = CONF.watcher_decision_engine.strategy_timeout
+        pool = eventlet.GreenPool(
+            min(len(strategies), CONF.watcher_decision_engine.max_workers))
+        results = list(pool.imap(
+            lambda strategy: self._execute_strategy(strategy, timeout),
+            strategies))
+
+        best_solution = None
+        errors = []
+        for strategy, (solution, exc_info) in zip(strategies, results):
+            if exc_info is not None:
+                errors.append(exc_info)
+                continue
+            if solution is None:
+                continue
+
+            LOG.debug("Strategy %(strategy)s found a solution with a global "
+                      "efficacy of %(efficacy)s",
+                      dict(strategy=strategy.name,
+                           efficacy=solution.global_efficacy))
+            if (best_solution is None or
+                    self.comparator.compare(solution, best_solution) > 0):
+                best_solution = solution
+
+        if best_solution is None:
+            if len(errors) == len(strategies):
+                six.reraise(*errors[-1])
+            raise exception.NoSolutionForGoal(goal=goal.name)
+
+        LOG.info("The solution of strategy %s is selected",
+                 best_solution.strategy.name)
+        return best_solution
+
+    @staticmethod
+    def _execute_strategy(strategy, timeout):
+        """Execute a strategy within the given time
+
+        The time is checked cooperatively: the strategy is interrupted the
+        next time it yields to the other green threads, e.g. when it queries
+        a datasource, once it is over.
+
+        :returns: a tuple holding the solution of the strategy, or None if it
+                  timed out, and the information about its error if it failed
+        """
+        timer = eventlet.Timeout(timeout)
+        try:
+            return strategy.execute(), None
+        except eventlet.Timeout as exc:
+            if exc is not timer:
+                raise
+            LOG.warning("Strategy %(strategy)s did not find a solution "
+                        "within %(timeout)d seconds",
+                        dict(strategy=strategy.name, timeout=timeout))
+            return None, None
+        except Exception as exc:
+            LOG.error("Strategy %(strategy)s failed: %(error)s",
+                      dict(strategy=strategy.name, error=exc))
+            return None, sys.exc_info()
+        finally:
+            timer.cancel()
@@ -39,31 +39,48 @@ class DefaultStrategySelector(base.BaseSelector):
         self.osc = osc
         self.strategy_loader = default.DefaultStrategyLoader()
 
+    def _get_strategies_to_load(self):
+        if self.strategy_name:
+            return [self.strategy_name]
+
+        available_strategies = self.strategy_loader.list_available()
+        available_strategies_for_goal = list(
+            key for key, strat in available_strategies.items()
+            if strat.get_goal_name() == self.goal_name)
+
+        if not available_strategies_for_goal:
+            raise exception.NoAvailableStrategyForGoal(goal=self.goal_name)
+        return available_strategies_for_goal
+
     def select(self):
         """Selects a strategy
 
         :raises: :py:class:`~.LoadingError` if it failed to load a strategy
         :returns: A :py:class:`~.BaseStrategy` instance
         """
-        strategy_to_load = None
         try:
-            if self.strategy_name:
-                strategy_to_load = self.strategy_name
-            else:
-                available_strategies = self.strategy_loader.list_available()
-                available_strategies_for_goal = list(
-                    key for key, strat in available_strategies.items()
-                    if strat.get_goal_name() == self.goal_name)
+            strategy_to_load = self._get_strategies_to_load()[0]
+            return self.strategy_loader.load(strategy_to_load, osc=self.osc)
+        except exception.NoAvailableStrategyForGoal:
+            raise
+        except Exception as exc:
+            LOG.exception(exc)
+            raise exception.LoadingError(
+                _("Could not load any strategy for goal %(goal)s"),
+                goal=self.goal_name)
 
-                if not available_strategies_for_goal:
-                    raise exception.NoAvailableStrategyForGoal(
-                        goal=self.goal_name)
+    def select_all(self):
+        """Selects all the candidate strategies
 
-                # TODO(v-francoise): We should do some more work here to select
-                # a strategy out of a given goal instead of just choosing the
-                # 1st one
-                strategy_to_load = available_strategies_for_goal[0]
-            return self.strategy_loader.load(strategy_to_load, osc=self.osc)
+        These are the strategy given by name if any, else all the strategies
+        of the goal.
+
+        :raises: :py:class:`~.LoadingError` if it failed to load a strategy
+        :returns: A list of :py:class:`~.BaseStrategy` instances
+        """
+        try:
+            return [self.strategy_loader.load(strategy_to_load, osc=self.osc)
+                    for strategy_to_load in self._get_strategies_to_load()]
         except exception.NoAvailableStrategyForGoal:
             raise
         except Exception as exc:
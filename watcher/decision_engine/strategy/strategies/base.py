@@ -172,6 +172,10 @@ class BaseStrategy(loadable.Loadable):
             self._collector_manager = manager.CollectorManager()
         return self._collector_manager
 
+    @collector_manager.setter
+    def collector_manager(self, collector_manager):
+        self._collector_manager = collector_manager
+
     @property
     def compute_model(self):
         """Cluster data model
@@ -180,10 +184,9 @@ class BaseStrategy(loadable.Loadable):
         :rtype model: :py:class:`~.ModelRoot` instance
         """
         if self._compute_model is None:
-            collector = self.collector_manager.get_cluster_model_collector(
-                'compute', osc=self.osc)
             self._compute_model = self.audit_scope_handler.get_scoped_model(
-                collector.get_latest_cluster_data_model())
+                self.collector_manager.get_latest_cluster_data_model(
+                    'compute', osc=self.osc))
 
         if not self._compute_model:
             raise exception.ClusterStateNotDefined()
@@ -201,10 +204,9 @@ class BaseStrategy(loadable.Loadable):
         :rtype model: :py:class:`~.ModelRoot` instance
         """
         if self._storage_model is None:
-            collector = self.collector_manager.get_cluster_model_collector(
-                'storage', osc=self.osc)
             self._storage_model = self.audit_scope_handler.get_scoped_model(
-                collector.get_latest_cluster_data_model())
+                self.collector_manager.get_latest_cluster_data_model(
+                    'storage', osc=self.osc))
 
         if not self._storage_model:
             raise exception.ClusterStateNotDefined()
@@ -234,7 +236,7 @@ class BaseStrategy(loadable.Loadable):
     @property
     def osc(self):
         if not self._osc:
-            self._osc = clients.OpenStackClients()
+            self._osc = clients.get_shared_clients()
         return self._osc
 
     @property
@@ -45,6 +45,7 @@ from watcher.common import exception
 from watcher.datasource import ceilometer as ceil
 from watcher.datasource import gnocchi as gnoc
 from watcher.datasource import monasca as mon
+from watcher.decision_engine.model import base as model_base
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -212,19 +213,12 @@ class BasicConsolidation(base.ServerConsolidationBaseStrategy):
         LOG.debug('Migrate instance %s from %s to  %s',
                   instance_to_migrate, source_node, destination_node)
 
-        total_cores = 0
-        total_disk = 0
-        total_mem = 0
-        for instance in self.compute_model.get_node_instances(
-                destination_node):
-            total_cores += instance.vcpus
-            total_disk += instance.disk
-            total_mem += instance.memory
+        used = self.compute_model.get_node_used_resources(destination_node)
 
         # capacity requested by the compute node
-        total_cores += instance_to_migrate.vcpus
-        total_disk += instance_to_migrate.disk
-        total_mem += instance_to_migrate.memory
+        total_cores = used['vcpus'] + instance_to_migrate.vcpus
+        total_disk = used['disk'] + instance_to_migrate.disk
+        total_mem = used['memory'] + instance_to_migrate.memory
 
         return self.check_threshold(destination_node, total_cores, total_disk,
                                     total_mem)
@@ -508,7 +502,7 @@ class BasicConsolidation(base.ServerConsolidationBaseStrategy):
         if self.compute_model.stale:
             raise exception.ClusterStateStale()
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
 
     def do_execute(self):
         unsuccessful_migration = 0
@@ -562,4 +556,4 @@ class BasicConsolidation(base.ServerConsolidationBaseStrategy):
             released_compute_nodes_count=self.number_of_released_nodes,
             instance_migrations_count=self.number_of_migrations,
         )
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
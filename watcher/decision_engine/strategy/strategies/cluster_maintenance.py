@@ -22,6 +22,7 @@ import six
 
 from watcher._i18n import _
 from watcher.common import exception as wexc
+from watcher.decision_engine.model import base as model_base
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -127,17 +128,10 @@ class ClusterMaintenance(base.ClusterMaintenanceBaseStrategy):
         :param node: node object
         :return: dict(cpu(cores), ram(MB), disk(B))
         """
-        vcpus_used = 0
-        memory_used = 0
-        disk_used = 0
-        for instance in self.compute_model.get_node_instances(node):
-            vcpus_used += instance.vcpus
-            memory_used += instance.memory
-            disk_used += instance.disk
-
-        return dict(cpu=vcpus_used,
-                    ram=memory_used,
-                    disk=disk_used)
+        used = self.compute_model.get_node_used_resources(node)
+        return dict(cpu=used['vcpus'],
+                    ram=used['memory'],
+                    disk=used['disk'])
 
     def get_node_free(self, node):
         """Collect cpu, ram and disk free of a node.
@@ -324,7 +318,7 @@ class ClusterMaintenance(base.ClusterMaintenanceBaseStrategy):
         if self.compute_model.stale:
             raise wexc.ClusterStateStale()
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
 
     def do_execute(self):
         LOG.info(_('Executing Cluster Maintenance Migration Strategy'))
@@ -350,4 +344,4 @@ class ClusterMaintenance(base.ClusterMaintenanceBaseStrategy):
         This can be used to compute the global efficacy
         """
         LOG.debug(self.solution.actions)
-        LOG.debug(self.compute_model.to_string())
\ No newline at end of file
+        LOG.debug(model_base.ModelDump(self.compute_model))
\ No newline at end of file
@@ -21,6 +21,7 @@ from oslo_log import log
 from watcher._i18n import _
 from watcher.common import exception as wexc
 from watcher.datasource import ceilometer as ceil
+from watcher.decision_engine.model import base as model_base
 from watcher.decision_engine.strategy.strategies import base
 
 LOG = log.getLogger(__name__)
@@ -215,16 +216,8 @@ class NoisyNeighbor(base.NoisyNeighborBaseStrategy):
 
     def calc_used_resource(self, node):
         """Calculate the used vcpus, memory and disk based on VM flavors"""
-        instances = self.compute_model.get_node_instances(node)
-        vcpus_used = 0
-        memory_mb_used = 0
-        disk_gb_used = 0
-        for instance in instances:
-            vcpus_used += instance.vcpus
-            memory_mb_used += instance.memory
-            disk_gb_used += instance.disk
-
-        return vcpus_used, memory_mb_used, disk_gb_used
+        used = self.compute_model.get_node_used_resources(node)
+        return used['vcpus'], used['memory'], used['disk']
 
     def filter_dest_servers(self, hosts, instance_to_migrate):
         required_cores = instance_to_migrate.vcpus
@@ -252,7 +245,7 @@ class NoisyNeighbor(base.NoisyNeighborBaseStrategy):
         if self.compute_model.stale:
             raise wexc.ClusterStateStale()
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
 
     def do_execute(self):
         self.cache_threshold = self.input_parameters.cache_threshold
@@ -301,4 +294,4 @@ class NoisyNeighbor(base.NoisyNeighborBaseStrategy):
     def post_execute(self):
         self.solution.model = self.compute_model
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
@@ -36,6 +36,7 @@ from watcher._i18n import _
 from watcher.common import exception as wexc
 from watcher.datasource import ceilometer as ceil
 from watcher.datasource import gnocchi as gnoc
+from watcher.decision_engine.model import base as model_base
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -162,16 +163,8 @@ class OutletTempControl(base.ThermalOptimizationBaseStrategy):
 
     def calc_used_resource(self, node):
         """Calculate the used vcpus, memory and disk based on VM flavors"""
-        instances = self.compute_model.get_node_instances(node)
-        vcpus_used = 0
-        memory_mb_used = 0
-        disk_gb_used = 0
-        for instance in instances:
-            vcpus_used += instance.vcpus
-            memory_mb_used += instance.memory
-            disk_gb_used += instance.disk
-
-        return vcpus_used, memory_mb_used, disk_gb_used
+        used = self.compute_model.get_node_used_resources(node)
+        return used['vcpus'], used['memory'], used['disk']
 
     def group_hosts_by_outlet_temp(self):
         """Group hosts based on outlet temp meters"""
@@ -273,7 +266,7 @@ class OutletTempControl(base.ThermalOptimizationBaseStrategy):
         if self.compute_model.stale:
             raise wexc.ClusterStateStale()
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
 
     def do_execute(self):
         # the migration plan will be triggered when the outlet temperature
@@ -330,4 +323,4 @@ class OutletTempControl(base.ThermalOptimizationBaseStrategy):
         self.solution.model = self.compute_model
         # TODO(v-francoise): Add the indicators to the solution
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
@@ -22,6 +22,7 @@ from oslo_log import log
 import six
 
 from watcher._i18n import _
+from watcher.decision_engine.model import base as model_base
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -156,4 +157,4 @@ class BasicPowerSave(base.PowerSaveBaseStrategy):
         This can be used to compute the global efficacy
         """
         self.solution.model = self.compute_model
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
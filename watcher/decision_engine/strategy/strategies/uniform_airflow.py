@@ -51,6 +51,7 @@ from watcher._i18n import _
 from watcher.common import exception as wexc
 from watcher.datasource import ceilometer as ceil
 from watcher.datasource import gnocchi as gnoc
+from watcher.decision_engine.model import base as model_base
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -216,16 +217,8 @@ class UniformAirflow(base.BaseStrategy):
 
     def calculate_used_resource(self, node):
         """Compute the used vcpus, memory and disk based on instance flavors"""
-        instances = self.compute_model.get_node_instances(node)
-        vcpus_used = 0
-        memory_mb_used = 0
-        disk_gb_used = 0
-        for instance in instances:
-            vcpus_used += instance.vcpus
-            memory_mb_used += instance.memory
-            disk_gb_used += instance.disk
-
-        return vcpus_used, memory_mb_used, disk_gb_used
+        used = self.compute_model.get_node_used_resources(node)
+        return used['vcpus'], used['memory'], used['disk']
 
     def choose_instance_to_migrate(self, hosts):
         """Pick up an active instance instance to migrate from provided hosts
@@ -384,7 +377,7 @@ class UniformAirflow(base.BaseStrategy):
         if self.compute_model.stale:
             raise wexc.ClusterStateStale()
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
 
     def do_execute(self):
         self.threshold_airflow = self.input_parameters.threshold_airflow
@@ -439,4 +432,4 @@ class UniformAirflow(base.BaseStrategy):
         self.solution.model = self.compute_model
         # TODO(v-francoise): Add the indicators to the solution
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
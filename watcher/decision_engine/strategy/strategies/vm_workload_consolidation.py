@@ -62,7 +62,9 @@ from watcher._i18n import _
 from watcher.common import exception
 from watcher.datasource import ceilometer as ceil
 from watcher.datasource import gnocchi as gnoc
+from watcher.decision_engine.model import base as model_base
 from watcher.decision_engine.model import element
+from watcher.decision_engine.strategy.common import packing
 from watcher.decision_engine.strategy.strategies import base
 
 LOG = log.getLogger(__name__)
@@ -96,6 +98,9 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
         self._gnocchi = None
         self.number_of_migrations = 0
         self.number_of_released_nodes = 0
+        # Utilization of the nodes of the model, refreshed on migrations
+        self._nodes_utilization = {}
+        self._nodes_utilization_model = None
         # self.ceilometer_instance_data_cache = dict()
         self.datasource_instance_data_cache = dict()
 
@@ -258,8 +263,7 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
         if destination_node_status_str == element.ServiceState.DISABLED.value:
             self.add_action_enable_compute_node(destination_node)
 
-        if self.compute_model.migrate_instance(
-                instance, source_node, destination_node):
+        if self.migrate_instance(instance, source_node, destination_node):
             params = {'migration_type': migration_type,
                       'source_node': source_node.uuid,
                       'destination_node': destination_node.uuid}
@@ -268,6 +272,22 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
                                      input_parameters=params)
             self.number_of_migrations += 1
 
+    def migrate_instance(self, instance, source_node, destination_node):
+        """Migrate an instance within the model.
+
+        :param instance: instance object
+        :param source_node: node object
+        :param destination_node: node object
+        :return: True if the instance was migrated, False otherwise
+        """
+        if not self.compute_model.migrate_instance(
+                instance, source_node, destination_node):
+            return False
+        nodes_utilization = self._get_nodes_utilization()
+        nodes_utilization.pop(source_node.uuid, None)
+        nodes_utilization.pop(destination_node.uuid, None)
+        return True
+
     def disable_unused_nodes(self):
         """Generate actions for disabling unused nodes.
 
@@ -374,13 +394,29 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
             disk=instance_disk_util)
         return self.datasource_instance_data_cache.get(instance.uuid)
 
+    def _get_nodes_utilization(self):
+        if self._nodes_utilization_model is not self.compute_model:
+            self._nodes_utilization_model = self.compute_model
+            self._nodes_utilization = {}
+        return self._nodes_utilization
+
     def get_node_utilization(self, node):
         """Collect cpu, ram and disk utilization statistics of a node.
 
+        The utilization of a node is computed once, then kept until an
+        instance is migrated from or to this node.
+
         :param node: node object
         :param aggr: string
         :return: dict(cpu(number of cores used), ram(MB used), disk(B used))
         """
+        nodes_utilization = self._get_nodes_utilization()
+        if node.uuid not in nodes_utilization:
+            nodes_utilization[node.uuid] = self._compute_node_utilization(
+                node)
+        return dict(nodes_utilization[node.uuid])
+
+    def _compute_node_utilization(self, node):
         node_instances = self.compute_model.get_node_instances(node)
         node_ram_util = 0
         node_disk_util = 0
@@ -476,6 +512,35 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
                 return False
         return True
 
+    def get_first_fit_index(self, nodes, cc):
+        """Index the resources left on nodes for the first-fit searches.
+
+        :param nodes: list of node objects, in the order they are searched in
+        :param cc: dictionary containing resource capacity coefficients
+        :return: :py:class:`~.FirstFitIndex` instance
+        """
+        def get_free(node):
+            node_capacity = self.get_node_capacity(node)
+            node_utilization = self.get_node_utilization(node)
+            return {m: node_capacity[m] * cc[m] - node_utilization[m]
+                    for m in ['cpu', 'ram', 'disk']}
+
+        return packing.FirstFitIndex(nodes, ['cpu', 'ram', 'disk'], get_free)
+
+    def find_destination(self, index, instance, cc, first=0):
+        """Find the last indexed node able to accommodate a VM.
+
+        :param index: :py:class:`~.FirstFitIndex` of the nodes
+        :param instance: :py:class:`~.element.Instance`
+        :param cc: dictionary containing resource capacity coefficients
+        :param first: position of the first node which can be returned
+        :return: the position of the node, or None if no node fits
+        """
+        return index.find_last(
+            self.get_instance_utilization(instance),
+            lambda node: self.instance_fits(instance, node, cc),
+            first=first)
+
     def optimize_solution(self):
         """Optimize solution.
 
@@ -490,30 +555,10 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
         * A->B, B->A => remove A->B and B->A as they do not result
           in a new VM placement.
         """
-        migrate_actions = (
-            a for a in self.solution.actions if a[
-                'action_type'] == self.MIGRATION)
-        instance_to_be_migrated = (
-            a['input_parameters']['resource_id'] for a in migrate_actions)
-        instance_uuids = list(set(instance_to_be_migrated))
-        for instance_uuid in instance_uuids:
-            actions = list(
-                a for a in self.solution.actions if a[
-                    'input_parameters'][
-                        'resource_id'] == instance_uuid)
-            if len(actions) > 1:
-                src_uuid = actions[0]['input_parameters']['source_node']
-                dst_uuid = actions[-1]['input_parameters']['destination_node']
-                for a in actions:
-                    self.solution.actions.remove(a)
-                    self.number_of_migrations -= 1
-                src_node = self.compute_model.get_node_by_uuid(src_uuid)
-                dst_node = self.compute_model.get_node_by_uuid(dst_uuid)
-                instance = self.compute_model.get_instance_by_uuid(
-                    instance_uuid)
-                if self.compute_model.migrate_instance(
-                        instance, dst_node, src_node):
-                    self.add_migration(instance, src_node, dst_node)
+        # The model already holds the final placement of the instances, only
+        # the actions leading to it are simplified
+        self.number_of_migrations -= self.solution.collapse_chains(
+            self.MIGRATION)
 
     def offload_phase(self, cc):
         """Perform offloading phase.
@@ -536,6 +581,8 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
         sorted_nodes = sorted(
             self.compute_model.get_all_compute_nodes().values(),
             key=lambda x: self.get_node_utilization(x)['cpu'])
+        positions = {node.uuid: i for i, node in enumerate(sorted_nodes)}
+        index = self.get_first_fit_index(sorted_nodes, cc)
         for node in reversed(sorted_nodes):
             if self.is_overloaded(node, cc):
                 for instance in sorted(
@@ -543,12 +590,12 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
                         key=lambda x: self.get_instance_utilization(
                             x)['cpu']
                 ):
-                    for destination_node in reversed(sorted_nodes):
-                        if self.instance_fits(
-                                instance, destination_node, cc):
-                            self.add_migration(instance, node,
-                                               destination_node)
-                            break
+                    position = self.find_destination(index, instance, cc)
+                    if position is not None:
+                        self.add_migration(instance, node,
+                                           sorted_nodes[position])
+                        index.update(positions[node.uuid])
+                        index.update(position)
                     if not self.is_overloaded(node, cc):
                         break
 
@@ -569,23 +616,20 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
         sorted_nodes = sorted(
             self.compute_model.get_all_compute_nodes().values(),
             key=lambda x: self.get_node_utilization(x)['cpu'])
-        asc = 0
-        for node in sorted_nodes:
+        index = self.get_first_fit_index(sorted_nodes, cc)
+        for asc, node in enumerate(sorted_nodes):
             instances = sorted(
                 self.compute_model.get_node_instances(node),
                 key=lambda x: self.get_instance_utilization(x)['cpu'])
             for instance in reversed(instances):
-                dsc = len(sorted_nodes) - 1
-                for destination_node in reversed(sorted_nodes):
-                    if asc >= dsc:
-                        break
-                    if self.instance_fits(
-                            instance, destination_node, cc):
-                        self.add_migration(instance, node,
-                                           destination_node)
-                        break
-                    dsc -= 1
-            asc += 1
+                # Only the nodes more utilized than this one are considered
+                position = self.find_destination(
+                    index, instance, cc, first=asc + 1)
+                if position is not None:
+                    self.add_migration(instance, node,
+                                       sorted_nodes[position])
+                    index.update(asc)
+                    index.update(position)
 
     def pre_execute(self):
         if not self.compute_model:
@@ -594,7 +638,7 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
         if self.compute_model.stale:
             raise exception.ClusterStateStale()
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
 
     def do_execute(self):
         """Execute strategy.
@@ -648,4 +692,4 @@ class VMWorkloadConsolidation(base.ServerConsolidationBaseStrategy):
             instance_migrations_count=self.number_of_migrations,
         )
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
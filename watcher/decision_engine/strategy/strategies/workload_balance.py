@@ -56,6 +56,7 @@ from watcher._i18n import _
 from watcher.common import exception as wexc
 from watcher.datasource import ceilometer as ceil
 from watcher.datasource import gnocchi as gnoc
+from watcher.decision_engine.model import base as model_base
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -182,16 +183,8 @@ class WorkloadBalance(base.WorkloadStabilizationBaseStrategy):
 
     def calculate_used_resource(self, node):
         """Calculate the used vcpus, memory and disk based on VM flavors"""
-        instances = self.compute_model.get_node_instances(node)
-        vcpus_used = 0
-        memory_mb_used = 0
-        disk_gb_used = 0
-        for instance in instances:
-            vcpus_used += instance.vcpus
-            memory_mb_used += instance.memory
-            disk_gb_used += instance.disk
-
-        return vcpus_used, memory_mb_used, disk_gb_used
+        used = self.compute_model.get_node_used_resources(node)
+        return used['vcpus'], used['memory'], used['disk']
 
     def choose_instance_to_migrate(self, hosts, avg_workload, workload_cache):
         """Pick up an active instance instance to migrate from provided hosts
@@ -262,6 +255,39 @@ class WorkloadBalance(base.WorkloadStabilizationBaseStrategy):
 
         return destination_hosts
 
+    def get_instances_cpu_util(self, instance_uuids):
+        """Get the cpu_util of many instances in a single batch query
+
+        :param instance_uuids: UUIDs of the instances
+        :return: dict mapping each instance UUID to its cpu_util, or to None
+                 if it could not be retrieved
+        """
+        aggregations = {}
+        try:
+            if self.config.datasource == "ceilometer":
+                aggregations = self.ceilometer.statistic_aggregations(
+                    resource_ids=instance_uuids,
+                    meter_names=[self._meter],
+                    period=self._period,
+                    aggregate='avg')
+            elif self.config.datasource == "gnocchi":
+                stop_time = datetime.datetime.utcnow()
+                start_time = stop_time - datetime.timedelta(
+                    seconds=int(self._period))
+                aggregations = self.gnocchi.statistic_aggregations(
+                    resource_ids=instance_uuids,
+                    metrics=[self._meter],
+                    granularity=self.granularity,
+                    start_time=start_time,
+                    stop_time=stop_time,
+                    aggregation='mean')
+        except Exception as exc:
+            LOG.exception(exc)
+            LOG.error("Can not get cpu_util from %s",
+                      self.config.datasource)
+        return {instance_id: aggregations.get(instance_id, {}).get(self._meter)
+                for instance_id in instance_uuids}
+
     def group_hosts_by_cpu_util(self):
         """Calculate the workloads of each node
 
@@ -281,36 +307,19 @@ class WorkloadBalance(base.WorkloadStabilizationBaseStrategy):
         cluster_workload = 0.0
         # use workload_cache to store the workload of VMs for reuse purpose
         workload_cache = {}
+        nodes_instances = {
+            node_id: self.compute_model.get_node_instances(
+                self.compute_model.get_node_by_uuid(node_id))
+            for node_id in nodes}
+        instances_cpu_util = self.get_instances_cpu_util(
+            [instance.uuid for instances in nodes_instances.values()
+             for instance in instances])
         for node_id in nodes:
             node = self.compute_model.get_node_by_uuid(node_id)
-            instances = self.compute_model.get_node_instances(node)
+            instances = nodes_instances[node_id]
             node_workload = 0.0
             for instance in instances:
-                cpu_util = None
-                try:
-                    if self.config.datasource == "ceilometer":
-                        cpu_util = self.ceilometer.statistic_aggregation(
-                            resource_id=instance.uuid,
-                            meter_name=self._meter,
-                            period=self._period,
-                            aggregate='avg')
-                    elif self.config.datasource == "gnocchi":
-                        stop_time = datetime.datetime.utcnow()
-                        start_time = stop_time - datetime.timedelta(
-                            seconds=int(self._period))
-                        cpu_util = self.gnocchi.statistic_aggregation(
-                            resource_id=instance.uuid,
-                            metric=self._meter,
-                            granularity=self.granularity,
-                            start_time=start_time,
-                            stop_time=stop_time,
-                            aggregation='mean'
-                        )
-                except Exception as exc:
-                    LOG.exception(exc)
-                    LOG.error("Can not get cpu_util from %s",
-                              self.config.datasource)
-                    continue
+                cpu_util = instances_cpu_util[instance.uuid]
                 if cpu_util is None:
                     LOG.debug("Instance (%s): cpu_util is None", instance.uuid)
                     continue
@@ -347,7 +356,7 @@ class WorkloadBalance(base.WorkloadStabilizationBaseStrategy):
         if self.compute_model.stale:
             raise wexc.ClusterStateStale()
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
 
     def do_execute(self):
         """Strategy execution phase
@@ -411,4 +420,4 @@ class WorkloadBalance(base.WorkloadStabilizationBaseStrategy):
         """
         self.solution.model = self.compute_model
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
@@ -43,6 +43,7 @@ from watcher._i18n import _
 from watcher.common import exception
 from watcher.datasource import ceilometer as ceil
 from watcher.datasource import gnocchi as gnoc
+from watcher.decision_engine.model import base as model_base
 from watcher.decision_engine.model import element
 from watcher.decision_engine.strategy.strategies import base
 
@@ -59,6 +60,83 @@ def _set_memoize(conf):
                                                      'cache')
 
 
+class MigrationSimulator(object):
+    """Simulate migrations on the load of the hosts
+
+    The normalized load of each host is kept along with, for each metric,
+    the sum and the sum of squares of the loads of all the hosts. The
+    standard deviation resulting from moving some load from a host to
+    another is then computed in constant time instead of being recomputed
+    over all the hosts.
+    """
+
+    def __init__(self, hosts, metrics, normalizers):
+        """Simulate migrations on the load of the hosts
+
+        :param hosts: hosts with their workload
+        :param metrics: metrics whose standard deviation is computed
+        :param normalizers: dict mapping each host to the factors its load
+            is divided by, per metric, to be normalized
+        """
+        self.metrics = metrics
+        self.normalizers = normalizers
+        self.size = len(hosts)
+        self.loads = {}
+        # The loads are shifted by their mean so the variance does not
+        # suffer from the cancellation of large sums
+        self.shifts = {}
+        self.sums = {}
+        self.squares = {}
+        for metric in metrics:
+            loads = {host_id: host[metric] / self._normalizer(host_id, metric)
+                     for host_id, host in hosts.items()}
+            shift = sum(loads.values()) / self.size
+            self.loads[metric] = loads
+            self.shifts[metric] = shift
+            self.sums[metric] = sum(load - shift for load in loads.values())
+            self.squares[metric] = sum(
+                (load - shift) ** 2 for load in loads.values())
+
+    def _normalizer(self, host_id, metric):
+        return self.normalizers.get(host_id, {}).get(metric, 1)
+
+    def _sd(self, total, squares):
+        variance = (squares - total ** 2 / self.size) / self.size
+        return math.sqrt(max(variance, 0))
+
+    def get_sd(self, metric):
+        """Get standard deviation among hosts by specified meter"""
+        return self._sd(self.sums[metric], self.squares[metric])
+
+    def simulate(self, src_host_id, dst_host_id, src_loads, dst_loads):
+        """Simulate moving some load from a host to another
+
+        :param src_host_id: the UUID of the source host
+        :param dst_host_id: the UUID of the destination host
+        :param src_loads: dict of the load removed from the source host,
+            per metric
+        :param dst_loads: dict of the load added to the destination host,
+            per metric
+        :return: list of the resulting standard deviation of each metric
+        """
+        migration_case = []
+        for metric in self.metrics:
+            loads = self.loads[metric]
+            shift = self.shifts[metric]
+            src_old = loads[src_host_id] - shift
+            dst_old = loads[dst_host_id] - shift
+            src_new = src_old - (
+                src_loads[metric] / self._normalizer(src_host_id, metric))
+            dst_new = dst_old + (
+                dst_loads[metric] / self._normalizer(dst_host_id, metric))
+            total = self.sums[metric] + src_new - src_old + dst_new - dst_old
+            squares = (self.squares[metric] +
+                       src_new ** 2 - src_old ** 2 +
+                       dst_new ** 2 - dst_old ** 2)
+            migration_case.append(self._sd(total, squares))
+        return migration_case
+
+
 class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
     """Workload Stabilization control using live migration"""
 
@@ -217,6 +295,23 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
         return (instance_load['cpu_util'] *
                 (instance_load['vcpus'] / float(host_vcpus)))
 
+    def get_instance_host_load(self, instance_load, host_vcpus):
+        """Get the load an instance puts on a host, per metric
+
+        :param instance_load: dict that contains instance uuid and
+            utilization info.
+        :param host_vcpus: int
+        :return: dict
+        """
+        host_load = {}
+        for metric in self.metrics:
+            if metric == 'cpu_util':
+                host_load[metric] = self.transform_instance_cpu(
+                    instance_load, host_vcpus)
+            else:
+                host_load[metric] = instance_load[metric]
+        return host_load
+
     @MEMOIZE
     def get_instance_load(self, instance):
         """Gathering instance load through ceilometer/gnocchi statistic.
@@ -258,12 +353,25 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
             instance_load[meter] = avg_meter
         return instance_load
 
+    def get_hosts_normalizers(self, hosts):
+        """Get the factors the load of each host is divided by
+
+        :param hosts: hosts with their workload
+        :return: dict mapping each host to its factors, per metric
+        """
+        normalizers = {}
+        for host in hosts:
+            normalizers[host] = {}
+            if 'memory.resident' in hosts[host]:
+                node = self.compute_model.get_node_by_uuid(host)
+                normalizers[host]['memory.resident'] = float(node.memory)
+        return normalizers
+
     def normalize_hosts_load(self, hosts):
         normalized_hosts = copy.deepcopy(hosts)
-        for host in normalized_hosts:
-            if 'memory.resident' in normalized_hosts[host]:
-                node = self.compute_model.get_node_by_uuid(host)
-                normalized_hosts[host]['memory.resident'] /= float(node.memory)
+        for host, normalizers in self.get_hosts_normalizers(hosts).items():
+            for metric, normalizer in normalizers.items():
+                normalized_hosts[host][metric] /= normalizer
 
         return normalized_hosts
 
@@ -273,40 +381,54 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
                 if node.state == element.ServiceState.ONLINE.value and
                 node.status == element.ServiceState.ENABLED.value}
 
+    def get_nodes_meter(self, resource_ids, meter_name):
+        """Get the average of a meter for many nodes in a single batch query
+
+        :param resource_ids: ids of the node resources
+        :param meter_name: name of the meter
+        :return: dict mapping each resource id to its average meter value,
+                 or to None if there is no data
+        """
+        aggregations = {}
+        if self.config.datasource == "ceilometer":
+            aggregations = self.ceilometer.statistic_aggregations(
+                resource_ids=resource_ids,
+                meter_names=[meter_name],
+                period=self.periods['node'],
+                aggregate='avg'
+            )
+        elif self.config.datasource == "gnocchi":
+            stop_time = datetime.datetime.utcnow()
+            start_time = stop_time - datetime.timedelta(
+                seconds=int(self.periods['node']))
+            aggregations = self.gnocchi.statistic_aggregations(
+                resource_ids=resource_ids,
+                metrics=[meter_name],
+                granularity=self.granularity,
+                start_time=start_time,
+                stop_time=stop_time,
+                aggregation='mean'
+            )
+        return {resource_id: aggregations.get(resource_id, {}).get(meter_name)
+                for resource_id in resource_ids}
+
     def get_hosts_load(self):
         """Get load of every available host by gathering instances load"""
-        hosts_load = {}
-        for node_id, node in self.get_available_nodes().items():
-            hosts_load[node_id] = {}
-            hosts_load[node_id]['vcpus'] = node.vcpus
-            for metric in self.metrics:
-                resource_id = ''
-                avg_meter = None
-                meter_name = self.instance_metrics[metric]
-                if re.match('^compute.node', meter_name) is not None:
-                    resource_id = "%s_%s" % (node.uuid, node.hostname)
-                else:
-                    resource_id = node_id
-                if self.config.datasource == "ceilometer":
-                    avg_meter = self.ceilometer.statistic_aggregation(
-                        resource_id=resource_id,
-                        meter_name=self.instance_metrics[metric],
-                        period=self.periods['node'],
-                        aggregate='avg'
-                    )
-                elif self.config.datasource == "gnocchi":
-                    stop_time = datetime.datetime.utcnow()
-                    start_time = stop_time - datetime.timedelta(
-                        seconds=int(self.periods['node']))
-                    avg_meter = self.gnocchi.statistic_aggregation(
-                        resource_id=resource_id,
-                        metric=self.instance_metrics[metric],
-                        granularity=self.granularity,
-                        start_time=start_time,
-                        stop_time=stop_time,
-                        aggregation='mean'
-                    )
-
+        nodes = self.get_available_nodes()
+        hosts_load = {node_id: {'vcpus': node.vcpus}
+                      for node_id, node in nodes.items()}
+        for metric in self.metrics:
+            meter_name = self.instance_metrics[metric]
+            if re.match('^compute.node', meter_name) is not None:
+                resource_ids = {
+                    node_id: "%s_%s" % (node.uuid, node.hostname)
+                    for node_id, node in nodes.items()}
+            else:
+                resource_ids = {node_id: node_id for node_id in nodes}
+            avg_meters = self.get_nodes_meter(
+                list(resource_ids.values()), meter_name)
+            for node_id, node in nodes.items():
+                avg_meter = avg_meters[resource_ids[node_id]]
                 if avg_meter is None:
                     if meter_name == 'hardware.memory.used':
                         avg_meter = node.memory
@@ -360,19 +482,18 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
         :return: list of standard deviation values
         """
         migration_case = []
-        new_hosts = copy.deepcopy(hosts)
+        # Only the loads of the source and destination hosts change
+        new_hosts = dict(hosts)
+        new_hosts[src_node.uuid] = dict(hosts[src_node.uuid])
+        new_hosts[dst_node.uuid] = dict(hosts[dst_node.uuid])
         instance_load = self.get_instance_load(instance)
-        s_host_vcpus = new_hosts[src_node.uuid]['vcpus']
-        d_host_vcpus = new_hosts[dst_node.uuid]['vcpus']
+        src_loads = self.get_instance_host_load(
+            instance_load, new_hosts[src_node.uuid]['vcpus'])
+        dst_loads = self.get_instance_host_load(
+            instance_load, new_hosts[dst_node.uuid]['vcpus'])
         for metric in self.metrics:
-            if metric is 'cpu_util':
-                new_hosts[src_node.uuid][metric] -= (
-                    self.transform_instance_cpu(instance_load, s_host_vcpus))
-                new_hosts[dst_node.uuid][metric] += (
-                    self.transform_instance_cpu(instance_load, d_host_vcpus))
-            else:
-                new_hosts[src_node.uuid][metric] -= instance_load[metric]
-                new_hosts[dst_node.uuid][metric] += instance_load[metric]
+            new_hosts[src_node.uuid][metric] -= src_loads[metric]
+            new_hosts[dst_node.uuid][metric] += dst_loads[metric]
         normalized_hosts = self.normalize_hosts_load(new_hosts)
         for metric in self.metrics:
             migration_case.append(self.get_sd(normalized_hosts, metric))
@@ -394,6 +515,8 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
 
         instance_host_map = []
         nodes = list(self.get_available_nodes())
+        simulator = MigrationSimulator(
+            hosts, self.metrics, self.get_hosts_normalizers(hosts))
         for src_host in nodes:
             src_node = self.compute_model.get_node_by_uuid(src_host)
             c_nodes = copy.copy(nodes)
@@ -404,16 +527,20 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
                 if instance.state not in [element.InstanceState.ACTIVE.value,
                                           element.InstanceState.PAUSED.value]:
                     continue
+                instance_load = self.get_instance_load(instance)
+                src_loads = self.get_instance_host_load(
+                    instance_load, hosts[src_host]['vcpus'])
                 for dst_host in next(node_list):
-                    dst_node = self.compute_model.get_node_by_uuid(dst_host)
-                    sd_case = self.calculate_migration_case(
-                        hosts, instance, src_node, dst_node)
+                    dst_loads = self.get_instance_host_load(
+                        instance_load, hosts[dst_host]['vcpus'])
+                    sd_case = simulator.simulate(
+                        src_host, dst_host, src_loads, dst_loads)
 
-                    weighted_sd = self.calculate_weighted_sd(sd_case[:-1])
+                    weighted_sd = self.calculate_weighted_sd(sd_case)
 
                     if weighted_sd < min_sd_case['value']:
                         min_sd_case = {
-                            'host': dst_node.uuid, 'value': weighted_sd,
+                            'host': dst_host, 'value': weighted_sd,
                             's_host': src_node.uuid, 'instance': instance.uuid}
                         instance_host_map.append(min_sd_case)
         return sorted(instance_host_map, key=lambda x: x['value'])
@@ -517,4 +644,4 @@ class WorkloadStabilization(base.WorkloadStabilizationBaseStrategy):
         """
         self.fill_solution()
 
-        LOG.debug(self.compute_model.to_string())
+        LOG.debug(model_base.ModelDump(self.compute_model))
@@ -179,30 +179,60 @@ class ActionDeleteNotification(notificationbase.NotificationBase):
 
 
 def _get_action_plan_payload(action):
-    action_plan = None
-    strategy_uuid = None
-    audit = None
     try:
         action_plan = action.action_plan
-        audit = objects.Audit.get(wcontext.make_context(show_deleted=True),
-                                  action_plan.audit_id)
-        if audit.strategy_id:
-            strategy_uuid = objects.Strategy.get(
-                wcontext.make_context(show_deleted=True),
-                audit.strategy_id).uuid
     except NotImplementedError:
         raise exception.EagerlyLoadedActionRequired(action=action.uuid)
 
+    return get_action_plan_payload(action_plan)
+
+
+def get_action_plan_payload(action_plan):
+    """Build the action plan payload of the notifications of its actions
+
+    The audit and the strategy already loaded alongside the action plan are
+    used as they are, so the payload can be built once and shared by the
+    notifications of all the actions of the action plan. Otherwise the audit
+    is loaded, as its strategy may change, and the UUID of the strategy is
+    looked up once per process.
+    """
+    if action_plan.obj_attr_is_set('audit') and action_plan.audit:
+        audit = action_plan.audit
+    else:
+        audit = objects.Audit.get(wcontext.make_context(show_deleted=True),
+                                  action_plan.audit_id)
+    audit_uuid = audit.uuid
+    audit_strategy_id = audit.strategy_id
+
+    strategy_uuid = None
+    if audit_strategy_id:
+        if (action_plan.obj_attr_is_set('strategy') and
+                action_plan.strategy and
+                action_plan.strategy.id == audit_strategy_id):
+            strategy_uuid = action_plan.strategy.uuid
+        else:
+            strategy_uuid = notificationbase.lookup_uuid(
+                objects.Strategy, audit_strategy_id)
+
     action_plan_payload = ap_notifications.TerseActionPlanPayload(
         action_plan=action_plan,
-        audit_uuid=audit.uuid, strategy_uuid=strategy_uuid)
+        audit_uuid=audit_uuid, strategy_uuid=strategy_uuid)
 
     return action_plan_payload
 
 
-def send_create(context, action, service='infra-optim', host=None):
-    """Emit an action.create notification."""
-    action_plan_payload = _get_action_plan_payload(action)
+def send_create(context, action, service='infra-optim', host=None,
+                action_plan_payload=None):
+    """Emit an action.create notification.
+
+    :param action_plan_payload: payload of the action plan of the action, see
+                                :py:func:`get_action_plan_payload`
+    """
+    if not notificationbase.should_notify():
+        return
+
+    if action_plan_payload is None:
+        action_plan_payload = _get_action_plan_payload(action)
 
     versioned_payload = ActionCreatePayload(
         action=action,
@@ -225,6 +255,9 @@ def send_create(context, action, service='infra-optim', host=None):
 def send_update(context, action, service='infra-optim',
                 host=None, old_state=None):
     """Emit an action.update notification."""
+    if not notificationbase.should_notify():
+        return
+
     action_plan_payload = _get_action_plan_payload(action)
 
     state_update = ActionStateUpdatePayload(
@@ -252,6 +285,9 @@ def send_update(context, action, service='infra-optim',
 
 def send_delete(context, action, service='infra-optim', host=None):
     """Emit an action.delete notification."""
+    if not notificationbase.should_notify():
+        return
+
     action_plan_payload = _get_action_plan_payload(action)
 
     versioned_payload = ActionDeletePayload(
@@ -276,6 +312,9 @@ def send_execution_notification(context, action, notification_action, phase,
                                 priority=wfields.NotificationPriority.INFO,
                                 service='infra-optim', host=None):
     """Emit an action execution notification."""
+    if not notificationbase.should_notify(priority):
+        return
+
     action_plan_payload = _get_action_plan_payload(action)
 
     fault = None
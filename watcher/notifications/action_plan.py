@@ -18,7 +18,6 @@
 
 from oslo_config import cfg
 
-from watcher.common import context as wcontext
 from watcher.common import exception
 from watcher.notifications import audit as audit_notifications
 from watcher.notifications import base as notificationbase
@@ -223,10 +222,9 @@ def _get_common_payload(action_plan):
         raise exception.EagerlyLoadedActionPlanRequired(
             action_plan=action_plan.uuid)
 
-    goal = objects.Goal.get(
-        wcontext.make_context(show_deleted=True), audit.goal_id)
+    goal_uuid = notificationbase.lookup_uuid(objects.Goal, audit.goal_id)
     audit_payload = audit_notifications.TerseAuditPayload(
-        audit=audit, goal_uuid=goal.uuid)
+        audit=audit, goal_uuid=goal_uuid)
 
     strategy_payload = strategy_notifications.StrategyPayload(
         strategy=strategy)
@@ -236,6 +234,9 @@ def _get_common_payload(action_plan):
 
 def send_create(context, action_plan, service='infra-optim', host=None):
     """Emit an action_plan.create notification."""
+    if not notificationbase.should_notify():
+        return
+
     audit_payload, strategy_payload = _get_common_payload(action_plan)
 
     versioned_payload = ActionPlanCreatePayload(
@@ -260,6 +261,9 @@ def send_create(context, action_plan, service='infra-optim', host=None):
 def send_update(context, action_plan, service='infra-optim',
                 host=None, old_state=None):
     """Emit an action_plan.update notification."""
+    if not notificationbase.should_notify():
+        return
+
     audit_payload, strategy_payload = _get_common_payload(action_plan)
 
     state_update = ActionPlanStateUpdatePayload(
@@ -288,6 +292,9 @@ def send_update(context, action_plan, service='infra-optim',
 
 def send_delete(context, action_plan, service='infra-optim', host=None):
     """Emit an action_plan.delete notification."""
+    if not notificationbase.should_notify():
+        return
+
     audit_payload, strategy_payload = _get_common_payload(action_plan)
 
     versioned_payload = ActionPlanDeletePayload(
@@ -313,6 +320,9 @@ def send_action_notification(context, action_plan, action, phase=None,
                              priority=wfields.NotificationPriority.INFO,
                              service='infra-optim', host=None):
     """Emit an action_plan action notification."""
+    if not notificationbase.should_notify(priority):
+        return
+
     audit_payload, strategy_payload = _get_common_payload(action_plan)
 
     fault = None
@@ -265,6 +265,9 @@ def _get_common_payload(audit):
 
 def send_create(context, audit, service='infra-optim', host=None):
     """Emit an audit.create notification."""
+    if not notificationbase.should_notify():
+        return
+
     goal_payload, strategy_payload = _get_common_payload(audit)
 
     versioned_payload = AuditCreatePayload(
@@ -289,6 +292,9 @@ def send_create(context, audit, service='infra-optim', host=None):
 def send_update(context, audit, service='infra-optim',
                 host=None, old_state=None):
     """Emit an audit.update notification."""
+    if not notificationbase.should_notify():
+        return
+
     goal_payload, strategy_payload = _get_common_payload(audit)
 
     state_update = AuditStateUpdatePayload(
@@ -316,6 +322,9 @@ def send_update(context, audit, service='infra-optim',
 
 
 def send_delete(context, audit, service='infra-optim', host=None):
+    if not notificationbase.should_notify():
+        return
+
     goal_payload, strategy_payload = _get_common_payload(audit)
 
     versioned_payload = AuditDeletePayload(
@@ -341,6 +350,9 @@ def send_action_notification(context, audit, action, phase=None,
                              priority=wfields.NotificationPriority.INFO,
                              service='infra-optim', host=None):
     """Emit an audit action notification."""
+    if not notificationbase.should_notify(priority):
+        return
+
     goal_payload, strategy_payload = _get_common_payload(audit)
 
     fault = None
@@ -12,9 +12,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 from oslo_config import cfg
 from oslo_log import log
 
+from watcher.common import context as wcontext
 from watcher.common import exception
 from watcher.common import rpc
 from watcher.objects import base
@@ -32,6 +35,59 @@ NOTIFY_LEVELS = {
     wfields.NotificationPriority.CRITICAL: 4
 }
 
+# Maximum number of objects whose UUID is cached
+LOOKUP_CACHE_SIZE = 1000
+
+_lookup_cache = {}
+_lookup_lock = threading.Lock()
+
+
+def should_notify(priority=wfields.NotificationPriority.INFO):
+    """Determine whether notifications of the given priority are sent.
+
+    A notification is sent when the level of the notification is
+    greater than or equal to the level specified in the
+    configuration, in the increasing order of DEBUG, INFO, WARNING,
+    ERROR, CRITICAL. It is checked before building a notification so no
+    payload is built nor related object loaded for nothing.
+    :param priority: the priority of the notification
+    :return: True if notification should be sent, False otherwise.
+    """
+    if not CONF.notification_level:
+        return False
+    return NOTIFY_LEVELS[priority] >= NOTIFY_LEVELS[CONF.notification_level]
+
+
+def lookup_uuid(obj_cls, obj_id):
+    """Get the UUID of an object, given its ID.
+
+    The notifications refer to the audit, goal or strategy of the notified
+    object by their UUID, which never changes once the object is created.
+    It is cached for the whole process instead of being loaded from the DB
+    for each notification. The other fields, e.g. the strategy of an audit,
+    may change and must be read from the object itself.
+
+    :param obj_cls: the class of the object, e.g. :py:class:`~.Goal`
+    :param obj_id: the ID of the object
+    :return: the UUID of the object
+    """
+    key = (obj_cls.obj_name(), obj_id)
+    with _lookup_lock:
+        uuid = _lookup_cache.get(key)
+    if uuid is None:
+        uuid = obj_cls.get(
+            wcontext.make_context(show_deleted=True), obj_id).uuid
+        with _lookup_lock:
+            if len(_lookup_cache) >= LOOKUP_CACHE_SIZE:
+                _lookup_cache.clear()
+            _lookup_cache[key] = uuid
+    return uuid
+
+
+def clear_lookup_cache():
+    with _lookup_lock:
+        _lookup_cache.clear()
+
 
 @base.WatcherObjectRegistry.register_if(False)
 class NotificationObject(base.WatcherObject):
@@ -166,10 +222,7 @@ class NotificationBase(NotificationObject):
         ERROR, CRITICAL.
         :return: True if notification should be sent, False otherwise.
         """
-        if not CONF.notification_level:
-            return False
-        return (NOTIFY_LEVELS[self.priority] >=
-                NOTIFY_LEVELS[CONF.notification_level])
+        return should_notify(self.priority)
 
     def _emit(self, context, event_type, publisher_id, payload):
         notifier = rpc.get_notifier(publisher_id)
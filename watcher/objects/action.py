@@ -138,6 +138,49 @@ class Action(base.WatcherPersistentObject, base.WatcherObject,
 
         notifications.action.send_create(self.obj_context, self)
 
+    @classmethod
+    def bulk_create(cls, context, actions, action_plans=None):
+        """Create several :class:`Action` records in the DB at once.
+
+        The actions are inserted in a single transaction and their action
+        plan is only loaded once, as is the part of the notifications related
+        to it.
+
+        :param context: Security context
+        :param actions: the :class:`Action` objects to create
+        :param action_plans: the already loaded :class:`ActionPlan` objects
+                             of the actions, the other action plans being
+                             loaded from the DB
+        :returns: the created :class:`Action` objects
+        """
+        db_actions = cls.dbapi.create_actions(
+            [action.obj_get_changes() for action in actions])
+
+        action_plans = {action_plan.id: action_plan
+                        for action_plan in action_plans or []}
+        action_plan_payloads = {}
+        for action, db_action in zip(actions, db_actions):
+            cls._from_db_object(action, db_action)
+            action_plan = action_plans.get(action.action_plan_id)
+            if action_plan is None:
+                action_plan = objects.ActionPlan.get(
+                    context, action.action_plan_id)
+                action_plans[action_plan.id] = action_plan
+            action.action_plan = action_plan
+            action.obj_reset_changes(['action_plan'])
+
+            if not notifications.base.should_notify():
+                continue
+            if action_plan.id not in action_plan_payloads:
+                action_plan_payloads[action_plan.id] = (
+                    notifications.action.get_action_plan_payload(
+                        action_plan))
+            notifications.action.send_create(
+                context, action,
+                action_plan_payload=action_plan_payloads[action_plan.id])
+
+        return actions
+
     def destroy(self):
         """Delete the Action from the DB"""
         self.dbapi.destroy_action(self.uuid)
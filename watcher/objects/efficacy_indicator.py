@@ -121,6 +121,22 @@ class EfficacyIndicator(base.WatcherPersistentObject, base.WatcherObject,
         db_efficacy_indicator = self.dbapi.create_efficacy_indicator(values)
         self._from_db_object(self, db_efficacy_indicator)
 
+    @classmethod
+    def bulk_create(cls, context, efficacy_indicators):
+        """Create several EfficacyIndicator records in a single transaction.
+
+        :param context: Security context
+        :param efficacy_indicators: the :class:`EfficacyIndicator` objects
+                                    to create
+        :returns: the created :class:`EfficacyIndicator` objects
+        """
+        db_efficacy_indicators = cls.dbapi.create_efficacy_indicators(
+            [indicator.obj_get_changes() for indicator in efficacy_indicators])
+        for indicator, db_indicator in zip(efficacy_indicators,
+                                           db_efficacy_indicators):
+            cls._from_db_object(indicator, db_indicator)
+        return efficacy_indicators
+
     def destroy(self, context=None):
         """Delete the EfficacyIndicator from the DB.
 
@@ -19,6 +19,7 @@
 import eventlet
 import mock
 
+from watcher.applier.workflow_engine import base as wbase
 from watcher.applier.workflow_engine import default as tflow
 from watcher import objects
 from watcher.tests.db import base
@@ -77,3 +78,91 @@ class TestTaskFlowActionContainer(base.DbTestCase):
         mock_eventlet_spawn.return_value = et
         action_container.execute()
         et.kill.assert_called_with()
+
+    def test_execute_without_polling(self):
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, audit_id=self.audit.id,
+            strategy_id=self.strategy.id,
+            state=objects.action.State.ONGOING)
+        action = obj_utils.create_test_action(
+            self.context, action_plan_id=action_plan.id,
+            state=objects.action.State.ONGOING,
+            action_type='sleep',
+            input_parameters={'duration': 0.1})
+        action_container = tflow.TaskFlowActionContainer(
+            db_action=action,
+            engine=self.engine)
+
+        with mock.patch.object(
+            objects.ActionPlan, 'get_by_id',
+            wraps=objects.ActionPlan.get_by_id
+        ) as m_get_action_plan:
+            action_container.pre_execute()
+            action_container.execute()
+
+        # The action plan is loaded once, the end of the action being
+        # notified by its execution thread
+        self.assertEqual(1, m_get_action_plan.call_count)
+        self.assertEqual(
+            objects.action.State.SUCCEEDED,
+            objects.Action.get_by_uuid(self.context, action.uuid).state)
+
+    def test_action_plan_watcher_reload_interval(self):
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, audit_id=self.audit.id,
+            strategy_id=self.strategy.id,
+            state=objects.action_plan.State.ONGOING)
+        watcher = self.engine.get_action_plan_watcher(action_plan.id)
+        self.assertIs(
+            watcher, self.engine.get_action_plan_watcher(action_plan.id))
+
+        with mock.patch.object(
+            objects.ActionPlan, 'get_by_id',
+            wraps=objects.ActionPlan.get_by_id
+        ) as m_get_action_plan, mock.patch('time.time') as m_time:
+            m_time.return_value = 100
+            self.assertFalse(watcher.is_cancelled())
+            self.assertFalse(watcher.is_cancelled())
+            self.assertEqual(1, m_get_action_plan.call_count)
+
+            action_plan.state = objects.action_plan.State.CANCELLING
+            action_plan.save()
+            self.assertFalse(watcher.is_cancelled())
+            m_time.return_value = 101
+            self.assertTrue(watcher.is_cancelled())
+            self.assertEqual(2, m_get_action_plan.call_count)
+
+            # A cancelled action plan is not reloaded anymore
+            m_time.return_value = 102
+            self.assertTrue(watcher.is_cancelled())
+            self.assertEqual(2, m_get_action_plan.call_count)
+
+    def test_action_plan_watcher_wait_cancelled(self):
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, audit_id=self.audit.id,
+            strategy_id=self.strategy.id,
+            state=objects.action_plan.State.ONGOING)
+        watcher = wbase.ActionPlanWatcher(
+            self.context, action_plan.id, interval=0.01)
+        thread = eventlet.spawn(eventlet.sleep, 60)
+        self.addCleanup(thread.kill)
+
+        def cancel():
+            action_plan.state = objects.action_plan.State.CANCELLING
+            action_plan.save()
+        eventlet.spawn_after(0.05, cancel)
+
+        self.assertFalse(watcher.wait(thread))
+        # The actions started afterwards do not wait at all
+        thread = eventlet.spawn(eventlet.sleep, 60)
+        self.addCleanup(thread.kill)
+        self.assertFalse(watcher.wait(thread))
+
+    def test_action_plan_watcher_wait_finished(self):
+        action_plan = obj_utils.create_test_action_plan(
+            self.context, audit_id=self.audit.id,
+            strategy_id=self.strategy.id,
+            state=objects.action_plan.State.ONGOING)
+        watcher = wbase.ActionPlanWatcher(self.context, action_plan.id)
+
+        self.assertTrue(watcher.wait(eventlet.spawn(eventlet.sleep, 0.01)))
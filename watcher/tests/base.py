@@ -25,8 +25,12 @@ import pecan
 from pecan import testing
 import testscenarios
 
+from watcher.common import cinder_helper
+from watcher.common import clients
 from watcher.common import context as watcher_context
+from watcher.common.loader import default as loader_default
 from watcher.common import service
+from watcher.notifications import base as notifications_base
 from watcher.objects import base as objects_base
 from watcher.tests import conf_fixture
 from watcher.tests import policy_fixture
@@ -112,6 +116,10 @@ class TestCase(BaseTestCase):
 
     def _reset_singletons(self):
         service.Singleton._instances.clear()
+        notifications_base.clear_lookup_cache()
+        cinder_helper.reset_cache()
+        clients.reset_shared_clients()
+        loader_default.reset_cache()
 
         def reset_pecan():
             pecan.set_config({}, overwrite=True)
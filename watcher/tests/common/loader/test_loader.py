@@ -103,3 +103,51 @@ class TestLoader(base.TestCase):
 
         self.assertEqual(
             "fake_with_opts", loaded_driver.config.test_opt)
+
+    def test_load_loadable_cached(self):
+        fake_driver = drivermanager.DriverManager.make_test_instance(
+            extension=stevedore_extension.Extension(
+                name="fake",
+                entry_point="%s:%s" % (FakeLoadableWithOpts.__module__,
+                                       FakeLoadableWithOpts.__name__),
+                plugin=FakeLoadableWithOpts,
+                obj=None),
+            namespace="TESTING")
+
+        with mock.patch.object(drivermanager,
+                               "DriverManager") as m_driver_manager:
+            m_driver_manager.return_value = fake_driver
+            with mock.patch.object(default.DefaultLoader,
+                                   "_reload_config") as m_reload_config:
+                first = default.DefaultLoader(namespace='TESTING').load(
+                    name='fake')
+                cfg.CONF.set_override(
+                    "test_opt", "overridden", group="TESTING.fake")
+                second = default.DefaultLoader(namespace='TESTING').load(
+                    name='fake')
+
+                self.assertEqual(1, m_driver_manager.call_count)
+                self.assertEqual(1, m_reload_config.call_count)
+                self.assertEqual("fake_with_opts", first.config.test_opt)
+                # The options are still read from the configuration
+                self.assertEqual("overridden", second.config.test_opt)
+
+                default.reset_cache()
+                default.DefaultLoader(namespace='TESTING').load(name='fake')
+
+                self.assertEqual(2, m_driver_manager.call_count)
+                self.assertEqual(2, m_reload_config.call_count)
+
+    @mock.patch.object(stevedore_extension, "ExtensionManager")
+    def test_list_available_cached(self, m_extension_manager):
+        m_extension_manager.return_value.extensions = [
+            stevedore_extension.Extension(
+                name="fake", entry_point=None, plugin=FakeLoadable,
+                obj=None)]
+
+        loader_manager = default.DefaultLoader(namespace='TESTING')
+        self.assertEqual({"fake": FakeLoadable},
+                         loader_manager.list_available())
+        self.assertEqual({"fake": FakeLoadable},
+                         loader_manager.list_available())
+        m_extension_manager.assert_called_once_with(namespace='TESTING')
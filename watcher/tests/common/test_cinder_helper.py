@@ -50,6 +50,35 @@ class TestCinderHelper(base.TestCase):
 
         self.assertEqual(node, node1)
 
+    def test_get_storage_node_by_name_indexed(self, mock_cinder):
+        node1 = self.fake_storage_node()
+        node2 = self.fake_storage_node(name='host@backend2')
+        cinder_util = cinder_helper.CinderHelper()
+        cinder_util.cinder.services.list.return_value = [node1, node2]
+        cinder_util.get_storage_node_list()
+
+        self.assertEqual(
+            node1, cinder_util.get_storage_node_by_name('host@backend'))
+        self.assertEqual(
+            node2, cinder_util.get_storage_node_by_name('host@backend2'))
+        self.assertEqual(
+            node2, cinder_helper.CinderHelper().get_storage_node_by_name(
+                'host@backend2'))
+        cinder_util.cinder.services.list.assert_called_once_with(
+            binary='cinder-volume')
+
+    def test_get_storage_node_by_name_created(self, mock_cinder):
+        node1 = self.fake_storage_node()
+        node2 = self.fake_storage_node(name='host@backend2')
+        cinder_util = cinder_helper.CinderHelper()
+        cinder_util.cinder.services.list.return_value = [node1]
+        cinder_util.get_storage_node_list()
+        cinder_util.cinder.services.list.return_value = [node1, node2]
+
+        self.assertEqual(
+            node2, cinder_util.get_storage_node_by_name('host@backend2'))
+        self.assertEqual(2, cinder_util.cinder.services.list.call_count)
+
     def test_get_storage_node_by_name_failure(self, mock_cinder):
         node1 = self.fake_storage_node()
         cinder_util = cinder_helper.CinderHelper()
@@ -81,6 +110,23 @@ class TestCinderHelper(base.TestCase):
 
         self.assertEqual(pool, pool1)
 
+    def test_get_storage_pool_by_name_indexed(self, mock_cinder):
+        pool1 = self.fake_pool()
+        pool2 = self.fake_pool(name='host@backend#pool2')
+        cinder_util = cinder_helper.CinderHelper()
+        cinder_util.cinder.pools.list.return_value = [pool1, pool2]
+
+        self.assertEqual(
+            pool1, cinder_util.get_storage_pool_by_name('host@backend#pool'))
+        self.assertEqual(
+            pool2, cinder_util.get_storage_pool_by_name('host@backend#pool2'))
+        cinder_util.cinder.pools.list.assert_called_once_with(detailed=True)
+
+        cinder_helper.reset_cache()
+        self.assertEqual(
+            pool2, cinder_util.get_storage_pool_by_name('host@backend#pool2'))
+        self.assertEqual(2, cinder_util.cinder.pools.list.call_count)
+
     def test_get_storage_pool_by_name_failure(self, mock_cinder):
         pool1 = self.fake_pool()
         cinder_util = cinder_helper.CinderHelper()
@@ -124,3 +170,45 @@ class TestCinderHelper(base.TestCase):
             'nobackend')
 
         self.assertEqual("", volume_type_name)
+
+    def test_get_volume_type_by_backendname_indexed(self, mock_cinder):
+        volume_type1 = self.fake_volume_type()
+        volume_type2 = self.fake_volume_type(name='fake_type2')
+        volume_type3 = self.fake_volume_type(
+            name='fake_type3', extra_specs={'volume_backend_name': 'other'})
+        cinder_util = cinder_helper.CinderHelper()
+        cinder_util.cinder.volume_types.list.return_value = [
+            volume_type1, volume_type2, volume_type3]
+
+        self.assertEqual(
+            'fake_type', cinder_util.get_volume_type_by_backendname('backend'))
+        self.assertEqual(
+            'fake_type3', cinder_util.get_volume_type_by_backendname('other'))
+        cinder_util.cinder.volume_types.list.assert_called_once_with()
+        # The volume types are listed again for a backend without any
+        self.assertEqual(
+            '', cinder_util.get_volume_type_by_backendname('nobackend'))
+        self.assertEqual(2, cinder_util.cinder.volume_types.list.call_count)
+        self.assertEqual('', cinder_util.get_volume_type_by_backendname(
+            'nobackend', refresh=False))
+        self.assertEqual(2, cinder_util.cinder.volume_types.list.call_count)
+
+    def test_get_volume_type_by_backendname_created(self, mock_cinder):
+        volume_type1 = self.fake_volume_type()
+        volume_type2 = self.fake_volume_type(
+            name='fake_type2', extra_specs={'volume_backend_name': 'other'})
+        cinder_util = cinder_helper.CinderHelper()
+        cinder_util.cinder.volume_types.list.return_value = [volume_type1]
+        cinder_util.get_volume_type_list()
+        cinder_util.cinder.volume_types.list.return_value = [
+            volume_type1, volume_type2]
+
+        self.assertEqual(
+            'fake_type2', cinder_util.get_volume_type_by_backendname('other'))
+        self.assertEqual(2, cinder_util.cinder.volume_types.list.call_count)
+
+    def test_get_volume_list(self, mock_cinder):
+        cinder_util = cinder_helper.CinderHelper()
+        cinder_util.get_volume_list(marker='volume_1', limit=2)
+        cinder_util.cinder.volumes.list.assert_called_once_with(
+            search_opts={'all_tenants': True}, marker='volume_1', limit=2)
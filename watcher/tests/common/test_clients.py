@@ -10,6 +10,8 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import threading
+
 from ceilometerclient import client as ceclient
 import ceilometerclient.v2.client as ceclient_v2
 from cinderclient import client as ciclient
@@ -392,6 +394,19 @@ class TestClients(base.TestCase):
         monasca_cached = osc.monasca()
         self.assertEqual(monasca, monasca_cached)
 
+    @mock.patch.object(ka_loading, 'load_session_from_conf_options')
+    def test_clients_monasca_token_renewed(self, mock_session):
+        mock_session.return_value = mock.Mock(
+            get_endpoint=mock.Mock(return_value='test_endpoint'),
+            get_token=mock.Mock(side_effect=['token1', 'token1', 'token2']),)
+
+        self._register_watcher_clients_auth_opts()
+
+        osc = clients.OpenStackClients()
+        monasca = osc.monasca()
+        self.assertIs(monasca, osc.monasca())
+        self.assertIsNot(monasca, osc.monasca())
+
     @mock.patch.object(irclient, 'Client')
     @mock.patch.object(clients.OpenStackClients, 'session')
     def test_clients_ironic(self, mock_session, mock_call):
@@ -429,3 +444,21 @@ class TestClients(base.TestCase):
         ironic = osc.ironic()
         ironic_cached = osc.ironic()
         self.assertEqual(ironic, ironic_cached)
+
+    @mock.patch.object(clients.OpenStackClients, '_get_keystone_session')
+    def test_clients_session_shared(self, m_get_session):
+        osc = clients.OpenStackClients()
+        threads = [threading.Thread(target=lambda: osc.session)
+                   for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        m_get_session.assert_called_once_with()
+
+    def test_get_shared_clients(self):
+        osc = clients.get_shared_clients()
+        self.assertIsInstance(osc, clients.OpenStackClients)
+        self.assertIs(osc, clients.get_shared_clients())
+        clients.reset_shared_clients()
+        self.assertIsNot(osc, clients.get_shared_clients())
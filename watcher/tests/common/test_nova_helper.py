@@ -69,6 +69,18 @@ class TestNovaHelper(base.TestCase):
         else:
             nova_util.nova.server_migration.list.return_value = [list]
 
+    def test_clients_created_lazily(self, mock_glance, mock_cinder,
+                                    mock_neutron, mock_nova):
+        nova_util = nova_helper.NovaHelper()
+        self.assertIs(clients.get_shared_clients(), nova_util.osc)
+        for mock_client in (mock_glance, mock_cinder, mock_neutron,
+                            mock_nova):
+            self.assertFalse(mock_client.called)
+
+        nova_util.get_compute_node_list()
+        mock_nova.assert_called_once_with()
+        self.assertFalse(mock_glance.called)
+
     @mock.patch.object(time, 'sleep', mock.Mock())
     def test_stop_instance(self, mock_glance, mock_cinder, mock_neutron,
                            mock_nova):
@@ -237,13 +249,13 @@ class TestNovaHelper(base.TestCase):
         setattr(instance, 'OS-EXT-SRV-ATTR:host', self.source_node)
         setattr(instance, 'OS-EXT-STS:vm_state', "stopped")
         self.fake_nova_find_list(nova_util, find=instance, list=instance)
-        image_uuid = 'fake-image-uuid'
         nova_util.nova.servers.create_image.return_value = image
 
         glance_client = mock.MagicMock()
         mock_glance.return_value = glance_client
 
-        glance_client.images = {image_uuid: image}
+        image.status = 'active'
+        glance_client.images.get.return_value = image
         instance = nova_util.create_image_from_instance(
             self.instance_uuid, "Cirros"
         )
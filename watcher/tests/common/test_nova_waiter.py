@@ -0,0 +1,145 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+
+import mock
+
+from watcher.common import nova_waiter
+from watcher.tests import base
+
+
+class FakeServer(object):
+
+    def __init__(self, id, status='MIGRATING',
+                 updated='2017-06-01T10:00:00Z'):
+        self.id = id
+        self.status = status
+        self.updated = updated
+
+
+def is_active(server):
+    return server.status == 'ACTIVE'
+
+
+@mock.patch.object(time, 'sleep')
+class TestServerWaiter(base.TestCase):
+
+    def setUp(self):
+        super(TestServerWaiter, self).setUp()
+        self.waiter = nova_waiter.ServerWaiter()
+        self.nova = mock.Mock()
+
+    def test_wait_ready(self, m_sleep):
+        server = FakeServer('a', status='ACTIVE')
+        result = self.waiter.wait(self.nova, server, is_active, timeout=10)
+        self.assertIs(server, result)
+        self.assertFalse(m_sleep.called)
+        self.assertFalse(self.nova.servers.get.called)
+
+    def test_wait_backoff(self, m_sleep):
+        self.nova.servers.get.side_effect = [
+            FakeServer('a'), FakeServer('a'), FakeServer('a', 'ACTIVE')]
+        result = self.waiter.wait(
+            self.nova, FakeServer('a'), is_active, timeout=60)
+        self.assertEqual('ACTIVE', result.status)
+        self.assertEqual([mock.call(1), mock.call(1.5), mock.call(2.25)],
+                         m_sleep.call_args_list)
+        self.assertFalse(self.waiter._waits)
+
+    def test_wait_timeout(self, m_sleep):
+        self.nova.servers.get.return_value = FakeServer('a')
+        result = self.waiter.wait(
+            self.nova, FakeServer('a'), is_active, timeout=30, interval=5)
+        self.assertEqual('MIGRATING', result.status)
+        # The sleeps back off up to the maximum interval and stop at the
+        # deadline
+        self.assertEqual([5, 7.5, 10, 7.5],
+                         [c[0][0] for c in m_sleep.call_args_list])
+        self.assertFalse(self.waiter._waits)
+
+    def test_poll_changes_since(self, m_sleep):
+        wait_a = nova_waiter._Wait(
+            FakeServer('a', updated='2017-06-01T10:00:05Z'), is_active)
+        wait_b = nova_waiter._Wait(
+            FakeServer('b', updated='2017-06-01T10:00:00Z'), is_active)
+        self.waiter._waits.update([wait_a, wait_b])
+        self.nova.servers.list.return_value = [FakeServer('b', 'ACTIVE')]
+
+        self.waiter._refresh(self.nova, wait_a)
+
+        self.nova.servers.list.assert_called_once_with(
+            search_opts={'all_tenants': True,
+                         'changes-since': '2017-06-01T10:00:00Z'},
+            limit=nova_waiter.ServerWaiter.LIST_LIMIT)
+        self.assertFalse(self.nova.servers.get.called)
+        self.assertEqual('MIGRATING', wait_a.server.status)
+        self.assertEqual('ACTIVE', wait_b.server.status)
+        # The other wait is spared its own poll
+        self.assertFalse(wait_a.fresh)
+        self.assertTrue(wait_b.fresh)
+        self.waiter._refresh(self.nova, wait_b)
+        self.assertEqual(1, self.nova.servers.list.call_count)
+
+    @mock.patch.object(nova_waiter.ServerWaiter, 'LIST_LIMIT', 2)
+    def test_poll_changes_since_incomplete(self, m_sleep):
+        wait_a = nova_waiter._Wait(FakeServer('a'), is_active)
+        wait_b = nova_waiter._Wait(FakeServer('b'), is_active)
+        self.waiter._waits.update([wait_a, wait_b])
+        # As many servers as the limit are listed, so a may have changed
+        self.nova.servers.list.return_value = [
+            FakeServer('b', 'ACTIVE'), FakeServer('c', 'ACTIVE')]
+        self.nova.servers.get.return_value = FakeServer('a', 'ACTIVE')
+
+        self.waiter._refresh(self.nova, wait_b)
+
+        self.nova.servers.get.assert_called_once_with('a')
+        self.assertEqual('ACTIVE', wait_a.server.status)
+        self.assertEqual('ACTIVE', wait_b.server.status)
+        self.assertTrue(wait_a.fresh)
+
+    def test_poll_list_failure(self, m_sleep):
+        wait_a = nova_waiter._Wait(FakeServer('a'), is_active)
+        wait_b = nova_waiter._Wait(FakeServer('b'), is_active)
+        self.waiter._waits.update([wait_a, wait_b])
+        self.nova.servers.list.side_effect = Exception()
+        self.nova.servers.get.side_effect = (
+            lambda server_id: FakeServer(server_id, 'ACTIVE'))
+
+        self.waiter._refresh(self.nova, wait_a)
+
+        self.assertEqual(2, self.nova.servers.get.call_count)
+        self.assertEqual('ACTIVE', wait_a.server.status)
+        self.assertEqual('ACTIVE', wait_b.server.status)
+
+
+@mock.patch.object(time, 'sleep')
+class TestWaitFor(base.TestCase):
+
+    def test_wait_for(self, m_sleep):
+        fetch = mock.Mock(side_effect=['saving', 'active'])
+        result = nova_waiter.wait_for(
+            'queued', fetch, lambda status: status == 'active',
+            timeout=50, interval=5)
+        self.assertEqual('active', result)
+        self.assertEqual([mock.call(5), mock.call(7.5)],
+                         m_sleep.call_args_list)
+
+    def test_wait_for_timeout(self, m_sleep):
+        fetch = mock.Mock(return_value='saving')
+        result = nova_waiter.wait_for(
+            'queued', fetch, lambda status: status == 'active',
+            timeout=20, interval=5)
+        self.assertEqual('saving', result)
+        self.assertEqual(20, sum(c[0][0] for c in m_sleep.call_args_list))
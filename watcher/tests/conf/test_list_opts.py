@@ -18,6 +18,7 @@
 import mock
 from stevedore import extension
 
+from watcher.common.loader import default as loader_default
 from watcher.conf import opts
 from watcher.conf import plugins
 from watcher.tests import base
@@ -32,8 +33,10 @@ class TestListOpts(base.TestCase):
             'watcher_applier', 'watcher_planner', 'nova_client',
             'glance_client', 'gnocchi_client', 'cinder_client',
             'ceilometer_client', 'monasca_client', 'ironic_client',
-            'neutron_client', 'watcher_clients_auth']
+            'neutron_client', 'watcher_clients_auth', 'watcher_datasources']
         self.opt_sections = list(dict(opts.list_opts()).keys())
+        # Forget the plugins listed above so that the tests can fake them
+        loader_default.reset_cache()
 
     def test_run_list_opts(self):
         expected_sections = self.opt_sections
@@ -0,0 +1,139 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+
+import mock
+from oslo_config import cfg
+from oslo_utils import timeutils
+
+from watcher.common import service
+from watcher.datasource import cache
+from watcher.tests import base
+
+
+@mock.patch.object(cache.time, 'time')
+class TestMetricCache(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestMetricCache, self).setUp()
+        self._reset_metric_cache()
+        self.addCleanup(self._reset_metric_cache)
+        self.metric_cache = cache.MetricCache(max_size=3, default_ttl=60)
+        self.key = cache.cache_key('gnocchi', 'INSTANCE_1', 'cpu_util',
+                                   period=600, granularity=300,
+                                   aggregation='mean')
+
+    def test_get_missing(self, m_time):
+        m_time.return_value = 1000
+        self.assertIs(cache.NO_VALUE, self.metric_cache.get(self.key))
+        self.assertEqual(
+            {'size': 0, 'hits': 0, 'misses': 1, 'evictions': 0},
+            self.metric_cache.stats())
+
+    def test_set_get(self, m_time):
+        m_time.return_value = 1000
+        self.metric_cache.set(self.key, 10.0, granularity=300)
+        self.metric_cache.set(('ceilometer', 'INSTANCE_1'), None)
+        self.assertEqual(10.0, self.metric_cache.get(self.key))
+        self.assertIsNone(
+            self.metric_cache.get(('ceilometer', 'INSTANCE_1')))
+        self.assertEqual(
+            {'size': 2, 'hits': 2, 'misses': 0, 'evictions': 0},
+            self.metric_cache.stats())
+
+    def test_expiry_aligned_on_granularity(self, m_time):
+        m_time.return_value = 1000
+        self.metric_cache.set(self.key, 10.0, granularity=300)
+        m_time.return_value = 1199
+        self.assertEqual(10.0, self.metric_cache.get(self.key))
+        m_time.return_value = 1200
+        self.assertIs(cache.NO_VALUE, self.metric_cache.get(self.key))
+        self.assertEqual(0, len(self.metric_cache))
+
+    def test_expiry_default_ttl(self, m_time):
+        m_time.return_value = 1000
+        self.metric_cache.set(self.key, 10.0)
+        m_time.return_value = 1019
+        self.assertEqual(10.0, self.metric_cache.get(self.key))
+        m_time.return_value = 1020
+        self.assertIs(cache.NO_VALUE, self.metric_cache.get(self.key))
+
+    def test_least_recently_used_evicted(self, m_time):
+        m_time.return_value = 1000
+        for index in range(3):
+            self.metric_cache.set(index, index)
+        self.metric_cache.get(0)
+        self.metric_cache.set(3, 3)
+        self.assertIs(cache.NO_VALUE, self.metric_cache.get(1))
+        for index in (0, 2, 3):
+            self.assertEqual(index, self.metric_cache.get(index))
+        self.assertEqual(1, self.metric_cache.evictions)
+
+    def test_get_or_fetch(self, m_time):
+        m_time.return_value = 1000
+        fetch = mock.Mock(return_value=10.0)
+        self.assertEqual(10.0, self.metric_cache.get_or_fetch(
+            self.key, fetch, granularity=300))
+        self.assertEqual(10.0, self.metric_cache.get_or_fetch(
+            self.key, fetch, granularity=300))
+        fetch.assert_called_once_with()
+
+    def test_get_or_fetch_error_not_cached(self, m_time):
+        m_time.return_value = 1000
+        fetch = mock.Mock(side_effect=[Exception("Unreachable"), 10.0])
+        self.assertRaises(
+            Exception, self.metric_cache.get_or_fetch, self.key, fetch)
+        self.assertEqual(10.0, self.metric_cache.get_or_fetch(
+            self.key, fetch))
+
+    def test_disabled(self, m_time):
+        m_time.return_value = 1000
+        self.metric_cache.max_size = 0
+        self.metric_cache.set(self.key, 10.0)
+        self.assertIs(cache.NO_VALUE, self.metric_cache.get(self.key))
+        self.assertEqual(0, len(self.metric_cache))
+
+    def test_shared(self, m_time):
+        self.assertIs(self.metric_cache, cache.MetricCache())
+
+    def test_configured(self, m_time):
+        self._reset_metric_cache()
+        cfg.CONF.set_override('metric_cache_size', 42,
+                              group='watcher_datasources')
+        cfg.CONF.set_override('metric_cache_ttl', 120,
+                              group='watcher_datasources')
+        metric_cache = cache.MetricCache()
+        self.assertEqual(42, metric_cache.max_size)
+        self.assertEqual(120, metric_cache.default_ttl)
+
+    @staticmethod
+    def _reset_metric_cache():
+        service.Singleton._instances.pop(cache.MetricCache, None)
+
+
+class TestWindowLength(base.BaseTestCase):
+
+    def test_window_length(self):
+        stop_time = timeutils.parse_isotime("2017-02-02T10:00:00.000000")
+        self.assertEqual(3600, cache.window_length(
+            stop_time - datetime.timedelta(hours=1), stop_time))
+
+    def test_window_length_until_now(self):
+        start_time = datetime.datetime.utcnow() - datetime.timedelta(
+            seconds=300)
+        self.assertIn(cache.window_length(start_time), (300, 301))
+
+    def test_window_length_no_start(self):
+        self.assertIsNone(cache.window_length(None))
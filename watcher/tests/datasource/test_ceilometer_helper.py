@@ -20,6 +20,7 @@ from __future__ import unicode_literals
 import mock
 
 from watcher.common import clients
+from watcher.datasource import cache
 from watcher.datasource import ceilometer as ceilometer_helper
 from watcher.tests import base
 
@@ -27,6 +28,11 @@ from watcher.tests import base
 @mock.patch.object(clients.OpenStackClients, 'ceilometer')
 class TestCeilometerHelper(base.BaseTestCase):
 
+    def setUp(self):
+        super(TestCeilometerHelper, self).setUp()
+        # The aggregates are cached across the tests otherwise
+        cache.MetricCache().clear()
+
     def test_build_query(self, mock_ceilometer):
         mock_ceilometer.return_value = mock.MagicMock()
         cm = ceilometer_helper.CeilometerHelper()
@@ -59,6 +65,95 @@ class TestCeilometerHelper(base.BaseTestCase):
         )
         self.assertEqual(expected_result, val)
 
+    def test_statistic_aggregation_cached(self, mock_ceilometer):
+        ceilometer = mock.MagicMock()
+        ceilometer.statistics.list.return_value = [
+            mock.Mock(_info={'aggregate': {'avg': 100}})]
+        mock_ceilometer.return_value = ceilometer
+        cm = ceilometer_helper.CeilometerHelper()
+        for _ in range(2):
+            val = cm.statistic_aggregation(
+                resource_id="INSTANCE_ID",
+                meter_name="cpu_util",
+                period="7300"
+            )
+            self.assertEqual(100, val)
+        self.assertEqual(1, ceilometer.statistics.list.call_count)
+        self.assertEqual(1, cm.metric_cache.hits)
+
+    @mock.patch.object(ceilometer_helper.CeilometerHelper,
+                       'GROUPBY_MIN_RESOURCES', 3)
+    def test_statistic_aggregations(self, mock_ceilometer):
+        ceilometer = mock.MagicMock()
+        ceilometer.statistics.list.return_value = [
+            mock.Mock(_info={'groupby': {'resource_id': "INSTANCE_1"},
+                             'aggregate': {'avg': 10}}),
+            mock.Mock(_info={'groupby': {'resource_id': "INSTANCE_1"},
+                             'aggregate': {'avg': 20}}),
+            mock.Mock(_info={'groupby': {'resource_id': "INSTANCE_2"},
+                             'aggregate': {'avg': 30}}),
+            mock.Mock(_info={'groupby': {'resource_id': "INSTANCE_4"},
+                             'aggregate': {'avg': 40}})]
+        mock_ceilometer.return_value = ceilometer
+        cm = ceilometer_helper.CeilometerHelper()
+        val = cm.statistic_aggregations(
+            resource_ids=["INSTANCE_1", "INSTANCE_2", "INSTANCE_3"],
+            meter_names=["cpu_util"],
+            period="7300"
+        )
+        self.assertEqual({"INSTANCE_1": {"cpu_util": 20},
+                          "INSTANCE_2": {"cpu_util": 30},
+                          "INSTANCE_3": {"cpu_util": None}}, val)
+        ceilometer.statistics.list.assert_called_once_with(
+            meter_name="cpu_util", q=mock.ANY, period="7300",
+            groupby=['resource_id'], aggregates=[{'func': 'avg'}])
+
+    def test_statistic_aggregations_few_resources(self, mock_ceilometer):
+        ceilometer = mock.MagicMock()
+        ceilometer.statistics.list.return_value = [
+            mock.Mock(_info={'aggregate': {'avg': 10}})]
+        mock_ceilometer.return_value = ceilometer
+        cm = ceilometer_helper.CeilometerHelper()
+        val = cm.statistic_aggregations(
+            resource_ids=["INSTANCE_1", "INSTANCE_2"],
+            meter_names=["cpu_util"],
+            period="7300"
+        )
+        self.assertEqual({"INSTANCE_1": {"cpu_util": 10},
+                          "INSTANCE_2": {"cpu_util": 10}}, val)
+        # Not worth the statistics of all the resources of the cloud
+        self.assertEqual(2, ceilometer.statistics.list.call_count)
+        for call in ceilometer.statistics.list.call_args_list:
+            self.assertNotIn('groupby', call[1])
+            self.assertIn('resource_id',
+                          [item['field'] for item in call[1]['q']])
+
+    @mock.patch.object(ceilometer_helper.CeilometerHelper,
+                       'GROUPBY_MIN_RESOURCES', 2)
+    def test_statistic_aggregations_fallback(self, mock_ceilometer):
+        ceilometer = mock.MagicMock()
+        mock_ceilometer.return_value = ceilometer
+        cm = ceilometer_helper.CeilometerHelper()
+
+        def fake_statistics(meter_name, q, period, aggregates,
+                            groupby=None):
+            if groupby:
+                raise Exception("groupby is not supported")
+            resource_id = [item['value'] for item in q
+                           if item['field'] == 'resource_id'][0]
+            if resource_id == "INSTANCE_2":
+                raise Exception("No data")
+            return [mock.Mock(_info={'aggregate': {'avg': 10}})]
+
+        ceilometer.statistics.list.side_effect = fake_statistics
+        val = cm.statistic_aggregations(
+            resource_ids=["INSTANCE_1", "INSTANCE_2"],
+            meter_names=["cpu_util"],
+            period="7300"
+        )
+        self.assertEqual({"INSTANCE_1": {"cpu_util": 10},
+                          "INSTANCE_2": {"cpu_util": None}}, val)
+
     def test_get_last_sample(self, mock_ceilometer):
         ceilometer = mock.MagicMock()
         statistic = mock.MagicMock()
@@ -20,6 +20,7 @@ from oslo_utils import timeutils
 
 from watcher.common import clients
 from watcher.common import exception
+from watcher.datasource import cache
 from watcher.datasource import gnocchi as gnocchi_helper
 from watcher.tests import base
 
@@ -29,6 +30,11 @@ CONF = cfg.CONF
 @mock.patch.object(clients.OpenStackClients, 'gnocchi')
 class TestGnocchiHelper(base.BaseTestCase):
 
+    def setUp(self):
+        super(TestGnocchiHelper, self).setUp()
+        # The aggregates are cached across the tests otherwise
+        cache.MetricCache().clear()
+
     def test_gnocchi_statistic_aggregation(self, mock_gnocchi):
         gnocchi = mock.MagicMock()
         expected_result = 5.5
@@ -66,3 +72,92 @@ class TestGnocchiHelper(base.BaseTestCase):
             start_time="2017-02-02T09:00:00.000000",
             stop_time=timeutils.parse_isotime("2017-02-02T10:00:00.000000"),
             aggregation='mean')
+
+    def test_gnocchi_statistic_aggregations(self, mock_gnocchi):
+        gnocchi = mock.MagicMock()
+        gnocchi.metric.aggregation.return_value = [
+            {'group': {'id': 'INSTANCE_1',
+                       'original_resource_id': 'INSTANCE_1'},
+             'measures': [["2017-02-02T09:00:00.000000", 360, 5.5],
+                          ["2017-02-02T09:06:00.000000", 360, 6.5]]},
+            {'group': {'id': '4e6a4b0a-3c1b-5f7e-9d2a-1a7c3b0e5f6d',
+                       'original_resource_id': 'NODE_1_hostname_1'},
+             'measures': [["2017-02-02T09:00:00.000000", 360, 7.5]]}]
+        mock_gnocchi.return_value = gnocchi
+        start_time = timeutils.parse_isotime("2017-02-02T09:00:00.000000")
+        stop_time = timeutils.parse_isotime("2017-02-02T10:00:00.000000")
+
+        helper = gnocchi_helper.GnocchiHelper()
+        result = helper.statistic_aggregations(
+            resource_ids=['INSTANCE_1', 'NODE_1_hostname_1', 'INSTANCE_2'],
+            metrics=['cpu_util'],
+            granularity=360,
+            start_time=start_time,
+            stop_time=stop_time,
+            aggregation='mean'
+        )
+        self.assertEqual({'INSTANCE_1': {'cpu_util': 6.5},
+                          'NODE_1_hostname_1': {'cpu_util': 7.5},
+                          'INSTANCE_2': {'cpu_util': None}}, result)
+        gnocchi.metric.aggregation.assert_called_once_with(
+            metrics='cpu_util',
+            query={"in": {"id": ['INSTANCE_1', 'NODE_1_hostname_1',
+                                 'INSTANCE_2']}},
+            start=start_time, stop=stop_time, aggregation='mean',
+            granularity=360, groupby=['id', 'original_resource_id'])
+        self.assertFalse(gnocchi.metric.get_measures.called)
+
+    def test_gnocchi_statistic_aggregations_fallback(self, mock_gnocchi):
+        gnocchi = mock.MagicMock()
+        gnocchi.metric.aggregation.side_effect = Exception(
+            "groupby is not supported")
+        gnocchi.metric.get_measures.return_value = [
+            ["2017-02-02T09:00:00.000000", 360, 5.5]]
+        mock_gnocchi.return_value = gnocchi
+
+        helper = gnocchi_helper.GnocchiHelper()
+        result = helper.statistic_aggregations(
+            resource_ids=['INSTANCE_1', 'INSTANCE_2'],
+            metrics=['cpu_util', 'memory.resident'],
+            granularity=360
+        )
+        self.assertEqual(
+            {'INSTANCE_1': {'cpu_util': 5.5, 'memory.resident': 5.5},
+             'INSTANCE_2': {'cpu_util': 5.5, 'memory.resident': 5.5}},
+            result)
+        self.assertEqual(4, gnocchi.metric.get_measures.call_count)
+
+    def test_gnocchi_statistic_aggregations_cached(self, mock_gnocchi):
+        gnocchi = mock.MagicMock()
+        gnocchi.metric.get_measures.return_value = [
+            ["2017-02-02T09:00:00.000000", 360, 5.5]]
+        gnocchi.metric.aggregation.return_value = [
+            {'group': {'id': 'INSTANCE_2',
+                       'original_resource_id': 'INSTANCE_2'},
+             'measures': [["2017-02-02T09:00:00.000000", 360, 6.5]]}]
+        mock_gnocchi.return_value = gnocchi
+        start_time = timeutils.parse_isotime("2017-02-02T09:00:00.000000")
+        stop_time = timeutils.parse_isotime("2017-02-02T10:00:00.000000")
+
+        helper = gnocchi_helper.GnocchiHelper()
+        helper.statistic_aggregation(
+            resource_id='INSTANCE_1', metric='cpu_util', granularity=360,
+            start_time=start_time, stop_time=stop_time, aggregation='mean')
+        for _ in range(2):
+            result = helper.statistic_aggregations(
+                resource_ids=['INSTANCE_1', 'INSTANCE_2'],
+                metrics=['cpu_util'],
+                granularity=360,
+                start_time=start_time,
+                stop_time=stop_time,
+                aggregation='mean'
+            )
+            self.assertEqual({'INSTANCE_1': {'cpu_util': 5.5},
+                              'INSTANCE_2': {'cpu_util': 6.5}}, result)
+        gnocchi.metric.get_measures.assert_called_once_with(
+            metric='cpu_util', start=start_time, stop=stop_time,
+            resource_id='INSTANCE_1', granularity=360, aggregation='mean')
+        gnocchi.metric.aggregation.assert_called_once_with(
+            metrics='cpu_util', query={"in": {"id": ['INSTANCE_2']}},
+            start=start_time, stop=stop_time, aggregation='mean',
+            granularity=360, groupby=['id', 'original_resource_id'])
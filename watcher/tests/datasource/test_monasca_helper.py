@@ -20,6 +20,7 @@ from oslo_config import cfg
 from oslo_utils import timeutils
 
 from watcher.common import clients
+from watcher.datasource import cache
 from watcher.datasource import monasca as monasca_helper
 from watcher.tests import base
 
@@ -29,6 +30,11 @@ CONF = cfg.CONF
 @mock.patch.object(clients.OpenStackClients, 'monasca')
 class TestMonascaHelper(base.BaseTestCase):
 
+    def setUp(self):
+        super(TestMonascaHelper, self).setUp()
+        # The aggregates are cached across the tests otherwise
+        cache.MetricCache().clear()
+
     def test_monasca_statistic_aggregation(self, mock_monasca):
         monasca = mock.MagicMock()
         expected_result = [{
@@ -58,6 +64,45 @@ class TestMonascaHelper(base.BaseTestCase):
         )
         self.assertEqual(expected_result, result)
 
+    def test_monasca_statistic_aggregations(self, mock_monasca):
+        monasca = mock.MagicMock()
+        node_1_statistics = {
+            'columns': ['timestamp', 'avg'],
+            'dimensions': {'hostname': 'node-1'},
+            'id': '0',
+            'name': 'cpu.percent',
+            'statistics': [['2016-07-29T12:45:00Z', 0.5]]}
+        node_2_statistics = {
+            'columns': ['timestamp', 'avg'],
+            'dimensions': {'hostname': 'node-2'},
+            'id': '1',
+            'name': 'cpu.percent',
+            'statistics': [['2016-07-29T12:45:00Z', 0.7]]}
+        monasca.metrics.list_statistics.return_value = [
+            node_1_statistics, node_2_statistics]
+        mock_monasca.return_value = monasca
+
+        helper = monasca_helper.MonascaHelper()
+        result = helper.statistic_aggregations(
+            meter_names=['cpu.percent'],
+            dimension='hostname',
+            values=['node-1', 'node-2', 'node-3'],
+            start_time=timeutils.parse_isotime("2016-06-06T10:33:22.063176"),
+            period=7200,
+        )
+        self.assertEqual(
+            {'node-1': {'cpu.percent': [node_1_statistics]},
+             'node-2': {'cpu.percent': [node_2_statistics]},
+             'node-3': {'cpu.percent': []}},
+            result)
+        monasca.metrics.list_statistics.assert_called_once_with(
+            name='cpu.percent',
+            start_time='2016-06-06T10:33:22.063176+00:00',
+            dimensions={'hostname': 'node-1|node-2|node-3'},
+            period=7200,
+            statistics='avg',
+            group_by='hostname')
+
     def test_monasca_statistic_list(self, mock_monasca):
         monasca = mock.MagicMock()
         expected_result = [{
@@ -392,3 +392,27 @@ class DbActionTestCase(base.DbTestCase):
         self.assertRaises(exception.ActionAlreadyExists,
                           self._create_test_action,
                           id=2, uuid=uuid)
+
+    def test_create_actions(self):
+        action_plan = utils.create_test_action_plan()
+        uuids = [w_utils.generate_uuid() for _ in range(3)]
+        values = [utils.get_test_action(id=id_, uuid=uuid,
+                                        action_plan_id=action_plan.id)
+                  for id_, uuid in enumerate(uuids, 1)]
+        actions = self.dbapi.create_actions(values)
+        self.assertEqual(uuids, [action.uuid for action in actions])
+        self.assertEqual(
+            sorted(uuids),
+            sorted(a.uuid for a in self.dbapi.get_action_list(self.context)))
+
+    def test_create_actions_already_exists(self):
+        uuid = w_utils.generate_uuid()
+        self._create_test_action(id=1, uuid=uuid)
+        values = [utils.get_test_action(id=2, uuid=w_utils.generate_uuid()),
+                  utils.get_test_action(id=3, uuid=uuid)]
+        self.assertRaises(exception.ActionAlreadyExists,
+                          self.dbapi.create_actions, values)
+        # The whole transaction is rolled back
+        self.assertEqual(
+            [uuid],
+            [a.uuid for a in self.dbapi.get_action_list(self.context)])
@@ -408,3 +408,29 @@ class DbEfficacyIndicatorTestCase(base.DbTestCase):
         self.assertRaises(exception.EfficacyIndicatorAlreadyExists,
                           self._create_test_efficacy_indicator,
                           id=2, uuid=uuid)
+
+    def test_create_efficacy_indicators(self):
+        action_plan = self._create_test_action_plan()
+        uuids = [w_utils.generate_uuid() for _ in range(3)]
+        values = [utils.get_test_efficacy_indicator(
+                  id=id_, uuid=uuid, action_plan_id=action_plan.id)
+                  for id_, uuid in enumerate(uuids, 1)]
+        efficacy_indicators = self.dbapi.create_efficacy_indicators(values)
+        self.assertEqual(uuids, [ei.uuid for ei in efficacy_indicators])
+        self.assertEqual(
+            sorted(uuids),
+            sorted(ei.uuid for ei in
+                   self.dbapi.get_efficacy_indicator_list(self.context)))
+
+    def test_create_efficacy_indicators_already_exists(self):
+        uuid = w_utils.generate_uuid()
+        self._create_test_efficacy_indicator(id=1, uuid=uuid)
+        values = [utils.get_test_efficacy_indicator(
+                  id=2, uuid=w_utils.generate_uuid()),
+                  utils.get_test_efficacy_indicator(id=3, uuid=uuid)]
+        self.assertRaises(exception.EfficacyIndicatorAlreadyExists,
+                          self.dbapi.create_efficacy_indicators, values)
+        self.assertEqual(
+            [uuid],
+            [ei.uuid for ei in
+             self.dbapi.get_efficacy_indicator_list(self.context)])
@@ -14,15 +14,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+
 from oslo_utils import uuidutils
 
 import freezegun
 import mock
 
 from watcher.common import context as watcher_context
+from watcher.common import exception
 from watcher.common import utils
 from watcher.db import purge
 from watcher.db.sqlalchemy import api as dbapi
+from watcher import objects
 from watcher.tests.db import base
 from watcher.tests.objects import utils as obj_utils
 
@@ -72,6 +76,18 @@ class TestPurgeCommand(base.DbTestCase):
             yield seed
             seed += 1
 
+    @staticmethod
+    def _get_destroyed(m_destroy_entries):
+        destroyed = collections.defaultdict(list)
+        for (_, table, ids), _ in m_destroy_entries.call_args_list:
+            destroyed[table].extend(ids)
+        return destroyed
+
+    def _count_destroyed(self, m_destroy_entries):
+        destroyed = self._get_destroyed(m_destroy_entries)
+        return {key: len(destroyed[key])
+                for key in purge.WatcherObjectsMap.keys()}
+
     def generate_unique_name(self, prefix):
         return "%s%s" % (prefix, uuidutils.generate_uuid())
 
@@ -193,19 +209,9 @@ class TestPurgeCommand(base.DbTestCase):
                 id=self._generate_id(), uuid=utils.generate_uuid())
             self.action_plan1.soft_delete()
 
-    @mock.patch.object(dbapi.Connection, "destroy_action")
-    @mock.patch.object(dbapi.Connection, "destroy_action_plan")
-    @mock.patch.object(dbapi.Connection, "destroy_audit")
-    @mock.patch.object(dbapi.Connection, "destroy_audit_template")
-    @mock.patch.object(dbapi.Connection, "destroy_strategy")
-    @mock.patch.object(dbapi.Connection, "destroy_goal")
-    def test_execute_max_number_exceeded(self,
-                                         m_destroy_goal,
-                                         m_destroy_strategy,
-                                         m_destroy_audit_template,
-                                         m_destroy_audit,
-                                         m_destroy_action_plan,
-                                         m_destroy_action):
+    @mock.patch.object(dbapi.Connection, "destroy_entries", autospec=True,
+                       side_effect=dbapi.Connection.destroy_entries)
+    def test_execute_max_number_exceeded(self, m_destroy_entries):
         self.cmd.age_in_days = None
         self.cmd.max_number = 10
 
@@ -222,12 +228,10 @@ class TestPurgeCommand(base.DbTestCase):
         # The 1's and the 2's are purgeable (due to age of day set to 0),
         # but max_number = 10, and because of no Db integrity violation, we
         # should be able to purge only 6 objects.
-        self.assertEqual(m_destroy_goal.call_count, 1)
-        self.assertEqual(m_destroy_strategy.call_count, 1)
-        self.assertEqual(m_destroy_audit_template.call_count, 1)
-        self.assertEqual(m_destroy_audit.call_count, 1)
-        self.assertEqual(m_destroy_action_plan.call_count, 1)
-        self.assertEqual(m_destroy_action.call_count, 1)
+        self.assertEqual(
+            {'goals': 1, 'strategies': 1, 'audit_templates': 1,
+             'audits': 1, 'action_plans': 1, 'actions': 1},
+            self._count_destroyed(m_destroy_entries))
 
     def test_find_deleted_entries(self):
         self.cmd.age_in_days = None
@@ -326,39 +330,25 @@ class TestPurgeCommand(base.DbTestCase):
         self.assertEqual(len(objects_map.actions), 3)
         self.assertEqual(
             set([self.action1.id, action4.id, action5.id]),
-            set([entry.id for entry in objects_map.actions]))
-
-    @mock.patch.object(dbapi.Connection, "destroy_action")
-    @mock.patch.object(dbapi.Connection, "destroy_action_plan")
-    @mock.patch.object(dbapi.Connection, "destroy_audit")
-    @mock.patch.object(dbapi.Connection, "destroy_audit_template")
-    @mock.patch.object(dbapi.Connection, "destroy_strategy")
-    @mock.patch.object(dbapi.Connection, "destroy_goal")
-    def test_purge_command(self, m_destroy_goal, m_destroy_strategy,
-                           m_destroy_audit_template, m_destroy_audit,
-                           m_destroy_action_plan, m_destroy_action):
+            set(objects_map.actions))
+
+    @mock.patch.object(dbapi.Connection, "destroy_entries", autospec=True,
+                       side_effect=dbapi.Connection.destroy_entries)
+    def test_purge_command(self, m_destroy_entries):
         with freezegun.freeze_time(self.fake_today):
             self.cmd.execute()
 
-        m_destroy_audit_template.assert_called_once_with(
-            self.audit_template1.uuid)
-        m_destroy_audit.assert_called_with(
-            self.audit1.uuid)
-        m_destroy_action_plan.assert_called_with(
-            self.action_plan1.uuid)
-        m_destroy_action.assert_called_with(
-            self.action1.uuid)
-
-    @mock.patch.object(dbapi.Connection, "destroy_action")
-    @mock.patch.object(dbapi.Connection, "destroy_action_plan")
-    @mock.patch.object(dbapi.Connection, "destroy_audit")
-    @mock.patch.object(dbapi.Connection, "destroy_audit_template")
-    @mock.patch.object(dbapi.Connection, "destroy_strategy")
-    @mock.patch.object(dbapi.Connection, "destroy_goal")
+        destroyed = self._get_destroyed(m_destroy_entries)
+        self.assertEqual([self.audit_template1.id],
+                         destroyed['audit_templates'])
+        self.assertEqual([self.audit1.id], destroyed['audits'])
+        self.assertEqual([self.action_plan1.id], destroyed['action_plans'])
+        self.assertEqual([self.action1.id], destroyed['actions'])
+
+    @mock.patch.object(dbapi.Connection, "destroy_entries", autospec=True,
+                       side_effect=dbapi.Connection.destroy_entries)
     def test_purge_command_with_nonexpired_related_entries(
-            self, m_destroy_goal, m_destroy_strategy,
-            m_destroy_audit_template, m_destroy_audit,
-            m_destroy_action_plan, m_destroy_action):
+            self, m_destroy_entries):
         with freezegun.freeze_time(self.fake_today):
             # orphan audit template
             audit_template4 = obj_utils.create_test_audit_template(
@@ -415,88 +405,145 @@ class TestPurgeCommand(base.DbTestCase):
         with freezegun.freeze_time(self.fake_today):
             self.cmd.execute()
 
-        self.assertEqual(m_destroy_goal.call_count, 1)
-        self.assertEqual(m_destroy_strategy.call_count, 1)
-        self.assertEqual(m_destroy_audit_template.call_count, 3)
-        self.assertEqual(m_destroy_audit.call_count, 3)
-        self.assertEqual(m_destroy_action_plan.call_count, 3)
-        self.assertEqual(m_destroy_action.call_count, 3)
-
-        m_destroy_audit_template.assert_any_call(self.audit_template1.uuid)
-        m_destroy_audit.assert_any_call(self.audit1.uuid)
-        m_destroy_audit.assert_any_call(audit4.uuid)
-        m_destroy_action_plan.assert_any_call(self.action_plan1.uuid)
-        m_destroy_action_plan.assert_any_call(action_plan4.uuid)
-        m_destroy_action_plan.assert_any_call(action_plan5.uuid)
-        m_destroy_action.assert_any_call(self.action1.uuid)
-        m_destroy_action.assert_any_call(action4.uuid)
-        m_destroy_action.assert_any_call(action5.uuid)
-
-    @mock.patch.object(dbapi.Connection, "destroy_action")
-    @mock.patch.object(dbapi.Connection, "destroy_action_plan")
-    @mock.patch.object(dbapi.Connection, "destroy_audit")
-    @mock.patch.object(dbapi.Connection, "destroy_audit_template")
-    @mock.patch.object(dbapi.Connection, "destroy_strategy")
-    @mock.patch.object(dbapi.Connection, "destroy_goal")
-    def test_purge_command_with_strategy_uuid(
-            self, m_destroy_goal, m_destroy_strategy,
-            m_destroy_audit_template, m_destroy_audit,
-            m_destroy_action_plan, m_destroy_action):
+        self.assertEqual(
+            {'goals': 1, 'strategies': 1, 'audit_templates': 3,
+             'audits': 3, 'action_plans': 3, 'actions': 3},
+            self._count_destroyed(m_destroy_entries))
+
+        destroyed = self._get_destroyed(m_destroy_entries)
+        self.assertIn(self.audit_template1.id, destroyed['audit_templates'])
+        self.assertIn(self.audit1.id, destroyed['audits'])
+        self.assertIn(audit4.id, destroyed['audits'])
+        self.assertIn(self.action_plan1.id, destroyed['action_plans'])
+        self.assertIn(action_plan4.id, destroyed['action_plans'])
+        self.assertIn(action_plan5.id, destroyed['action_plans'])
+        self.assertIn(self.action1.id, destroyed['actions'])
+        self.assertIn(action4.id, destroyed['actions'])
+        self.assertIn(action5.id, destroyed['actions'])
+
+    @mock.patch.object(dbapi.Connection, "destroy_entries", autospec=True,
+                       side_effect=dbapi.Connection.destroy_entries)
+    def test_purge_command_with_strategy_uuid(self, m_destroy_entries):
         self.cmd.exclude_orphans = False
         self.cmd.uuid = self.strategy1.uuid
 
         with freezegun.freeze_time(self.fake_today):
             self.cmd.execute()
 
-        self.assertEqual(m_destroy_goal.call_count, 0)
-        self.assertEqual(m_destroy_strategy.call_count, 1)
-        self.assertEqual(m_destroy_audit_template.call_count, 1)
-        self.assertEqual(m_destroy_audit.call_count, 1)
-        self.assertEqual(m_destroy_action_plan.call_count, 1)
-        self.assertEqual(m_destroy_action.call_count, 1)
-
-    @mock.patch.object(dbapi.Connection, "destroy_action")
-    @mock.patch.object(dbapi.Connection, "destroy_action_plan")
-    @mock.patch.object(dbapi.Connection, "destroy_audit")
-    @mock.patch.object(dbapi.Connection, "destroy_audit_template")
-    @mock.patch.object(dbapi.Connection, "destroy_strategy")
-    @mock.patch.object(dbapi.Connection, "destroy_goal")
+        self.assertEqual(
+            {'goals': 0, 'strategies': 1, 'audit_templates': 1,
+             'audits': 1, 'action_plans': 1, 'actions': 1},
+            self._count_destroyed(m_destroy_entries))
+
+    @mock.patch.object(dbapi.Connection, "destroy_entries", autospec=True,
+                       side_effect=dbapi.Connection.destroy_entries)
     def test_purge_command_with_audit_template_not_expired(
-            self, m_destroy_goal, m_destroy_strategy,
-            m_destroy_audit_template, m_destroy_audit,
-            m_destroy_action_plan, m_destroy_action):
+            self, m_destroy_entries):
         self.cmd.exclude_orphans = True
         self.cmd.uuid = self.audit_template2.uuid
 
         with freezegun.freeze_time(self.fake_today):
             self.cmd.execute()
 
-        self.assertEqual(m_destroy_goal.call_count, 0)
-        self.assertEqual(m_destroy_strategy.call_count, 0)
-        self.assertEqual(m_destroy_audit_template.call_count, 0)
-        self.assertEqual(m_destroy_audit.call_count, 0)
-        self.assertEqual(m_destroy_action_plan.call_count, 0)
-        self.assertEqual(m_destroy_action.call_count, 0)
-
-    @mock.patch.object(dbapi.Connection, "destroy_action")
-    @mock.patch.object(dbapi.Connection, "destroy_action_plan")
-    @mock.patch.object(dbapi.Connection, "destroy_audit")
-    @mock.patch.object(dbapi.Connection, "destroy_audit_template")
-    @mock.patch.object(dbapi.Connection, "destroy_strategy")
-    @mock.patch.object(dbapi.Connection, "destroy_goal")
+        self.assertEqual(
+            {'goals': 0, 'strategies': 0, 'audit_templates': 0,
+             'audits': 0, 'action_plans': 0, 'actions': 0},
+            self._count_destroyed(m_destroy_entries))
+
+    @mock.patch.object(dbapi.Connection, "destroy_entries", autospec=True,
+                       side_effect=dbapi.Connection.destroy_entries)
     def test_purge_command_with_audit_template_not_soft_deleted(
-            self, m_destroy_goal, m_destroy_strategy,
-            m_destroy_audit_template, m_destroy_audit,
-            m_destroy_action_plan, m_destroy_action):
+            self, m_destroy_entries):
         self.cmd.exclude_orphans = False
         self.cmd.uuid = self.audit_template3.uuid
 
         with freezegun.freeze_time(self.fake_today):
             self.cmd.execute()
 
-        self.assertEqual(m_destroy_goal.call_count, 0)
-        self.assertEqual(m_destroy_strategy.call_count, 0)
-        self.assertEqual(m_destroy_audit_template.call_count, 0)
-        self.assertEqual(m_destroy_audit.call_count, 0)
-        self.assertEqual(m_destroy_action_plan.call_count, 0)
-        self.assertEqual(m_destroy_action.call_count, 0)
+        self.assertEqual(
+            {'goals': 0, 'strategies': 0, 'audit_templates': 0,
+             'audits': 0, 'action_plans': 0, 'actions': 0},
+            self._count_destroyed(m_destroy_entries))
+
+    @mock.patch.object(dbapi.Connection, "destroy_entries", autospec=True,
+                       side_effect=dbapi.Connection.destroy_entries)
+    def test_purge_command_by_batches(self, m_destroy_entries):
+        self.cmd.age_in_days = None
+        self.cmd.batch_size = 1
+
+        with freezegun.freeze_time(self.fake_today):
+            self.goal2.soft_delete()
+            self.strategy2.soft_delete()
+            self.audit_template2.soft_delete()
+            self.audit2.soft_delete()
+            self.action_plan2.soft_delete()
+
+        with freezegun.freeze_time(self.fake_today):
+            self.cmd.execute()
+
+        # One transaction per object, the children first
+        self.assertEqual(12, m_destroy_entries.call_count)
+        self.assertEqual(
+            ['actions', 'actions', 'action_plans', 'action_plans'],
+            [c[0][1] for c in m_destroy_entries.call_args_list[:4]])
+        self.assertEqual(
+            {self.action1.id, self.action2.id},
+            set(self._get_destroyed(m_destroy_entries)['actions']))
+        self.assertEqual(
+            [], self.cmd.dbapi.get_purgeable_ids('actions'))
+        self.assertEqual(
+            [self.action3.id],
+            [a.id for a in objects.Action.list(self.context)])
+
+    def test_purge_command_with_efficacy_indicators(self):
+        efficacy_indicator = obj_utils.create_test_efficacy_indicator(
+            self.context, action_plan_id=self.action_plan1.id,
+            id=self._generate_id(), uuid=utils.generate_uuid())
+
+        with freezegun.freeze_time(self.fake_today):
+            self.cmd.execute()
+
+        self.assertRaises(
+            exception.EfficacyIndicatorNotFound,
+            objects.EfficacyIndicator.get_by_uuid,
+            self.context, efficacy_indicator.uuid)
+        self.assertRaises(
+            exception.ActionPlanNotFound,
+            objects.ActionPlan.get_by_uuid,
+            self.context, self.action_plan1.uuid)
+
+    @mock.patch.object(dbapi.Connection, "destroy_entries", autospec=True,
+                       side_effect=dbapi.Connection.destroy_entries)
+    def test_purge_command_exclude_orphans_with_referenced_action_plan(
+            self, m_destroy_entries):
+        self.cmd.exclude_orphans = True
+        # The action plan 1 is soft deleted and expired, but one of its
+        # actions is not deleted
+        action = obj_utils.create_test_action(
+            self.context, action_plan_id=self.action_plan1.id,
+            id=self._generate_id(), uuid=utils.generate_uuid())
+
+        with freezegun.freeze_time(self.fake_today):
+            self.cmd.execute()
+
+        destroyed = self._get_destroyed(m_destroy_entries)
+        self.assertNotIn(self.action_plan1.id, destroyed['action_plans'])
+        self.assertNotIn(action.id, destroyed['actions'])
+        self.assertIn(self.action1.id, destroyed['actions'])
+        self.assertEqual(
+            self.action_plan1.uuid,
+            objects.ActionPlan.get_by_uuid(
+                self.context, self.action_plan1.uuid).uuid)
+        self.assertEqual(
+            action.uuid,
+            objects.Action.get_by_uuid(self.context, action.uuid).uuid)
+
+    @mock.patch.object(dbapi.Connection, "destroy_entries")
+    def test_purge_command_dry_run(self, m_destroy_entries):
+        self.cmd.dry_run = True
+
+        with freezegun.freeze_time(self.fake_today):
+            self.cmd.execute()
+
+        self.assertFalse(m_destroy_entries.called)
+        self.assertEqual(1, self.cmd._counts['actions'])
@@ -0,0 +1,107 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from watcher.common import cinder_helper
+from watcher.decision_engine.model.collector import cinder
+from watcher.tests import base
+from watcher.tests import conf_fixture
+
+
+class TestCinderClusterDataModelCollector(base.TestCase):
+
+    def setUp(self):
+        super(TestCinderClusterDataModelCollector, self).setUp()
+        self.useFixture(conf_fixture.ConfReloadFixture())
+
+    @staticmethod
+    def fake_volume(volume_id, pool_name='host@backend#pool'):
+        volume = mock.Mock(
+            id=volume_id,
+            size=1,
+            status='in-use',
+            attachments=[{'server_id': 'server_1',
+                          'attachment_id': 'attachment_1',
+                          'host_name': None}],
+            multiattach=False,
+            snapshot_id=None,
+            metadata={},
+            bootable=False)
+        volume.name = 'name_%s' % volume_id
+        setattr(volume, 'os-vol-host-attr:host', pool_name)
+        setattr(volume, 'os-vol-tenant-attr:tenant_id', 'project_1')
+        return volume
+
+    def _fake_cinder_helper(self, m_cinder_helper_cls):
+        m_cinder_helper = mock.Mock(name="cinder_helper")
+        m_cinder_helper_cls.return_value = m_cinder_helper
+        m_cinder_helper.get_storage_node_list.return_value = [mock.Mock(
+            host='host@backend', zone='zone', state='up', status='enabled')]
+        fake_pool = mock.Mock(
+            total_volumes=2,
+            total_capacity_gb=500,
+            free_capacity_gb=380,
+            provisioned_capacity_gb=120,
+            allocated_capacity_gb=120)
+        fake_pool.name = 'host@backend#pool'
+        m_cinder_helper.get_storage_pool_list.return_value = [fake_pool]
+        m_cinder_helper.get_volume_type_by_backendname.return_value = (
+            'fake_type')
+        return m_cinder_helper
+
+    @mock.patch.object(cinder_helper, 'CinderHelper')
+    def test_cinder_cdmc_execute(self, m_cinder_helper_cls):
+        m_cinder_helper = self._fake_cinder_helper(m_cinder_helper_cls)
+        m_cinder_helper.get_volume_list.return_value = [
+            self.fake_volume('VOLUME_0')]
+
+        m_config = mock.Mock(max_workers=4, volumes_page_size=0)
+        cinder_cdmc = cinder.CinderClusterDataModelCollector(
+            config=m_config, osc=mock.Mock())
+
+        model = cinder_cdmc.execute()
+
+        self.assertEqual(1, len(model.get_all_storage_nodes()))
+        node = model.get_node_by_name('host@backend')
+        self.assertEqual('fake_type', node.volume_type)
+        pool = model.get_pool_by_pool_name('host@backend#pool')
+        self.assertEqual(node, model.get_node_by_pool_name(pool.name))
+        volume = model.get_volume_by_uuid('VOLUME_0')
+        self.assertEqual(pool, model.get_pool_by_volume(volume))
+        self.assertEqual(
+            [{'server_id': 'server_1', 'attachment_id': 'attachment_1'}],
+            volume.attachments)
+        m_cinder_helper.get_volume_type_list.assert_called_once_with()
+        m_cinder_helper.get_volume_list.assert_called_once_with(
+            marker=None, limit=None)
+
+    @mock.patch.object(cinder_helper, 'CinderHelper')
+    def test_model_builder_volumes_pagination(self, m_cinder_helper_cls):
+        m_cinder_helper = self._fake_cinder_helper(m_cinder_helper_cls)
+        fake_volumes = [self.fake_volume('VOLUME_%d' % index)
+                        for index in range(5)]
+        m_cinder_helper.get_volume_list.side_effect = [
+            fake_volumes[:2], fake_volumes[2:4], fake_volumes[4:]]
+
+        builder = cinder.ModelBuilder(
+            mock.Mock(), max_workers=2, volumes_page_size=2)
+        model = builder.execute()
+
+        pool = model.get_pool_by_pool_name('host@backend#pool')
+        self.assertEqual(5, len(model.get_pool_volumes(pool)))
+        m_cinder_helper.get_volume_list.assert_has_calls([
+            mock.call(marker=None, limit=2),
+            mock.call(marker='VOLUME_1', limit=2),
+            mock.call(marker='VOLUME_3', limit=2)])
@@ -17,6 +17,7 @@
 import mock
 
 from watcher.decision_engine.model.collector import base
+from watcher.decision_engine.model.collector import manager
 from watcher.decision_engine.model import model_root
 from watcher.tests import base as test_base
 
@@ -52,3 +53,28 @@ class TestClusterDataModelCollector(test_base.TestCase):
         self.assertIsNot(
             collector.cluster_data_model,
             collector.get_latest_cluster_data_model())
+
+    def test_shared_snapshot_collector_manager(self):
+        m_config = mock.Mock()
+        collector = DummyClusterDataModelCollector(config=m_config)
+        collector.synchronize()
+        collector_manager = manager.SharedSnapshotCollectorManager()
+
+        with mock.patch.object(
+                collector, 'get_latest_cluster_data_model',
+                wraps=collector.get_latest_cluster_data_model) as m_latest:
+            with mock.patch.object(
+                    manager.CollectorManager, 'get_cluster_model_collector',
+                    return_value=collector):
+                model1 = collector_manager.get_latest_cluster_data_model(
+                    'dummy')
+                # The live model changes after the first snapshot
+                collector.synchronize()
+                model2 = collector_manager.get_latest_cluster_data_model(
+                    'dummy')
+
+        m_latest.assert_called_once_with()
+        self.assertIsNot(model1, model2)
+        self.assertTrue(model_root.ModelRoot.is_isomorphic(model1, model2))
+        self.assertIsNot(collector.cluster_data_model, model1)
+        self.assertIsNot(collector.cluster_data_model, model2)
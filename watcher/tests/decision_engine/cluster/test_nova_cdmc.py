@@ -16,11 +16,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
 import mock
+import novaclient.exceptions as nvexceptions
 
+from watcher.common import exception
 from watcher.common import nova_helper
 from watcher.common import utils
 from watcher.decision_engine.model.collector import nova
+from watcher.decision_engine.model.element import compact
+from watcher.decision_engine.model import model_root
 from watcher.tests import base
 from watcher.tests import conf_fixture
 
@@ -36,8 +42,8 @@ class TestNovaClusterDataModelCollector(base.TestCase):
     def test_nova_cdmc_execute(self, m_nova_helper_cls):
         m_nova_helper = mock.Mock(name="nova_helper")
         m_nova_helper_cls.return_value = m_nova_helper
-        m_nova_helper.get_service.return_value = mock.Mock(
-            host="test_hostname")
+        m_nova_helper.get_service_list.return_value = [mock.Mock(
+            id=123, host="test_hostname", status="enabled")]
 
         fake_compute_node = mock.Mock(
             id=1337,
@@ -62,10 +68,11 @@ class TestNovaClusterDataModelCollector(base.TestCase):
         # m_nova_helper.get_instances_by_node.return_value = [fake_instance]
         m_nova_helper.get_instance_list.return_value = [fake_instance]
 
-        m_nova_helper.get_flavor.return_value = utils.Struct(**{
-            'ram': 333, 'disk': 222, 'vcpus': 4})
+        m_nova_helper.get_flavor_list.return_value = [utils.Struct(**{
+            'id': 1, 'ram': 333, 'disk': 222, 'vcpus': 4})]
 
-        m_config = mock.Mock()
+        m_config = mock.Mock(
+            max_workers=4, servers_page_size=0, compact_model=False)
         m_osc = mock.Mock()
 
         nova_cdmc = nova.NovaClusterDataModelCollector(
@@ -84,3 +91,195 @@ class TestNovaClusterDataModelCollector(base.TestCase):
 
         self.assertEqual(node.uuid, 'test_hostname')
         self.assertEqual(instance.uuid, 'ef500f7e-dac8-470f-960c-169486fce71b')
+        self.assertEqual(333, instance.memory)
+        self.assertEqual(4, instance.vcpus)
+        self.assertFalse(m_nova_helper.get_service.called)
+        self.assertFalse(m_nova_helper.get_flavor.called)
+        m_nova_helper.get_instance_list.assert_called_once_with(
+            marker=None, limit=-1)
+
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_model_builder_flavor_cache(self, m_nova_helper_cls):
+        m_nova_helper = mock.Mock(name="nova_helper")
+        m_nova_helper_cls.return_value = m_nova_helper
+        m_nova_helper.get_flavor_list.return_value = [utils.Struct(**{
+            'id': 1, 'ram': 333, 'disk': 222, 'vcpus': 4})]
+        m_nova_helper.get_flavor.side_effect = nvexceptions.NotFound(404)
+
+        builder = nova.ModelBuilder(mock.Mock())
+        builder.flavors = {1: m_nova_helper.get_flavor_list.return_value[0]}
+
+        self.assertEqual(333, builder.get_flavor(1).ram)
+        self.assertIsNone(builder.get_flavor(2))
+        self.assertIsNone(builder.get_flavor(2))
+        m_nova_helper.get_flavor.assert_called_once_with(2)
+
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_model_builder_compact_model(self, m_nova_helper_cls):
+        m_nova_helper = mock.Mock(name="nova_helper")
+        m_nova_helper_cls.return_value = m_nova_helper
+        m_nova_helper.get_service_list.return_value = [mock.Mock(
+            id=123, host="test_hostname", status="enabled")]
+        m_nova_helper.get_compute_node_list.return_value = [mock.Mock(
+            id=1337, service={'id': 123}, hypervisor_hostname='test_hostname',
+            memory_mb=333, free_disk_gb=222, local_gb=111, vcpus=4,
+            state='up', status='enabled')]
+        m_nova_helper.get_flavor_list.return_value = [utils.Struct(**{
+            'id': 1, 'ram': 333, 'disk': 222, 'vcpus': 4})]
+        fake_instance = mock.Mock(
+            id='INSTANCE_0', human_id='fake_instance', flavor={'id': 1},
+            metadata={'hi': 'hello'})
+        setattr(fake_instance, 'OS-EXT-STS:vm_state', 'active')
+        setattr(fake_instance, 'OS-EXT-SRV-ATTR:host', 'test_hostname')
+        m_nova_helper.get_instance_list.return_value = [fake_instance]
+
+        model = nova.ModelBuilder(mock.Mock(), compact_model=True).execute()
+
+        node = model.get_node_by_uuid('test_hostname')
+        instance = model.get_instance_by_uuid('INSTANCE_0')
+        self.assertIsInstance(node, compact.ComputeNode)
+        self.assertIsInstance(instance, compact.Instance)
+        self.assertEqual([instance], model.get_node_instances(node))
+        self.assertEqual({'hi': 'hello'}, instance.metadata)
+        self.assertEqual(
+            dict(vcpus=4, memory=333, disk=222),
+            model.get_node_used_resources(node))
+
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_model_builder_servers_pagination(self, m_nova_helper_cls):
+        m_nova_helper = mock.Mock(name="nova_helper")
+        m_nova_helper_cls.return_value = m_nova_helper
+        m_nova_helper.get_compute_node_list.return_value = []
+        m_nova_helper.get_service_list.return_value = []
+        m_nova_helper.get_flavor_list.return_value = [utils.Struct(**{
+            'id': 1, 'ram': 333, 'disk': 222, 'vcpus': 4})]
+
+        fake_instances = []
+        for index in range(5):
+            fake_instance = mock.Mock(
+                id='INSTANCE_%d' % index, human_id='fake_instance',
+                flavor={'id': 1}, metadata={})
+            setattr(fake_instance, 'OS-EXT-STS:vm_state', 'active')
+            setattr(fake_instance, 'OS-EXT-SRV-ATTR:host', None)
+            fake_instances.append(fake_instance)
+        # Nova returns at most 2 servers per request (osapi_max_limit)
+        m_nova_helper.get_instance_list.side_effect = [
+            fake_instances[:2], fake_instances[2:4], fake_instances[4:], []]
+
+        builder = nova.ModelBuilder(
+            mock.Mock(), max_workers=2, servers_page_size=3)
+        model = builder.execute()
+
+        self.assertEqual(5, len(model.get_all_instances()))
+        m_nova_helper.get_instance_list.assert_has_calls([
+            mock.call(marker=None, limit=3),
+            mock.call(marker='INSTANCE_1', limit=3),
+            mock.call(marker='INSTANCE_3', limit=3),
+            mock.call(marker='INSTANCE_4', limit=3)])
+
+    def _incremental_synchronize(self, m_nova_helper_cls, compact_model):
+        m_nova_helper = mock.Mock(name="nova_helper")
+        m_nova_helper_cls.return_value = m_nova_helper
+        m_nova_helper.get_compute_node_list.return_value = [mock.Mock(
+            id=1337, service={'id': 123}, hypervisor_hostname='hostname_0',
+            memory_mb=333, free_disk_gb=222, local_gb=111, vcpus=4,
+            state='up', status='enabled')]
+        m_nova_helper.get_service_list.return_value = [mock.Mock(
+            id=123, host="hostname_0", status="enabled")]
+        m_nova_helper.get_flavor_list.return_value = []
+        m_nova_helper.get_flavor.return_value = utils.Struct(**{
+            'id': 1, 'ram': 333, 'disk': 222, 'vcpus': 4})
+
+        def fake_server(uuid, vm_state):
+            server = mock.Mock(
+                id=uuid, human_id=uuid, flavor={'id': 1}, metadata={})
+            setattr(server, 'OS-EXT-STS:vm_state', vm_state)
+            setattr(server, 'OS-EXT-SRV-ATTR:host', 'hostname_0')
+            return server
+
+        m_nova_helper.get_instance_list.side_effect = [
+            [fake_server('INSTANCE_0', 'active'),
+             fake_server('INSTANCE_1', 'active')],
+            [fake_server('INSTANCE_0', 'stopped'),
+             fake_server('INSTANCE_1', 'deleted'),
+             fake_server('INSTANCE_2', 'active')],
+        ]
+
+        m_config = mock.Mock(
+            max_workers=1, servers_page_size=0, compact_model=compact_model,
+            incremental_sync=True, full_sync_period=0)
+        nova_cdmc = nova.NovaClusterDataModelCollector(
+            config=m_config, osc=mock.Mock())
+        nova_cdmc.synchronize()
+        nova_cdmc.synchronize()
+        return m_nova_helper, nova_cdmc
+
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_nova_cdmc_incremental_synchronize(self, m_nova_helper_cls):
+        m_nova_helper, nova_cdmc = self._incremental_synchronize(
+            m_nova_helper_cls, compact_model=False)
+
+        model = nova_cdmc.cluster_data_model
+        self.assertEqual(
+            {'INSTANCE_0', 'INSTANCE_2'}, set(model.get_all_instances()))
+        self.assertEqual(
+            'stopped', model.get_instance_by_uuid('INSTANCE_0').state)
+        self.assertEqual(
+            'hostname_0',
+            model.get_node_by_instance_uuid('INSTANCE_2').uuid)
+        self.assertEqual(1, m_nova_helper.get_compute_node_list.call_count)
+        m_nova_helper.get_instance_list.assert_called_with(
+            marker=None, limit=-1,
+            changes_since=nova_cdmc.last_full_sync_time)
+
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_nova_cdmc_incremental_synchronize_compact_model(
+            self, m_nova_helper_cls):
+        _, nova_cdmc = self._incremental_synchronize(
+            m_nova_helper_cls, compact_model=True)
+
+        model = nova_cdmc.cluster_data_model
+        self.assertIsInstance(
+            model.get_instance_by_uuid('INSTANCE_2'), compact.Instance)
+        self.assertIsInstance(
+            model.get_node_by_uuid('hostname_0'), compact.ComputeNode)
+        self.assertIs(compact.Instance,
+                      nova_cdmc.get_latest_cluster_data_model().instance_cls)
+
+    @mock.patch.object(nova_helper, 'NovaHelper')
+    def test_model_updater_servers_pagination(self, m_nova_helper_cls):
+        m_nova_helper = mock.Mock(name="nova_helper")
+        m_nova_helper_cls.return_value = m_nova_helper
+        m_nova_helper.get_flavor.return_value = utils.Struct(**{
+            'id': 1, 'ram': 333, 'disk': 222, 'vcpus': 4})
+        m_nova_helper.get_compute_node_by_hostname.side_effect = (
+            exception.ComputeNodeNotFound(name='hostname_0'))
+
+        fake_servers = []
+        for index in range(5):
+            server = mock.Mock(id='INSTANCE_%d' % index, human_id='server',
+                               flavor={'id': 1}, metadata={})
+            setattr(server, 'OS-EXT-STS:vm_state', 'active')
+            setattr(server, 'OS-EXT-SRV-ATTR:host', 'hostname_0')
+            fake_servers.append(server)
+        # Nova returns at most 2 servers per request (osapi_max_limit)
+        m_nova_helper.get_instance_list.side_effect = [
+            fake_servers[:2], fake_servers[2:4], fake_servers[4:], []]
+
+        m_config = mock.Mock(servers_page_size=3, compact_model=False)
+        nova_cdmc = nova.NovaClusterDataModelCollector(
+            config=m_config, osc=mock.Mock())
+        nova_cdmc._cluster_data_model = model_root.ModelRoot()
+        changes_since = datetime.datetime(2017, 1, 1)
+        nova.ModelUpdater(nova_cdmc).execute(changes_since)
+
+        self.assertEqual(
+            5, len(nova_cdmc.cluster_data_model.get_all_instances()))
+        m_nova_helper.get_instance_list.assert_has_calls([
+            mock.call(marker=None, limit=3, changes_since=changes_since),
+            mock.call(marker='INSTANCE_1', limit=3,
+                      changes_since=changes_since),
+            mock.call(marker='INSTANCE_3', limit=3,
+                      changes_since=changes_since),
+            mock.call(marker='INSTANCE_4', limit=3,
+                      changes_since=changes_since)])
@@ -56,6 +56,20 @@ class FakeCeilometerMetrics(object):
             result = self.get_average_usage_instance_cpu_wb(resource_id)
         return result
 
+    def mock_get_statistics_batch(self, resource_ids, meter_names, period,
+                                  aggregate='avg'):
+        return {resource_id: {
+            meter_name: self.mock_get_statistics(
+                resource_id, meter_name, period, aggregate)
+            for meter_name in meter_names} for resource_id in resource_ids}
+
+    def mock_get_statistics_wb_batch(self, resource_ids, meter_names, period,
+                                     aggregate='avg'):
+        return {resource_id: {
+            meter_name: self.mock_get_statistics_wb(
+                resource_id, meter_name, period, aggregate)
+            for meter_name in meter_names} for resource_id in resource_ids}
+
     def mock_get_statistics_nn(self, resource_id, meter_name, period,
                                aggregate='avg'):
         result = 0.0
@@ -52,6 +52,23 @@ class FakeGnocchiMetrics(object):
             result = self.get_average_usage_instance_cpu_wb(resource_id)
         return result
 
+    def mock_get_statistics_batch(self, resource_ids, metrics, granularity,
+                                  start_time, stop_time, aggregation='mean'):
+        return {resource_id: {
+            metric: self.mock_get_statistics(
+                resource_id, metric, granularity, start_time, stop_time,
+                aggregation)
+            for metric in metrics} for resource_id in resource_ids}
+
+    def mock_get_statistics_wb_batch(self, resource_ids, metrics,
+                                     granularity, start_time, stop_time,
+                                     aggregation='mean'):
+        return {resource_id: {
+            metric: self.mock_get_statistics_wb(
+                resource_id, metric, granularity, start_time, stop_time,
+                aggregation)
+            for metric in metrics} for resource_id in resource_ids}
+
     @staticmethod
     def get_average_outlet_temperature(uuid):
         """The average outlet temperature for host"""
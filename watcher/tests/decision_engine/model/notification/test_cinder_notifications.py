@@ -312,6 +312,9 @@ class TestCinderNotifications(NotificationTestCase):
         pool_1_name = node_1_name + '#pool_0'
         volume_type = 'backend_2'
         m_get_storage_pool_by_name.assert_called_once_with(pool_1_name)
+        # The nodes are listed again to get the latest state of the new one
+        m_cinder = m_cinder_helper.return_value
+        m_cinder.get_storage_node_list.assert_called_once_with()
         m_get_storage_node_by_name.assert_called_once_with(node_1_name)
         m_get_volume_type_by_backendname.assert_called_once_with(volume_type)
         # new node was added
@@ -26,6 +26,7 @@ from watcher.common import exception
 from watcher.common import nova_helper
 from watcher.common import service as watcher_service
 from watcher.decision_engine.model import element
+from watcher.decision_engine.model.element import compact
 from watcher.decision_engine.model.notification import nova as novanotification
 from watcher.tests import base as base_test
 from watcher.tests.decision_engine.model import faker_cluster_state
@@ -233,6 +234,40 @@ class TestNovaNotifications(NotificationTestCase):
         self.assertEqual(974, node_2.disk)
         self.assertEqual(1337, node_2.disk_capacity)
 
+    @mock.patch.object(nova_helper, "NovaHelper")
+    def test_nova_instance_update_notfound_compact_model(
+            self, m_nova_helper_cls):
+        m_get_compute_node_by_hostname = mock.Mock(
+            side_effect=lambda uuid: mock.Mock(
+                id=3, hypervisor_hostname="Node_2", state='up',
+                status='enabled', memory_mb=7777, vcpus=42,
+                free_disk_gb=974, local_gb=1337))
+        m_nova_helper_cls.return_value = mock.Mock(
+            get_compute_node_by_hostname=m_get_compute_node_by_hostname)
+        compute_model = self.fake_cdmc.generate_scenario_3_with_2_nodes()
+        compute_model.node_cls = compact.ComputeNode
+        compute_model.instance_cls = compact.Instance
+        self.fake_cdmc.cluster_data_model = compute_model
+        handler = novanotification.InstanceUpdated(self.fake_cdmc)
+
+        message = self.load_message('scenario3_notfound_instance-update.json')
+        handler.info(
+            ctxt=self.context,
+            publisher_id=message['publisher_id'],
+            event_type=message['event_type'],
+            payload=message['payload'],
+            metadata=self.FAKE_METADATA,
+        )
+
+        instance0 = compute_model.get_instance_by_uuid(
+            '9966d6bd-a45c-4e1c-9d57-3054899a3ec7')
+        self.assertIsInstance(instance0, compact.Instance)
+        self.assertEqual(element.InstanceState.PAUSED.value, instance0.state)
+        self.assertEqual(512, instance0.memory)
+        node_2 = compute_model.get_node_by_uuid('Node_2')
+        self.assertIsInstance(node_2, compact.ComputeNode)
+        self.assertEqual([instance0], compute_model.get_node_instances(node_2))
+
     @mock.patch.object(nova_helper, "NovaHelper")
     def test_instance_update_node_notfound_set_unmapped(
             self, m_nova_helper_cls):
@@ -16,7 +16,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+
+from lxml import etree
+
 from watcher.decision_engine.model import element
+from watcher.decision_engine.model.element import compact
 from watcher.tests import base
 
 
@@ -152,3 +157,76 @@ class TestStorageElement(base.TestCase):
     def test_as_xml_element(self):
         el = self.cls(**self.data)
         el.as_xml_element()
+
+
+class TestCompactElement(base.TestCase):
+
+    scenarios = [
+        ("ComputeNode", dict(
+            cls=compact.ComputeNode,
+            element_cls=element.ComputeNode,
+            data={
+                'uuid': 'FAKE_UUID',
+                'hostname': 'hostname',
+                'human_id': 'human_id',
+                'memory': 111,
+                'vcpus': 222,
+                'disk': 333,
+                'disk_capacity': 444,
+            })),
+        ("Instance", dict(
+            cls=compact.Instance,
+            element_cls=element.Instance,
+            data={
+                'uuid': 'FAKE_UUID',
+                'state': 'state',
+                'human_id': 'human_id',
+                'memory': 111,
+                'vcpus': 222,
+                'disk': 333,
+                'disk_capacity': 444,
+                'metadata': '{"key": "value"}',
+            })),
+    ]
+
+    def test_is_element(self):
+        el = self.cls(**self.data)
+        self.assertIsInstance(el, self.element_cls)
+
+    def test_as_dict(self):
+        el = self.cls(**self.data)
+        self.assertEqual(self.element_cls(**self.data).as_dict(),
+                         el.as_dict())
+
+    def test_as_xml_element(self):
+        el = self.cls(**self.data)
+        self.assertEqual(
+            etree.tostring(self.element_cls(**self.data).as_xml_element()),
+            etree.tostring(el.as_xml_element()))
+
+    def test_fields_are_coerced(self):
+        el = self.cls(**self.data)
+        el.vcpus = '10'
+        self.assertEqual(10, el.vcpus)
+        self.assertRaises(ValueError, setattr, el, 'vcpus', -1)
+
+    def test_copy(self):
+        el = self.cls(**self.data)
+        clone = copy.copy(el)
+        self.assertEqual(el, clone)
+
+        clone.update({'vcpus': 1})
+        self.assertEqual(222, el.vcpus)
+        self.assertEqual(1, clone['vcpus'])
+        self.assertNotEqual(el, clone)
+
+    def test_deepcopy(self):
+        el = self.cls(**self.data)
+        self.assertEqual(el, copy.deepcopy(el))
+
+    def test_hostname_is_kept(self):
+        # The notification handlers set the hostname of both kinds of element
+        el = self.cls(**self.data)
+        el.update({'hostname': 'other_hostname'})
+        self.assertEqual('other_hostname', copy.copy(el).hostname)
+        self.assertEqual('other_hostname', copy.deepcopy(el).hostname)
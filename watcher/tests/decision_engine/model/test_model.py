@@ -16,12 +16,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+import io
 import os
+import threading
 
+import mock
 from oslo_utils import uuidutils
 
 from watcher.common import exception
+from watcher.decision_engine.model import base as model_base
 from watcher.decision_engine.model import element
+from watcher.decision_engine.model.element import compact
 from watcher.decision_engine.model import model_root
 from watcher.tests import base
 from watcher.tests.decision_engine.model import faker_cluster_state
@@ -63,6 +69,38 @@ class TestModel(base.TestCase):
         model = model_root.ModelRoot.from_xml(struct_str)
         self.assertEqual(expected_model.to_string(), model.to_string())
 
+    def test_write_xml(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.build_scenario_1()
+
+        stream = io.BytesIO()
+        model.write_xml(stream)
+
+        self.assertEqual(model.to_xml(), stream.getvalue().decode('utf-8'))
+        self.assertTrue(model_root.ModelRoot.is_isomorphic(
+            model, model_root.ModelRoot.from_xml(stream.getvalue())))
+
+    def test_to_summary(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.build_scenario_1()
+
+        self.assertEqual(
+            "ModelRoot: 5 compute nodes, 35 instances (27 unmapped)",
+            model.to_summary())
+
+    def test_model_dump_is_lazy(self):
+        model = mock.Mock(spec=model_root.ModelRoot)
+        model.to_string.return_value = "<ModelRoot />"
+        model.to_summary.return_value = "ModelRoot: summary"
+
+        dump = model_base.ModelDump(model)
+        summary_dump = model_base.ModelDump(model, summary=True)
+        self.assertFalse(model.to_string.called)
+        self.assertFalse(model.to_summary.called)
+
+        self.assertEqual("<ModelRoot />", str(dump))
+        self.assertEqual("ModelRoot: summary", str(summary_dump))
+
     def test_get_node_by_instance_uuid(self):
         model = model_root.ModelRoot()
         uuid_ = "{0}".format(uuidutils.generate_uuid())
@@ -122,6 +160,164 @@ class TestModel(base.TestCase):
         node.state = element.ServiceState.OFFLINE.value
         self.assertIn(node.state, [el.value for el in element.ServiceState])
 
+    def test_snapshot_is_isolated(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.build_scenario_1()
+        expected_struct_str = model.to_string()
+
+        snapshot = model.snapshot()
+        self.assertTrue(model_root.ModelRoot.is_isomorphic(model, snapshot))
+
+        instance = snapshot.get_instance_by_uuid("INSTANCE_0")
+        source_node = snapshot.get_node_by_instance_uuid(instance.uuid)
+        destination_node = snapshot.get_node_by_uuid("Node_1")
+        instance.state = element.InstanceState.STOPPED.value
+        snapshot.migrate_instance(instance, source_node, destination_node)
+        snapshot.remove_node(snapshot.get_node_by_uuid("Node_4"))
+
+        self.assertEqual(expected_struct_str, model.to_string())
+        self.assertEqual(
+            "Node_0", model.get_node_by_instance_uuid("INSTANCE_0").uuid)
+        self.assertEqual(
+            "Node_1", snapshot.get_node_by_instance_uuid("INSTANCE_0").uuid)
+        self.assertEqual(
+            element.InstanceState.ACTIVE.value,
+            model.get_instance_by_uuid("INSTANCE_0").state)
+
+    def test_snapshot_keeps_element_classes(self):
+        model = model_root.ModelRoot(
+            node_cls=compact.ComputeNode, instance_cls=compact.Instance)
+
+        snapshot = model.snapshot()
+        self.assertIs(compact.ComputeNode, snapshot.node_cls)
+        self.assertIs(compact.Instance, snapshot.instance_cls)
+
+    def test_snapshot_is_not_affected_by_model_updates(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.build_scenario_1()
+        snapshot = model.snapshot()
+        expected_struct_str = snapshot.to_string()
+
+        node = model.get_node_by_uuid("Node_0")
+        node.state = element.ServiceState.OFFLINE.value
+        instance = model.get_instance_by_uuid("INSTANCE_0")
+        model.delete_instance(instance)
+
+        self.assertEqual(expected_struct_str, snapshot.to_string())
+        self.assertEqual(
+            element.ServiceState.ONLINE.value,
+            snapshot.get_node_by_uuid("Node_0").state)
+
+    def test_concurrent_reads(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.build_scenario_1()
+        snapshot = model.snapshot()
+        results = []
+
+        def read_model():
+            results.append(len(model.get_all_instances()))
+            results.append(len(snapshot.get_all_instances()))
+
+        with model._lock.read_lock():
+            reader = threading.Thread(target=read_model)
+            reader.start()
+            reader.join(5)
+
+        self.assertEqual([35, 35], results)
+
+    def test_model_locks_are_independent(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.build_scenario_1()
+        snapshot = model.snapshot()
+        results = []
+
+        def read_snapshot():
+            results.append(len(snapshot.get_all_instances()))
+
+        with model._lock.write_lock():
+            reader = threading.Thread(target=read_snapshot)
+            reader.start()
+            reader.join(5)
+
+        self.assertEqual([35], results)
+
+    def test_deepcopy(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.build_scenario_1()
+
+        model_copy = copy.deepcopy(model)
+
+        self.assertIsNot(model._lock, model_copy._lock)
+        self.assertEqual(model.to_string(), model_copy.to_string())
+
+    def _get_summed_node_usage(self, model, node):
+        instances = model.get_node_instances(node)
+        return dict(vcpus=sum(inst.vcpus for inst in instances),
+                    memory=sum(inst.memory for inst in instances),
+                    disk=sum(inst.disk for inst in instances))
+
+    def test_get_node_used_resources(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.generate_scenario_1()
+
+        for node in model.get_all_compute_nodes().values():
+            self.assertEqual(self._get_summed_node_usage(model, node),
+                             model.get_node_used_resources(node))
+
+    def test_get_node_free_resources(self):
+        model = model_root.ModelRoot()
+        node = element.ComputeNode(uuid="Node_0", memory=64, disk=100,
+                                   disk_capacity=250, vcpus=40)
+        instance = element.Instance(uuid="INSTANCE_0", memory=2, disk=20,
+                                    disk_capacity=20, vcpus=10)
+        model.add_node(node)
+        model.add_instance(instance)
+        model.map_instance(instance, node)
+
+        self.assertEqual(dict(vcpus=30, memory=62, disk=230),
+                         model.get_node_free_resources(node))
+
+    def test_node_used_resources_are_updated(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.build_scenario_1()
+        node_0 = model.get_node_by_uuid("Node_0")
+        node_1 = model.get_node_by_uuid("Node_1")
+        node_4 = model.get_node_by_uuid("Node_4")
+        instance_0 = model.get_instance_by_uuid("INSTANCE_0")
+        instance_1 = model.get_instance_by_uuid("INSTANCE_1")
+        instance_2 = model.get_instance_by_uuid("INSTANCE_2")
+
+        model.migrate_instance(instance_0, node_0, node_1)
+        model.unmap_instance(instance_1, node_0)
+        model.delete_instance(instance_2)
+        model.remove_node(node_4)
+        instance_3 = model.get_instance_by_uuid("INSTANCE_3")
+        instance_3.vcpus += 1
+        model.map_instance(instance_3, model.get_node_by_uuid("Node_2"))
+
+        for node in model.get_all_compute_nodes().values():
+            self.assertEqual(self._get_summed_node_usage(model, node),
+                             model.get_node_used_resources(node))
+        self.assertEqual(dict(vcpus=0, memory=0, disk=0),
+                         model.get_node_used_resources(node_4))
+
+    def test_snapshot_node_used_resources_are_isolated(self):
+        fake_cluster = faker_cluster_state.FakerModelCollector()
+        model = fake_cluster.build_scenario_1()
+        expected_usage = model.get_node_used_resources(
+            model.get_node_by_uuid("Node_1"))
+
+        snapshot = model.snapshot()
+        snapshot.migrate_instance(
+            snapshot.get_instance_by_uuid("INSTANCE_0"),
+            snapshot.get_node_by_uuid("Node_0"),
+            snapshot.get_node_by_uuid("Node_1"))
+
+        self.assertEqual(expected_usage, model.get_node_used_resources(
+            model.get_node_by_uuid("Node_1")))
+        self.assertNotEqual(expected_usage, snapshot.get_node_used_resources(
+            snapshot.get_node_by_uuid("Node_1")))
+
     def test_node_from_uuid_raise(self):
         model = model_root.ModelRoot()
         uuid_ = "{0}".format(uuidutils.generate_uuid())
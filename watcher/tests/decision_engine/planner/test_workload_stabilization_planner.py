@@ -185,9 +185,7 @@ class TestActionScheduling(base.DbTestCase):
                 assert not m_nova.called
         self.assertEqual(2, m_create_action.call_count)
 
-    @mock.patch.object(nova_helper.NovaHelper, 'get_instance_by_uuid')
-    def test_schedule_migrate_resize_actions(self, mock_nova):
-        mock_nova.return_value = 'server1'
+    def test_schedule_migrate_resize_actions(self):
         solution = dsol.DefaultSolution(
             goal=mock.Mock(), strategy=self.strategy)
 
@@ -211,7 +209,7 @@ class TestActionScheduling(base.DbTestCase):
                 self.planner.config.weights = {'migrate': 3, 'resize': 2}
                 action_plan = self.planner.schedule(
                     self.context, self.audit.id, solution)
-                self.assertEqual(1, m_nova.call_count)
+                self.assertFalse(m_nova.called)
         self.assertIsNotNone(action_plan.uuid)
         self.assertEqual(2, m_create_action.call_count)
         # check order
@@ -257,9 +255,8 @@ class TestActionScheduling(base.DbTestCase):
                 wraps=self.planner.create_action
         ) as m_create_action:
             with mock.patch.object(
-                    nova_helper, 'NovaHelper') as m_nova:
-                m_nova().get_hostname.return_value = 'server1'
-                m_nova().get_instance_by_uuid.return_value = ['uuid1']
+                    nova_helper, 'NovaHelper') as m_nova, mock.patch.object(
+                    objects.Action, 'get_by_uuid') as m_get_by_uuid:
                 self.planner.config.weights = {
                     'turn_host_to_acpi_s3_state': 0,
                     'resize': 1,
@@ -269,7 +266,8 @@ class TestActionScheduling(base.DbTestCase):
                     'nop': 5}
                 action_plan = self.planner.schedule(
                     self.context, self.audit.id, solution)
-                self.assertEqual(3, m_nova.call_count)
+                self.assertFalse(m_nova.called)
+                self.assertFalse(m_get_by_uuid.called)
         self.assertIsNotNone(action_plan.uuid)
         self.assertEqual(5, m_create_action.call_count)
         # check order
@@ -285,6 +283,60 @@ class TestActionScheduling(base.DbTestCase):
                 parent_migration = action
                 break
         self.assertEqual(parent_migration.uuid, actions[3].parents[0])
+        # The first migration is done before the resize, the others are
+        # directly awaited by the host
+        self.assertEqual(
+            sorted([actions[3].uuid] + [
+                a.uuid for a in actions[:3] if a.uuid != parent_migration.uuid
+                and a.input_parameters['source_node'] == 'server1']),
+            sorted(actions[4].parents))
+
+    def test_schedule_resize_actions_host_from_model(self):
+        solution = dsol.DefaultSolution(
+            goal=mock.Mock(), strategy=self.strategy)
+        solution.model = (
+            faker_cluster_state.FakerModelCollector().generate_scenario_1())
+        solution.add_action(action_type="resize",
+                            resource_id="INSTANCE_0",
+                            input_parameters={'flavor': 'x1'})
+        solution.add_action(action_type="turn_host_to_acpi_s3_state",
+                            resource_id="Node_0",
+                            input_parameters={})
+
+        with mock.patch.object(nova_helper, 'NovaHelper') as m_nova:
+            self.planner.config.weights = {
+                'turn_host_to_acpi_s3_state': 0,
+                'resize': 1}
+            action_plan = self.planner.schedule(
+                self.context, self.audit.id, solution)
+            self.assertFalse(m_nova.called)
+
+        filters = {'action_plan_id': action_plan.id}
+        actions = objects.Action.dbapi.get_action_list(self.context, filters)
+        self.assertEqual("resize", actions[0].action_type)
+        self.assertEqual("turn_host_to_acpi_s3_state", actions[1].action_type)
+        self.assertEqual([actions[0].uuid], actions[1].parents)
+
+    def test_get_instance_nodes(self):
+        solution = dsol.DefaultSolution(
+            goal=mock.Mock(), strategy=self.strategy)
+        solution.model = (
+            faker_cluster_state.FakerModelCollector().generate_scenario_1())
+        solution.add_action(action_type="migrate",
+                            resource_id="INSTANCE_1",
+                            input_parameters={"source_node": "server1",
+                                              "destination_node": "server2"})
+        solution.add_action(action_type="migrate",
+                            resource_id="INSTANCE_1",
+                            input_parameters={"source_node": "server2",
+                                              "destination_node": "server3"})
+        for instance_uuid in ("INSTANCE_0", "INSTANCE_1", "unknown"):
+            solution.add_action(action_type="resize",
+                                resource_id=instance_uuid,
+                                input_parameters={'flavor': 'x1'})
+
+        self.assertEqual({"INSTANCE_0": "Node_0", "INSTANCE_1": "server1"},
+                         self.planner.get_instance_nodes(solution))
 
 
 class TestDefaultPlanner(base.DbTestCase):
@@ -364,6 +416,19 @@ class TestActionValidator(base.DbTestCase):
         result = resize_object.validate_parents(resource_action_map, action)
         self.assertEqual('action_uuid', result[0])
 
+    def test_resize_validate_parents_with_instance_nodes(self):
+        resize_object = pbase.ResizeActionValidator(
+            {self.INSTANCE_UUID: 'server1'})
+        action = {'uuid': 'fcec56cd-74c1-406b-a7c1-81ef9f0c1393',
+                  'input_parameters': {'resource_id': self.INSTANCE_UUID}}
+        resource_action_map = {}
+        result = resize_object.validate_parents(resource_action_map, action)
+        self.assertEqual([], result)
+        self.assertEqual(
+            {'server1': [('fcec56cd-74c1-406b-a7c1-81ef9f0c1393', 'resize')]},
+            resource_action_map)
+        self.assertFalse(self.r_helper_cls.called)
+
     def test_migrate_validate_parents(self):
         migrate_object = pbase.MigrationActionValidator()
         action = {'uuid': '712f1701-4c1b-4076-bfcf-3f23cfec6c3b',
@@ -58,3 +58,104 @@ class TestDefaultSolution(base.TestCase):
                          solution.actions[0].get('action_type'))
         self.assertEqual(expected_parameters,
                          solution.actions[0].get('input_parameters'))
+
+    def test_default_solution_drops_duplicate_actions(self):
+        solution = default.DefaultSolution(
+            goal=mock.Mock(), strategy=mock.Mock())
+        for _ in range(2):
+            parameters = {"source_node": "server1",
+                          "destination_node": "server2",
+                          "hosts": ["a", "b"]}
+            solution.add_action(action_type="migrate",
+                                resource_id="INSTANCE_1",
+                                input_parameters=parameters)
+        solution.add_action(action_type="nop", resource_id="INSTANCE_1")
+        self.assertEqual(2, len(solution.actions))
+
+    def test_default_solution_get_actions(self):
+        solution = default.DefaultSolution(
+            goal=mock.Mock(), strategy=mock.Mock())
+        solution.add_action(action_type="migrate", resource_id="INSTANCE_1",
+                            input_parameters={"destination_node": "server2"})
+        solution.add_action(action_type="nop", resource_id="INSTANCE_1")
+        solution.add_action(action_type="migrate", resource_id="INSTANCE_2",
+                            input_parameters={"destination_node": "server2"})
+        solution.add_action(action_type="sleep",
+                            input_parameters={"duration": 1})
+
+        self.assertEqual(
+            ["migrate", "nop"],
+            [a["action_type"] for a in solution.get_actions("INSTANCE_1")])
+        self.assertEqual(
+            ["INSTANCE_1", "INSTANCE_2"],
+            [a["input_parameters"]["resource_id"]
+             for a in solution.get_actions(action_type="migrate")])
+        self.assertEqual(
+            1, len(solution.get_actions("INSTANCE_2", "migrate")))
+        self.assertEqual([], solution.get_actions("INSTANCE_2", "nop"))
+        self.assertEqual([], solution.get_actions("INSTANCE_3"))
+        self.assertEqual(4, len(solution.get_actions()))
+        self.assertEqual(["INSTANCE_1", "INSTANCE_2"],
+                         solution.get_resource_ids())
+        self.assertEqual(["INSTANCE_1"], solution.get_resource_ids("nop"))
+
+    def test_default_solution_remove_action(self):
+        solution = default.DefaultSolution(
+            goal=mock.Mock(), strategy=mock.Mock())
+        solution.add_action(action_type="nop", resource_id="INSTANCE_1")
+        solution.add_action(action_type="nop", resource_id="INSTANCE_2")
+        action = solution.actions[0]
+
+        self.assertTrue(solution.remove_action(action))
+        self.assertFalse(solution.remove_action(action))
+        self.assertEqual(["INSTANCE_2"], solution.get_resource_ids())
+        self.assertEqual([], solution.get_actions("INSTANCE_1"))
+        # The removed action can be added again
+        solution.add_action(action_type="nop", resource_id="INSTANCE_1")
+        self.assertEqual(2, len(solution.actions))
+
+    def _add_migration(self, solution, resource_id, source, destination):
+        solution.add_action(action_type="migrate", resource_id=resource_id,
+                            input_parameters={"migration_type": "live",
+                                              "source_node": source,
+                                              "destination_node": destination})
+
+    def test_default_solution_collapse_chain(self):
+        solution = default.DefaultSolution(
+            goal=mock.Mock(), strategy=mock.Mock())
+        self._add_migration(solution, "INSTANCE_1", "A", "B")
+        self._add_migration(solution, "INSTANCE_2", "A", "C")
+        self._add_migration(solution, "INSTANCE_1", "B", "C")
+
+        self.assertEqual(1, solution.collapse_chain("INSTANCE_1", "migrate"))
+        self.assertEqual(0, solution.collapse_chain("INSTANCE_2", "migrate"))
+        self.assertEqual(
+            [{"action_type": "migrate",
+              "input_parameters": {"migration_type": "live",
+                                   "source_node": "A",
+                                   "destination_node": "C",
+                                   "resource_id": "INSTANCE_2"}},
+             {"action_type": "migrate",
+              "input_parameters": {"migration_type": "live",
+                                   "source_node": "A",
+                                   "destination_node": "C",
+                                   "resource_id": "INSTANCE_1"}}],
+            solution.actions)
+
+    def test_default_solution_collapse_chains_cancel_out(self):
+        solution = default.DefaultSolution(
+            goal=mock.Mock(), strategy=mock.Mock())
+        self._add_migration(solution, "INSTANCE_1", "A", "B")
+        self._add_migration(solution, "INSTANCE_2", "A", "B")
+        self._add_migration(solution, "INSTANCE_2", "B", "C")
+        solution.add_action(action_type="nop", resource_id="INSTANCE_1")
+        self._add_migration(solution, "INSTANCE_1", "B", "A")
+
+        self.assertEqual(3, solution.collapse_chains("migrate"))
+        self.assertEqual([], solution.get_actions("INSTANCE_1", "migrate"))
+        self.assertEqual(1, len(solution.get_actions("INSTANCE_1")))
+        self.assertEqual(
+            [("A", "C")],
+            [(a["input_parameters"]["source_node"],
+              a["input_parameters"]["destination_node"])
+             for a in solution.get_actions("INSTANCE_2")])
@@ -0,0 +1,60 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import mock
+
+from watcher.decision_engine.solution import efficacy
+from watcher.decision_engine.solution import solution_comparator
+from watcher.decision_engine.solution import solution_evaluator
+from watcher.tests import base
+
+
+def fake_solution(value=None):
+    global_efficacy = None
+    if value is not None:
+        global_efficacy = efficacy.Indicator(
+            name="released_nodes_ratio", description="", unit="%",
+            value=value)
+    return mock.Mock(global_efficacy=global_efficacy)
+
+
+class TestGlobalEfficacyEvaluator(base.TestCase):
+
+    def test_evaluate(self):
+        evaluator = solution_evaluator.GlobalEfficacyEvaluator()
+        self.assertEqual(42, evaluator.evaluate(fake_solution(42)))
+        self.assertIsNone(evaluator.evaluate(fake_solution()))
+
+
+class TestGlobalEfficacyComparator(base.TestCase):
+
+    def setUp(self):
+        super(TestGlobalEfficacyComparator, self).setUp()
+        self.comparator = solution_comparator.GlobalEfficacyComparator()
+
+    def test_compare(self):
+        self.assertGreater(
+            self.comparator.compare(fake_solution(50), fake_solution(10)), 0)
+        self.assertLess(
+            self.comparator.compare(fake_solution(10), fake_solution(50)), 0)
+        self.assertEqual(
+            0, self.comparator.compare(fake_solution(10), fake_solution(10)))
+
+    def test_compare_without_global_efficacy(self):
+        self.assertGreater(
+            self.comparator.compare(fake_solution(0), fake_solution()), 0)
+        self.assertLess(
+            self.comparator.compare(fake_solution(), fake_solution(0)), 0)
+        self.assertEqual(
+            0, self.comparator.compare(fake_solution(), fake_solution()))
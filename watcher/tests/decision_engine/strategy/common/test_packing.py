@@ -0,0 +1,99 @@
+# -*- encoding: utf-8 -*-
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+
+from watcher.decision_engine.strategy.common import packing
+from watcher.tests import base
+
+
+class TestFirstFitIndex(base.TestCase):
+
+    def setUp(self):
+        super(TestFirstFitIndex, self).setUp()
+        self.free = {
+            'bin_0': {'cpu': 4, 'ram': 10},
+            'bin_1': {'cpu': 1, 'ram': 40},
+            'bin_2': {'cpu': 8, 'ram': 20},
+            'bin_3': {'cpu': 2, 'ram': 5},
+            'bin_4': {'cpu': 6, 'ram': 30},
+        }
+        self.index = packing.FirstFitIndex(
+            sorted(self.free), ['cpu', 'ram'], self.free.get)
+
+    def fits(self, demand):
+        return lambda bin_: all(demand[resource] <= self.free[bin_][resource]
+                                for resource in demand)
+
+    def test_find_last(self):
+        demand = {'cpu': 4, 'ram': 10}
+        self.assertEqual(4, self.index.find_last(demand, self.fits(demand)))
+
+    def test_find_last_several_resources(self):
+        demand = {'cpu': 7, 'ram': 10}
+        self.assertEqual(2, self.index.find_last(demand, self.fits(demand)))
+        demand = {'cpu': 1, 'ram': 35}
+        self.assertEqual(1, self.index.find_last(demand, self.fits(demand)))
+
+    def test_find_last_none(self):
+        demand = {'cpu': 8, 'ram': 30}
+        self.assertIsNone(self.index.find_last(demand, self.fits(demand)))
+
+    def test_find_last_first(self):
+        demand = {'cpu': 4, 'ram': 10}
+        self.assertEqual(
+            4, self.index.find_last(demand, self.fits(demand), first=3))
+        self.assertIsNone(
+            self.index.find_last(demand, self.fits(demand), first=5))
+
+    def test_find_last_predicate(self):
+        demand = {'cpu': 4, 'ram': 10}
+        self.assertEqual(2, self.index.find_last(
+            demand, lambda bin_: bin_ in ('bin_0', 'bin_2')))
+
+    def test_update(self):
+        demand = {'cpu': 4, 'ram': 10}
+        self.free['bin_4'] = {'cpu': 0, 'ram': 0}
+        self.index.update(4)
+        self.assertEqual(2, self.index.find_last(demand, self.fits(demand)))
+        self.free['bin_3'] = {'cpu': 4, 'ram': 10}
+        self.index.update(3)
+        self.assertEqual(3, self.index.find_last(demand, self.fits(demand)))
+
+    def test_same_as_linear_search(self):
+        generator = random.Random(42)
+        free = [{'cpu': generator.randint(0, 16), 'ram': generator.random()}
+                for _ in range(100)]
+        index = packing.FirstFitIndex(
+            range(len(free)), ['cpu', 'ram'], free.__getitem__)
+
+        for _ in range(200):
+            demand = {'cpu': generator.randint(0, 16),
+                      'ram': generator.random()}
+            first = generator.randint(0, len(free))
+
+            def fits(position):
+                return all(demand[resource] <= free[position][resource]
+                           for resource in demand)
+
+            expected = next(
+                (position for position in reversed(range(first, len(free)))
+                 if fits(position)), None)
+            position = index.find_last(demand, fits, first=first)
+            self.assertEqual(expected, position)
+            if position is not None:
+                free[position] = {
+                    resource: free[position][resource] - demand[resource]
+                    for resource in demand}
+                index.update(position)
@@ -14,15 +14,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
 import mock
 
+from watcher.common import exception
 from watcher.common import utils
 from watcher.decision_engine.model.collector import manager
 from watcher.decision_engine.solution import default
+from watcher.decision_engine.solution import efficacy
 from watcher.decision_engine.strategy.context import default as d_strategy_ctx
 from watcher.decision_engine.strategy.selection import default as d_selector
 from watcher.decision_engine.strategy import strategies
 from watcher.tests.db import base
+from watcher.tests.decision_engine.model import faker_cluster_state
 from watcher.tests.objects import utils as obj_utils
 
 
@@ -97,3 +101,170 @@ class TestStrategyContext(base.DbTestCase):
         solution = self.strategy_context.execute_strategy(audit, self.context)
 
         self.assertEqual(solution, expected_strategy)
+
+
+class TestStrategyContextEvaluateAll(base.DbTestCase):
+
+    def setUp(self):
+        super(TestStrategyContextEvaluateAll, self).setUp()
+        self.config(evaluate_all_strategies=True, strategy_timeout=5,
+                    group='watcher_decision_engine')
+        goal = obj_utils.create_test_goal(self.context, id=1, name="dummy")
+        self.audit = obj_utils.create_test_audit(
+            self.context, goal_id=goal.id, strategy_id=None,
+            uuid=utils.generate_uuid())
+        self.strategy_context = d_strategy_ctx.DefaultStrategyContext()
+        self.running = []
+        self.concurrency = []
+        self.finished = []
+
+    def _fake_strategy(self, name, value=None, error=None, blocked=False):
+        strategy = strategies.DummyStrategy(config=mock.Mock())
+        strategy._name = name
+
+        def execute():
+            self.running.append(name)
+            self.concurrency.append(len(self.running))
+            try:
+                return run()
+            finally:
+                self.running.remove(name)
+
+        def run():
+            if blocked:
+                eventlet.sleep(10)
+            self.finished.append(name)
+            if error:
+                raise error
+            if value is not None:
+                strategy.solution.efficacy.global_efficacy = (
+                    efficacy.Indicator(name="fake", description="",
+                                       unit="%", value=value))
+            return strategy.solution
+
+        strategy.execute = execute
+        return strategy
+
+    @mock.patch.object(d_selector.DefaultStrategySelector, 'select_all')
+    def test_execute_best_strategy(self, m_select_all):
+        m_select_all.return_value = [
+            self._fake_strategy("first", value=10),
+            self._fake_strategy("best", value=50),
+            self._fake_strategy("unclassified"),
+            self._fake_strategy("same", value=50)]
+
+        solution = self.strategy_context.execute_strategy(
+            self.audit, self.context)
+
+        self.assertEqual("best", solution.strategy.name)
+
+    @mock.patch.object(d_selector.DefaultStrategySelector, 'select_all')
+    def test_execute_strategies_errors_and_timeouts(self, m_select_all):
+        self.config(strategy_timeout=1, group='watcher_decision_engine')
+        m_select_all.return_value = [
+            self._fake_strategy("slow", value=90, blocked=True),
+            self._fake_strategy("failing", error=Exception("boom")),
+            self._fake_strategy("other", value=10)]
+
+        solution = self.strategy_context.execute_strategy(
+            self.audit, self.context)
+
+        self.assertEqual("other", solution.strategy.name)
+        # The slow strategy was interrupted
+        self.assertNotIn("slow", self.finished)
+
+    @mock.patch.object(d_selector.DefaultStrategySelector, 'select_all')
+    def test_execute_strategies_no_solution(self, m_select_all):
+        self.config(strategy_timeout=1, group='watcher_decision_engine')
+        m_select_all.return_value = [
+            self._fake_strategy("slow", value=90, blocked=True),
+            self._fake_strategy("failing", error=Exception("boom"))]
+
+        self.assertRaises(exception.NoSolutionForGoal,
+                          self.strategy_context.execute_strategy,
+                          self.audit, self.context)
+
+    @mock.patch.object(d_selector.DefaultStrategySelector, 'select_all')
+    def test_execute_strategies_all_failing(self, m_select_all):
+        m_select_all.return_value = [
+            self._fake_strategy("failing", error=Exception("boom")),
+            self._fake_strategy("other", error=ValueError("bang"))]
+
+        self.assertRaisesRegex(ValueError, "bang",
+                               self.strategy_context.execute_strategy,
+                               self.audit, self.context)
+
+    @mock.patch.object(d_selector.DefaultStrategySelector, 'select_all')
+    def test_execute_strategies_max_workers(self, m_select_all):
+        self.config(strategy_timeout=1, max_workers=1,
+                    group='watcher_decision_engine')
+        m_select_all.return_value = [
+            self._fake_strategy("slow", value=90, blocked=True),
+            self._fake_strategy("other", value=10)]
+
+        solution = self.strategy_context.execute_strategy(
+            self.audit, self.context)
+
+        # The other strategy got its own time once the slow one timed out
+        self.assertEqual("other", solution.strategy.name)
+        self.assertEqual([1, 1], self.concurrency)
+
+    @mock.patch.object(d_selector.DefaultStrategySelector, 'select_all')
+    @mock.patch.object(d_selector.DefaultStrategySelector, 'select')
+    def test_execute_forced_strategy_not_evaluated(
+            self, m_select, m_select_all):
+        strategy = obj_utils.create_test_strategy(
+            self.context, id=42, uuid=utils.generate_uuid(), name="dummy")
+        audit = obj_utils.create_test_audit(
+            self.context, id=2, strategy_id=strategy.id,
+            uuid=utils.generate_uuid())
+        m_select.return_value = self._fake_strategy("dummy")
+
+        self.strategy_context.execute_strategy(audit, self.context)
+
+        self.assertFalse(m_select_all.called)
+
+    @mock.patch.object(manager.CollectorManager,
+                       "get_latest_cluster_data_model")
+    @mock.patch.object(d_selector.DefaultStrategySelector, 'select_all')
+    def test_execute_strategies_share_models(self, m_select_all, m_latest):
+        m_latest.return_value = (
+            faker_cluster_state.FakerModelCollector().generate_scenario_1())
+        fake_strategies = [
+            strategies.DummyStrategy(config=mock.Mock()) for _ in range(2)]
+        m_select_all.return_value = fake_strategies
+
+        self.strategy_context.execute_strategy(self.audit, self.context)
+
+        for strategy in fake_strategies:
+            self.assertIsInstance(strategy.collector_manager,
+                                  manager.SharedSnapshotCollectorManager)
+            self.assertIsNot(m_latest.return_value, strategy.compute_model)
+        self.assertIs(fake_strategies[0].collector_manager,
+                      fake_strategies[1].collector_manager)
+        m_latest.assert_called_once_with('compute', osc=mock.ANY)
+
+    @mock.patch.object(manager.CollectorManager,
+                       "get_latest_cluster_data_model")
+    @mock.patch.object(d_selector.DefaultStrategySelector, 'select_all')
+    def test_execute_strategies_model_locked(self, m_select_all, m_latest):
+        model = faker_cluster_state.FakerModelCollector().generate_scenario_1()
+        m_latest.return_value = model
+        fake_strategies = [
+            strategies.DummyStrategy(config=mock.Mock()) for _ in range(2)]
+        for strategy in fake_strategies:
+            strategy.pre_execute = mock.Mock(
+                side_effect=lambda strategy=strategy: strategy.compute_model)
+        m_select_all.return_value = fake_strategies
+
+        def hold_lock():
+            with model._lock.write_lock():
+                eventlet.sleep(0.5)
+
+        holder = eventlet.spawn(hold_lock)
+        eventlet.sleep(0)
+        solution = self.strategy_context.execute_strategy(
+            self.audit, self.context)
+
+        self.assertTrue(holder.dead)
+        self.assertIsInstance(solution, default.DefaultSolution)
@@ -60,3 +60,35 @@ class TestStrategySelector(base.TestCase):
         strategy_selector = default_selector.DefaultStrategySelector("dummy")
         self.assertRaises(exception.NoAvailableStrategyForGoal,
                           strategy_selector.select)
+
+    @mock.patch.object(default_loader.DefaultStrategyLoader, 'load')
+    @mock.patch.object(default_loader.DefaultStrategyLoader, 'list_available')
+    def test_select_all_with_goal_name_only(self, m_list_available, m_load):
+        m_list_available.return_value = {
+            "dummy": strategies.DummyStrategy,
+            "dummy_with_scorer": strategies.DummyWithScorer,
+            "basic": strategies.BasicConsolidation}
+        strategy_selector = default_selector.DefaultStrategySelector(
+            "dummy", osc=None)
+        selected = strategy_selector.select_all()
+        self.assertEqual(2, len(selected))
+        m_load.assert_has_calls([mock.call("dummy", osc=None),
+                                 mock.call("dummy_with_scorer", osc=None)],
+                                any_order=True)
+
+    @mock.patch.object(default_loader.DefaultStrategyLoader, 'load')
+    @mock.patch.object(default_loader.DefaultStrategyLoader, 'list_available')
+    def test_select_all_with_strategy_name(self, m_list_available, m_load):
+        strategy_selector = default_selector.DefaultStrategySelector(
+            "dummy", "dummy", osc=None)
+        self.assertEqual(1, len(strategy_selector.select_all()))
+        m_load.assert_called_once_with("dummy", osc=None)
+        self.assertFalse(m_list_available.called)
+
+    @mock.patch.object(default_loader.DefaultStrategyLoader, 'list_available')
+    def test_select_all_no_available_strategy_for_goal(
+            self, m_list_available):
+        m_list_available.return_value = {}
+        strategy_selector = default_selector.DefaultStrategySelector("dummy")
+        self.assertRaises(exception.NoAvailableStrategyForGoal,
+                          strategy_selector.select_all)
@@ -106,6 +106,24 @@ class TestVMWorkloadConsolidation(base.TestCase):
             node_util,
             self.strategy.get_node_utilization(node_0))
 
+    def test_get_node_utilization_after_migration(self):
+        model = self.fake_cluster.generate_scenario_1()
+        self.m_model.return_value = model
+        self.fake_metrics.model = model
+        n1 = model.get_node_by_uuid('Node_0')
+        n2 = model.get_node_by_uuid('Node_1')
+        instance = model.get_instance_by_uuid('INSTANCE_0')
+        n2_util = self.strategy.get_node_utilization(n2)
+        self.assertEqual(dict(cpu=1.0, ram=1, disk=10),
+                         self.strategy.get_node_utilization(n1))
+        self.strategy.add_migration(instance, n1, n2)
+        self.assertEqual(dict(cpu=0, ram=0, disk=0),
+                         self.strategy.get_node_utilization(n1))
+        self.assertEqual(
+            dict(cpu=n2_util['cpu'] + 1.0, ram=n2_util['ram'] + 1,
+                 disk=n2_util['disk'] + 10),
+            self.strategy.get_node_utilization(n2))
+
     def test_get_node_capacity(self):
         model = self.fake_cluster.generate_scenario_1()
         self.m_model.return_value = model
@@ -70,7 +70,9 @@ class TestWorkloadBalance(base.TestCase):
 
         self.m_audit_scope.return_value = mock.Mock()
         self.m_datasource.return_value = mock.Mock(
-            statistic_aggregation=self.fake_metrics.mock_get_statistics_wb)
+            statistic_aggregation=self.fake_metrics.mock_get_statistics_wb,
+            statistic_aggregations=(
+                self.fake_metrics.mock_get_statistics_wb_batch))
         self.strategy = strategies.WorkloadBalance(
             config=mock.Mock(datasource=self.datasource))
         self.strategy.input_parameters = utils.Struct()
@@ -121,7 +123,9 @@ class TestWorkloadBalance(base.TestCase):
         model = self.fake_cluster.generate_scenario_6_with_2_nodes()
         self.m_model.return_value = model
         self.strategy.datasource = mock.MagicMock(
-            statistic_aggregation=self.fake_metrics.mock_get_statistics_wb)
+            statistic_aggregation=self.fake_metrics.mock_get_statistics_wb,
+            statistic_aggregations=(
+                self.fake_metrics.mock_get_statistics_wb_batch))
         n1, n2, avg, w_map = self.strategy.group_hosts_by_cpu_util()
         instance_to_mig = self.strategy.choose_instance_to_migrate(
             n1, avg, w_map)
@@ -197,21 +201,23 @@ class TestWorkloadBalance(base.TestCase):
         mocked_datetime.utcnow.return_value = datetime.datetime(
             2017, 3, 19, 18, 53, 11, 657417)
         self.addCleanup(datetime_patcher.stop)
-        m_ceilometer.statistic_aggregation = mock.Mock(
-            side_effect=self.fake_metrics.mock_get_statistics_wb)
-        m_gnocchi.statistic_aggregation = mock.Mock(
-            side_effect=self.fake_metrics.mock_get_statistics_wb)
+        m_ceilometer.statistic_aggregations = mock.Mock(
+            side_effect=self.fake_metrics.mock_get_statistics_wb_batch)
+        m_gnocchi.statistic_aggregations = mock.Mock(
+            side_effect=self.fake_metrics.mock_get_statistics_wb_batch)
         instance0 = model.get_instance_by_uuid("INSTANCE_0")
         self.strategy.group_hosts_by_cpu_util()
         if self.strategy.config.datasource == "ceilometer":
-            m_ceilometer.statistic_aggregation.assert_any_call(
-                aggregate='avg', meter_name='cpu_util',
-                period=300, resource_id=instance0.uuid)
+            m_ceilometer.statistic_aggregations.assert_called_once_with(
+                aggregate='avg', meter_names=['cpu_util'],
+                period=300, resource_ids=mock.ANY)
+            _, kwargs = m_ceilometer.statistic_aggregations.call_args
+            self.assertIn(instance0.uuid, kwargs['resource_ids'])
         elif self.strategy.config.datasource == "gnocchi":
             stop_time = datetime.datetime.utcnow()
             start_time = stop_time - datetime.timedelta(
                 seconds=int('300'))
-            m_gnocchi.statistic_aggregation.assert_called_with(
-                resource_id=mock.ANY, metric='cpu_util',
+            m_gnocchi.statistic_aggregations.assert_called_once_with(
+                resource_ids=mock.ANY, metrics=['cpu_util'],
                 granularity=300, start_time=start_time, stop_time=stop_time,
                 aggregation='mean')
@@ -17,13 +17,16 @@
 # limitations under the License.
 #
 
+import copy
 import datetime
+import itertools
 import mock
 
 from watcher.common import clients
 from watcher.common import utils
 from watcher.decision_engine.model import model_root
 from watcher.decision_engine.strategy import strategies
+from watcher.decision_engine.strategy.strategies import workload_stabilization
 from watcher.tests import base
 from watcher.tests.decision_engine.model import ceilometer_metrics
 from watcher.tests.decision_engine.model import faker_cluster_state
@@ -84,7 +87,9 @@ class TestWorkloadStabilization(base.TestCase):
         self.m_model.return_value = model_root.ModelRoot()
         self.m_audit_scope.return_value = mock.Mock()
         self.m_datasource.return_value = mock.Mock(
-            statistic_aggregation=self.fake_metrics.mock_get_statistics)
+            statistic_aggregation=self.fake_metrics.mock_get_statistics,
+            statistic_aggregations=(
+                self.fake_metrics.mock_get_statistics_batch))
 
         self.strategy = strategies.WorkloadStabilization(
             config=mock.Mock(datasource=self.datasource))
@@ -144,6 +149,10 @@ class TestWorkloadStabilization(base.TestCase):
             statistic_aggregation=self.fake_metrics.mock_get_statistics)
         m_gnocchi.return_value = mock.Mock(
             statistic_aggregation=self.fake_metrics.mock_get_statistics)
+        m_ceilometer.statistic_aggregations = mock.Mock(
+            side_effect=self.fake_metrics.mock_get_statistics_batch)
+        m_gnocchi.statistic_aggregations = mock.Mock(
+            side_effect=self.fake_metrics.mock_get_statistics_batch)
         instance0 = model.get_instance_by_uuid("INSTANCE_0")
         self.strategy.get_instance_load(instance0)
         if self.strategy.config.datasource == "ceilometer":
@@ -160,15 +169,15 @@ class TestWorkloadStabilization(base.TestCase):
                 aggregation='mean')
         self.strategy.get_hosts_load()
         if self.strategy.config.datasource == "ceilometer":
-            m_ceilometer.statistic_aggregation.assert_called_with(
-                aggregate='avg', meter_name='hardware.memory.used',
-                period=600, resource_id=mock.ANY)
+            m_ceilometer.statistic_aggregations.assert_called_with(
+                aggregate='avg', meter_names=['hardware.memory.used'],
+                period=600, resource_ids=mock.ANY)
         elif self.strategy.config.datasource == "gnocchi":
             stop_time = datetime.datetime.utcnow()
             start_time = stop_time - datetime.timedelta(
                 seconds=int('600'))
-            m_gnocchi.statistic_aggregation.assert_called_with(
-                resource_id=mock.ANY, metric='hardware.memory.used',
+            m_gnocchi.statistic_aggregations.assert_called_with(
+                resource_ids=mock.ANY, metrics=['hardware.memory.used'],
                 granularity=300, start_time=start_time, stop_time=stop_time,
                 aggregation='mean')
 
@@ -225,6 +234,52 @@ class TestWorkloadStabilization(base.TestCase):
         self.assertEqual(result, {'cpu_util': 0.095, 'memory.resident': 21.0,
                                   'vcpus': 40})
 
+    def test_migration_simulator_get_sd(self):
+        model = self.fake_cluster.generate_scenario_1()
+        self.m_model.return_value = model
+        simulator = workload_stabilization.MigrationSimulator(
+            self.hosts_load_assert, self.strategy.metrics,
+            self.strategy.get_hosts_normalizers(self.hosts_load_assert))
+        normalized_hosts = self.strategy.normalize_hosts_load(
+            self.hosts_load_assert)
+        for metric in self.strategy.metrics:
+            self.assertAlmostEqual(
+                self.strategy.get_sd(normalized_hosts, metric),
+                simulator.get_sd(metric))
+
+    def test_migration_simulator_simulate(self):
+        model = self.fake_cluster.generate_scenario_1()
+        self.m_model.return_value = model
+        simulator = workload_stabilization.MigrationSimulator(
+            self.hosts_load_assert, self.strategy.metrics,
+            self.strategy.get_hosts_normalizers(self.hosts_load_assert))
+        for src_uuid, dst_uuid in itertools.permutations(
+                self.hosts_load_assert, 2):
+            src_node = model.get_node_by_uuid(src_uuid)
+            dst_node = model.get_node_by_uuid(dst_uuid)
+            for instance in model.get_node_instances(src_node):
+                instance_load = self.strategy.get_instance_load(instance)
+                sd_case = simulator.simulate(
+                    src_uuid, dst_uuid,
+                    self.strategy.get_instance_host_load(
+                        instance_load, src_node.vcpus),
+                    self.strategy.get_instance_host_load(
+                        instance_load, dst_node.vcpus))
+                expected_sd_case = self.strategy.calculate_migration_case(
+                    self.hosts_load_assert, instance, src_node, dst_node)
+                for sd, expected_sd in zip(sd_case, expected_sd_case[:-1]):
+                    self.assertAlmostEqual(expected_sd, sd)
+
+    def test_calculate_migration_case_hosts_unchanged(self):
+        model = self.fake_cluster.generate_scenario_1()
+        self.m_model.return_value = model
+        hosts_load = copy.deepcopy(self.hosts_load_assert)
+        self.strategy.calculate_migration_case(
+            hosts_load, model.get_instance_by_uuid("INSTANCE_5"),
+            model.get_node_by_uuid("Node_2"),
+            model.get_node_by_uuid("Node_1"))
+        self.assertEqual(self.hosts_load_assert, hosts_load)
+
     def test_simulate_migrations(self):
         model = self.fake_cluster.generate_scenario_1()
         self.m_model.return_value = model
@@ -18,6 +18,7 @@ import oslo_messaging as om
 
 from watcher.common import exception
 from watcher.common import rpc
+from watcher.common import utils as w_utils
 from watcher import notifications
 from watcher import objects
 from watcher.tests.db import base
@@ -118,6 +119,76 @@ class TestActionNotification(base.DbTestCase):
             payload
         )
 
+    def test_send_action_update_notifs_disabled(self):
+        action = utils.create_test_action(
+            mock.Mock(), state=objects.action.State.ONGOING,
+            action_type='nop', input_parameters={'param1': 1, 'param2': 2},
+            parents=[], action_plan_id=self.action_plan.id)
+        self.config(notification_level=None)
+
+        with mock.patch.object(objects.Audit, 'get') as m_get_audit:
+            notifications.action.send_update(
+                mock.MagicMock(), action, host='node0',
+                old_state=objects.action.State.PENDING)
+
+        # Neither built nor emitted
+        self.assertFalse(m_get_audit.called)
+        self.assertEqual(3, self.m_notifier.info.call_count)
+
+    def test_send_action_update_cached_lookups(self):
+        action = utils.create_test_action(
+            mock.Mock(), state=objects.action.State.ONGOING,
+            action_type='nop', input_parameters={'param1': 1, 'param2': 2},
+            parents=[], action_plan_id=self.action_plan.id)
+        notifications.base.clear_lookup_cache()
+
+        with mock.patch.object(
+                objects.Audit, 'get', wraps=objects.Audit.get
+        ) as m_get_audit, mock.patch.object(
+                objects.Strategy, 'get', wraps=objects.Strategy.get
+        ) as m_get_strategy:
+            for _ in range(3):
+                notifications.action.send_update(
+                    mock.MagicMock(), action, host='node0',
+                    old_state=objects.action.State.PENDING)
+
+        # The audit is loaded as its strategy may change, not the strategy
+        self.assertEqual(3, m_get_audit.call_count)
+        self.assertEqual(1, m_get_strategy.call_count)
+        self.assertEqual(6, self.m_notifier.info.call_count)
+        payload = self.m_notifier.info.call_args[1]['payload']
+        action_plan_payload = (
+            payload['watcher_object.data']['action_plan'][
+                'watcher_object.data'])
+        self.assertEqual(self.audit.uuid, action_plan_payload['audit_uuid'])
+        self.assertEqual(self.strategy.uuid,
+                         action_plan_payload['strategy_uuid'])
+
+    def test_send_action_update_audit_strategy_changed(self):
+        action = utils.create_test_action(
+            mock.Mock(), state=objects.action.State.ONGOING,
+            action_type='nop', input_parameters={'param1': 1, 'param2': 2},
+            parents=[], action_plan_id=self.action_plan.id)
+        notifications.action.send_update(
+            mock.MagicMock(), action, host='node0',
+            old_state=objects.action.State.PENDING)
+
+        # e.g. the strategy of the audit was synced to a new one
+        strategy = utils.create_test_strategy(
+            mock.Mock(), id=2, uuid=w_utils.generate_uuid(),
+            name='other_strategy')
+        self.audit.strategy_id = strategy.id
+        self.audit.save()
+        notifications.action.send_update(
+            mock.MagicMock(), action, host='node0',
+            old_state=objects.action.State.PENDING)
+
+        payload = self.m_notifier.info.call_args[1]['payload']
+        action_plan_payload = (
+            payload['watcher_object.data']['action_plan'][
+                'watcher_object.data'])
+        self.assertEqual(strategy.uuid, action_plan_payload['strategy_uuid'])
+
     def test_send_action_plan_create(self):
         action = utils.create_test_action(
             mock.Mock(), state=objects.action.State.PENDING,
@@ -137,6 +137,18 @@ class TestNotificationBase(testbase.TestCase):
             expected_event_type='test_object.update.start',
             expected_payload=self.expected_payload)
 
+    def test_should_notify(self):
+        self.config(notification_level='warning')
+        self.assertFalse(notificationbase.should_notify(
+            wfields.NotificationPriority.INFO))
+        self.assertTrue(notificationbase.should_notify(
+            wfields.NotificationPriority.WARNING))
+        self.assertTrue(notificationbase.should_notify(
+            wfields.NotificationPriority.ERROR))
+        self.config(notification_level=None)
+        self.assertFalse(notificationbase.should_notify(
+            wfields.NotificationPriority.CRITICAL))
+
     @mock.patch.object(rpc, 'NOTIFIER')
     def test_no_emit_notifs_disabled(self, mock_notifier):
         # Make sure notifications aren't emitted when notification_level
@@ -185,6 +185,42 @@ class TestCreateDeleteActionObject(base.DbTestCase):
         mock_create_action.assert_called_once_with(expected_action)
         self.assertEqual(self.context, action._context)
 
+    @mock.patch.object(objects.Strategy, 'get')
+    @mock.patch.object(objects.Audit, 'get')
+    @mock.patch.object(notifications.action, 'send_create')
+    def test_bulk_create(self, mock_send_create, mock_get_audit,
+                         mock_get_strategy):
+        action_plan = objects.ActionPlan.get_by_id(
+            self.context, self.fake_action_plan.id, eager=True)
+        actions = [objects.Action(self.context,
+                                  uuid=c_utils.generate_uuid(),
+                                  action_plan_id=action_plan.id,
+                                  action_type='nop',
+                                  input_parameters={},
+                                  parents=[])
+                   for _ in range(3)]
+
+        objects.Action.bulk_create(
+            self.context, actions, action_plans=[action_plan])
+
+        self.assertEqual(3, len(set(action.id for action in actions)))
+        for action in actions:
+            self.assertEqual(objects.action.State.PENDING, action.state)
+            self.assertIs(action_plan, action.action_plan)
+            self.assertEqual({}, action.obj_get_changes())
+        self.assertEqual(
+            sorted(action.uuid for action in actions),
+            sorted(action.uuid
+                   for action in objects.Action.list(self.context)))
+        # The related objects already loaded are used by the notifications
+        self.assertFalse(mock_get_audit.called)
+        self.assertFalse(mock_get_strategy.called)
+        self.assertEqual(3, mock_send_create.call_count)
+        payloads = set(
+            id(call[1]['action_plan_payload'])
+            for call in mock_send_create.call_args_list)
+        self.assertEqual(1, len(payloads))
+
     @mock.patch.object(notifications.action, 'send_delete')
     @mock.patch.object(notifications.action, 'send_update')
     @mock.patch.object(db_api.Connection, 'update_action')
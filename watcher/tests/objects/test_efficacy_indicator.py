@@ -82,6 +82,22 @@ class TestEfficacyIndicatorObject(base.DbTestCase):
                 self.fake_efficacy_indicator)
             self.assertEqual(self.context, efficacy_indicator._context)
 
+    def test_bulk_create(self):
+        with mock.patch.object(
+            self.dbapi, 'create_efficacy_indicators',
+            autospec=True
+        ) as mock_create_efficacy_indicators:
+            mock_create_efficacy_indicators.return_value = [
+                self.fake_efficacy_indicator]
+            efficacy_indicator = objects.EfficacyIndicator(
+                self.context, **self.fake_efficacy_indicator)
+
+            objects.EfficacyIndicator.bulk_create(
+                self.context, [efficacy_indicator])
+            mock_create_efficacy_indicators.assert_called_once_with(
+                [self.fake_efficacy_indicator])
+            self.assertEqual({}, efficacy_indicator.obj_get_changes())
+
     def test_destroy(self):
         uuid = self.fake_efficacy_indicator['uuid']
         with mock.patch.object(